@@ -7,6 +7,7 @@ NODE_CLASS_MAPPINGS = {
     "GroupExecutorSingle": GroupExecutorSingle,
     "GroupExecutorSender": GroupExecutorSender,
     "GroupExecutorRepeater": GroupExecutorRepeater,
+    "GroupExecutorBarrier": GroupExecutorBarrier,
     "GroupExecutorWaitAll": GroupExecutorWaitAll,
     "GroupExecutorExtractResult": GroupExecutorExtractResult,
     "LG_ImageSender": LG_ImageSender,
@@ -31,6 +32,7 @@ NODE_DISPLAY_NAME_MAPPINGS = {
     "GroupExecutorSingle": "🎈GroupExecutorSingle",
     "GroupExecutorSender": "🎈GroupExecutorSender",
     "GroupExecutorRepeater": "🎈GroupExecutorRepeater",
+    "GroupExecutorBarrier": "🎈GroupExecutorBarrier",
     "GroupExecutorWaitAll": "🎈GroupExecutorWaitAll",
     "GroupExecutorExtractResult": "🎈GroupExecutorExtractResult",
     "LG_ImageSender": "🎈LG_ImageSender",
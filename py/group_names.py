@@ -0,0 +1,21 @@
+# 组名和结果文件路径相关的共享定义（lgutils 和 trans 共用，不依赖 ComfyUI，保证两处的规则一致）
+import os
+
+# 分发模式（执行项带 fan_out 字段）下，第 n 次重复的结果保存在组名 {group_name}__r{n} 下，
+# 接收节点通过 repeat_index 读取指定的一次
+REPEAT_GROUP_SUFFIX = "__r"
+
+def _get_repeat_group_name(group_name, repeat_index):
+    """获取分发模式下第 repeat_index 次重复（从 1 开始）的结果组名，repeat_index 为 0 时返回原组名"""
+    if not repeat_index:
+        return group_name
+    return f"{group_name}{REPEAT_GROUP_SUFFIX}{int(repeat_index)}"
+
+def _resolve_result_path(results_dir, name):
+    """把清单或请求中的相对路径解析为 results_dir 下的绝对路径，越界或非法时返回 None"""
+    if not name or '\\' in name or ':' in name:
+        return None
+    parts = name.split('/')
+    if any(part in ('', '.', '..') or part.startswith('.') for part in parts):
+        return None
+    return os.path.join(results_dir, *parts)
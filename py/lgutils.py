@@ -6,16 +6,26 @@ import time
 import uuid
 import asyncio
 import random
+import hashlib
+import struct
+import shutil
+import copy
+import sqlite3
+import sys
+from collections import OrderedDict, deque
 from aiohttp import web
 import aiohttp
 import execution
 import nodes
 from datetime import datetime
-from urllib.parse import urlparse
+from urllib.parse import urlparse, quote
+from .group_names import REPEAT_GROUP_SUFFIX, _get_repeat_group_name, _resolve_result_path
 
 # 尝试导入 requests，如果失败则使用 aiohttp
 try:
     import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
     HAS_REQUESTS = True
 except ImportError:
     HAS_REQUESTS = False
@@ -60,6 +70,114 @@ def filter_prompt_for_nodes(full_prompt, output_node_ids):
         recursive_add_nodes(str(node_id), full_prompt, filtered_prompt)
     return filtered_prompt
 
+# 执行列表中的标记项：__delay__ 表示延迟，__barrier__ 表示并行调度时的屏障
+DELAY_MARKER = "__delay__"
+BARRIER_MARKER = "__barrier__"
+
+# 并行调度时每个服务器默认同时运行的执行项数
+DEFAULT_MAX_PER_SERVER = 1
+
+# 顺序执行时默认提前提交的 prompt 数（0 表示不使用流水线，等上一个完成后再提交下一个）
+DEFAULT_LOOKAHEAD = 0
+
+# 执行项的 server_id 为该值时，在提交时按负载自动选择服务器（候选服务器由执行项的 server_pool 指定，
+# 元素为服务器ID或 {"id": ..., "weight": ...}；未指定时为全部远程服务器）
+AUTO_SERVER_ID = "auto"
+
+def _is_marker_item(exec_item):
+    """判断执行项是否为延迟或屏障标记"""
+    return exec_item.get("group_name") in (DELAY_MARKER, BARRIER_MARKER)
+
+# 本地等待的兜底检查间隔（秒）：正常情况下由执行事件唤醒，只在漏掉事件时才依赖该检查
+COMPLETION_FALLBACK_INTERVAL = 5.0
+
+class PromptCompletionTracker:
+    """prompt 完成通知器：根据 send_sync 发出的执行事件唤醒等待中的线程
+    
+    每个被等待的 prompt 对应一个 threading.Event；收到 executing(node=None)、
+    execution_success、execution_error 或 execution_interrupted 事件时记录结果并唤醒等待者。
+    """
+    
+    # 最近完成的 prompt 保留数量（用于处理事件先于等待注册到达的情况）
+    RECENT_LIMIT = 256
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._events = {}  # prompt_id -> threading.Event
+        self._recent = OrderedDict()  # prompt_id -> 完成状态（"success" / "error" / "interrupted"）
+    
+    def register(self, prompt_id):
+        """注册需要等待的 prompt，返回对应的 Event"""
+        with self._lock:
+            event = self._events.get(prompt_id)
+            if event is None:
+                event = threading.Event()
+                self._events[prompt_id] = event
+            if prompt_id in self._recent:
+                event.set()
+            return event
+    
+    def discard(self, prompt_id):
+        """停止跟踪某个 prompt"""
+        with self._lock:
+            self._events.pop(prompt_id, None)
+            self._recent.pop(prompt_id, None)
+    
+    def get_status(self, prompt_id):
+        """获取 prompt 的完成状态，未完成返回 None"""
+        with self._lock:
+            return self._recent.get(prompt_id)
+    
+    def notify(self, prompt_id, status):
+        """记录 prompt 的完成状态并唤醒等待者（同一 prompt 只记录第一次的终态）"""
+        with self._lock:
+            if prompt_id not in self._recent:
+                self._recent[prompt_id] = status
+                while len(self._recent) > self.RECENT_LIMIT:
+                    self._recent.popitem(last=False)
+            event = self._events.get(prompt_id)
+            if event is not None:
+                event.set()
+    
+    def wake_all(self):
+        """唤醒所有等待者（用于取消任务时让等待线程立即检查取消标志）"""
+        with self._lock:
+            for event in self._events.values():
+                event.set()
+    
+    def wait(self, prompt_id, timeout):
+        """等待 prompt 完成或被唤醒
+        
+        返回: 完成状态，超时或被其他原因唤醒时返回 None
+        """
+        event = self.register(prompt_id)
+        event.wait(timeout)
+        with self._lock:
+            status = self._recent.get(prompt_id)
+            if status is None:
+                # 非完成原因唤醒（如取消），清除后下次继续等待
+                event.clear()
+            return status
+    
+    def handle_event(self, event, data):
+        """处理 send_sync 发出的执行事件"""
+        if not isinstance(data, dict):
+            return
+        prompt_id = data.get("prompt_id")
+        if not prompt_id:
+            return
+        
+        if event == "executing":
+            # node 为 None 表示该 prompt 已执行结束
+            if data.get("node") is None:
+                self.notify(prompt_id, "success")
+        elif event == "execution_success":
+            self.notify(prompt_id, "success")
+        elif event == "execution_error":
+            self.notify(prompt_id, "error")
+        elif event == "execution_interrupted":
+            self.notify(prompt_id, "interrupted")
+
 class GroupExecutorBackend:
     """后台执行管理器"""
     
@@ -67,10 +185,11 @@ class GroupExecutorBackend:
         self.running_tasks = {}
         self.task_lock = threading.Lock()
         self.interrupted_prompts = set()  # 记录被中断的 prompt_id
+        self.completion_tracker = PromptCompletionTracker()
         self._setup_interrupt_handler()
     
     def _setup_interrupt_handler(self):
-        """设置中断处理器，监听 execution_interrupted 消息"""
+        """设置执行事件监听器，监听 execution_interrupted 消息并转发完成事件给 completion_tracker"""
         try:
             server = PromptServer.instance
             backend_instance = self
@@ -89,6 +208,12 @@ class GroupExecutorBackend:
                         backend_instance.interrupted_prompts.add(prompt_id)
                         # 取消所有后台任务
                         backend_instance._cancel_all_on_interrupt()
+                
+                # 唤醒等待该 prompt 完成的线程
+                try:
+                    backend_instance.completion_tracker.handle_event(event, data)
+                except Exception as e:
+                    print(f"[GroupExecutor] 处理执行完成事件失败: {e}")
             
             server.send_sync = patched_send_sync
         except Exception as e:
@@ -102,14 +227,19 @@ class GroupExecutorBackend:
             for node_id, task_info in list(self.running_tasks.items()):
                 if task_info.get("status") == "running" and not task_info.get("cancel"):
                     task_info["cancel"] = True
+        self.completion_tracker.wake_all()
+        _remote_completion_watcher.wake_all()
     
-    def execute_in_background(self, node_id, execution_list, full_api_prompt):
+    def execute_in_background(self, node_id, execution_list, full_api_prompt, parallel=False, max_per_server=DEFAULT_MAX_PER_SERVER, lookahead=DEFAULT_LOOKAHEAD):
         """启动后台执行线程
         
         Args:
             node_id: 节点 ID
             execution_list: 执行列表，每项包含 group_name, repeat_count, delay_seconds, output_node_ids
             full_api_prompt: 前端生成的完整 API prompt（已经是正确格式）
+            parallel: 是否并行调度（不同服务器上的独立执行项同时运行）
+            max_per_server: 并行模式下每个服务器同时运行的最大执行项数
+            lookahead: 顺序执行时提前提交的 prompt 数（流水线深度），0 表示不提前提交
         """
         with self.task_lock:
             if node_id in self.running_tasks and self.running_tasks[node_id].get("status") == "running":
@@ -117,7 +247,7 @@ class GroupExecutorBackend:
             
             thread = threading.Thread(
                 target=self._execute_task,
-                args=(node_id, execution_list, full_api_prompt),
+                args=(node_id, execution_list, full_api_prompt, parallel, max_per_server, lookahead),
                 daemon=True
             )
             thread.start()
@@ -142,269 +272,73 @@ class GroupExecutorBackend:
                 except Exception as e:
                     print(f"[GroupExecutor] 发送中断信号失败: {e}")
                 
+                self.completion_tracker.wake_all()
+                _remote_completion_watcher.wake_all()
                 return True
             return False
     
-    def _execute_task(self, node_id, execution_list, full_api_prompt):
+    def _is_cancelled(self, node_id):
+        """检查任务是否已被取消"""
+        return self.running_tasks.get(node_id, {}).get("cancel", False)
+    
+    def _sleep_with_cancel(self, node_id, delay_seconds):
+        """分段延迟，以便能快速响应取消"""
+        if delay_seconds > 0 and not self._is_cancelled(node_id):
+            delay_steps = int(delay_seconds * 2)  # 每 0.5 秒检查一次
+            for _ in range(delay_steps):
+                if self._is_cancelled(node_id):
+                    break
+                time.sleep(0.5)
+    
+    def _execute_task(self, node_id, execution_list, full_api_prompt, parallel=False, max_per_server=DEFAULT_MAX_PER_SERVER, lookahead=DEFAULT_LOOKAHEAD):
         """后台执行任务的核心逻辑
         
         Args:
             node_id: 节点 ID
             execution_list: 执行列表，每项包含 group_name, repeat_count, delay_seconds, output_node_ids, server_id
             full_api_prompt: 前端生成的完整 API prompt
+            parallel: 是否并行调度
+            max_per_server: 并行模式下每个服务器同时运行的最大执行项数
+            lookahead: 顺序执行时提前提交的 prompt 数（并行调度时不使用）
         """
         try:
-            # 收集所有组名
-            group_names = []
-            for exec_item in execution_list:
-                group_name = exec_item.get("group_name", "")
-                if group_name and group_name != "__delay__":
-                    if group_name not in group_names:
-                        group_names.append(group_name)
-            
             # 检查是否有非本地服务器的执行项
-            has_remote_server = any(item.get("server_id") for item in execution_list if item.get("group_name") != "__delay__")
+            has_remote_server = any(item.get("server_id") for item in execution_list if not _is_marker_item(item))
             
             # 为每个组生成独立的 execution_id（不再共享同一个ID）
             group_execution_ids = {}  # 存储每个组对应的 execution_id
             
-            for exec_item in execution_list:
-                # 检查取消标志
-                if self.running_tasks.get(node_id, {}).get("cancel"):
-                    print(f"[GroupExecutor] 任务被取消")
-                    break
-                
-                group_name = exec_item.get("group_name", "")
-                repeat_count = int(exec_item.get("repeat_count", 1))
-                delay_seconds = float(exec_item.get("delay_seconds", 0))
-                output_node_ids = exec_item.get("output_node_ids", [])
-                server_id = exec_item.get("server_id", None)  # 获取服务器ID
-                
-                # 处理延迟
-                if group_name == "__delay__":
-                    if delay_seconds > 0 and not self.running_tasks.get(node_id, {}).get("cancel"):
-                        # 分段延迟，以便能快速响应取消
-                        delay_steps = int(delay_seconds * 2)  # 每 0.5 秒检查一次
-                        for _ in range(delay_steps):
-                            if self.running_tasks.get(node_id, {}).get("cancel"):
-                                break
-                            time.sleep(0.5)
-                    continue
-                
-                if not group_name or not output_node_ids:
-                    print(f"[GroupExecutor] 跳过无效执行项: group_name={group_name}, output_node_ids={output_node_ids}")
-                    continue
-                
-                # 为每个组生成独立的 execution_id
-                if group_name not in group_execution_ids:
-                    # 生成唯一的 execution_id：使用 node_id、组名和时间戳
-                    safe_group_name = "".join(c for c in group_name if c.isalnum() or c in ('_', '-'))
-                    execution_id = f"exec_{node_id}_{safe_group_name}_{int(time.time() * 1000)}"
-                    group_execution_ids[group_name] = execution_id
-                    
-                    # 注册该组的 execution_id（只对非本地服务器）
-                    if has_remote_server and server_id:
-                        _group_result_manager.register_execution(execution_id, [group_name], server_id)
-                        print(f"[GroupExecutor] 为组 '{group_name}' 生成独立的 execution_id: {execution_id}")
-                
-                # 获取该组的 execution_id
-                execution_id = group_execution_ids[group_name]
-                
-                # 执行逻辑：repeat_count = 1 时只执行一次（不重复），> 1 时才循环
-                if repeat_count == 1:
-                    # 只执行一次，不进入循环
+            if parallel:
+                self._execute_list_parallel(node_id, execution_list, full_api_prompt, group_execution_ids, has_remote_server, max_per_server)
+            elif lookahead > 0:
+                self._execute_list_pipelined(node_id, execution_list, full_api_prompt, group_execution_ids, has_remote_server, lookahead)
+            else:
+                for exec_item in execution_list:
                     # 检查取消标志
-                    if self.running_tasks.get(node_id, {}).get("cancel"):
-                        continue
+                    if self._is_cancelled(node_id):
+                        print(f"[GroupExecutor] 任务被取消")
+                        break
                     
-                    # 从完整 prompt 中筛选出该组需要的节点
-                    prompt = filter_prompt_for_nodes(full_api_prompt, output_node_ids)
+                    group_name = exec_item.get("group_name", "")
+                    output_node_ids = exec_item.get("output_node_ids", [])
                     
-                    if not prompt:
-                        print(f"[GroupExecutor] 筛选 prompt 失败")
+                    # 处理延迟
+                    if group_name == DELAY_MARKER:
+                        self._sleep_with_cancel(node_id, float(exec_item.get("delay_seconds", 0)))
                         continue
                     
-                    # 设置线程局部存储的组名（用于本地执行时节点获取组名）
-                    try:
-                        from .trans import set_current_group_name
-                        set_current_group_name(group_name)
-                    except:
-                        pass
-                    
-                    # 处理随机种子：为每个有 seed 参数的节点生成新的随机值
-                    # 同时将组名添加到所有节点的 inputs 中（用于远程执行时节点获取组名）
-                    for node_id_str, node_data in prompt.items():
-                        if "seed" in node_data.get("inputs", {}):
-                            new_seed = random.randint(0, 0xffffffffffffffff)
-                            prompt[node_id_str]["inputs"]["seed"] = new_seed
-                        # 也处理 noise_seed（某些节点使用这个名称）
-                        if "noise_seed" in node_data.get("inputs", {}):
-                            new_seed = random.randint(0, 0xffffffffffffffff)
-                            prompt[node_id_str]["inputs"]["noise_seed"] = new_seed
-                        # 将组名添加到节点的 inputs 中（用于 Remote 节点获取组名）
-                        if group_name:
-                            prompt[node_id_str]["inputs"]["_execution_group_name"] = group_name
+                    # 顺序执行时屏障项没有额外作用
+                    if group_name == BARRIER_MARKER:
+                        continue
                     
-                    # 提交到队列（支持指定服务器）
-                    # 如果是本地服务器（server_id 为 None），通过 WebSocket 事件通知前端提交 prompt
-                    # 这样可以确保预览图能正确显示
-                    if server_id is None:
-                        # 本地执行：通过 WebSocket 事件通知前端提交 prompt
-                        prompt_id = self._queue_prompt_via_frontend(prompt, output_node_ids)
-                    else:
-                        # 远程执行：直接提交到远程服务器
-                        prompt_id = self._queue_prompt(prompt, server_id)
-                        # 非本地服务器执行时，保存状态文件（按组名，覆盖式保存）
-                        if prompt_id:
-                            try:
-                                _group_result_manager.save_status_by_group(
-                                    group_name,
-                                    server_id,
-                                    prompt_id=prompt_id,
-                                    started_at=time.time()
-                                )
-                            except Exception as e:
-                                print(f"[GroupExecutor] 保存组状态文件失败: {e}")
+                    if not group_name or not output_node_ids:
+                        print(f"[GroupExecutor] 跳过无效执行项: group_name={group_name}, output_node_ids={output_node_ids}")
+                        continue
                     
-                    if prompt_id:
-                        # 等待执行完成（返回是否检测到中断）
-                        was_interrupted = self._wait_for_completion(prompt_id, node_id, server_id)
-                        
-                        # 如果等待期间检测到中断，继续下一个组
-                        if was_interrupted:
-                            continue
-                        
-                        # 组执行完成，更新状态文件（只对非本地服务器）
-                        if server_id is not None:
-                            try:
-                                _group_result_manager.set_group_result(
-                                    execution_id, 
-                                    group_name, 
-                                    {
-                                        "completed": True,
-                                        "completed_at": time.time(),
-                                        "prompt_id": prompt_id
-                                    },
-                                    server_id=server_id
-                                )
-                                # 更新按组名的状态文件（标记为已完成）
-                                try:
-                                    _group_result_manager.update_status_by_group_completed(
-                                        group_name,
-                                        prompt_id=prompt_id,
-                                        server_id=server_id
-                                    )
-                                except Exception as e:
-                                    print(f"[GroupExecutor] 更新组状态文件失败: {e}")
-                            except Exception as e:
-                                print(f"[GroupExecutor] 设置组结果失败: {e}")
-                    else:
-                        print(f"[GroupExecutor] 提交 prompt 失败")
-                else:
-                    # repeat_count > 1，进入循环重复执行
-                    for i in range(repeat_count):
-                        # 检查取消标志
-                        if self.running_tasks.get(node_id, {}).get("cancel"):
-                            break
-                        
-                        print(f"[GroupExecutor] 执行组 '{group_name}' ({i+1}/{repeat_count})")
-                        
-                        # 从完整 prompt 中筛选出该组需要的节点
-                        prompt = filter_prompt_for_nodes(full_api_prompt, output_node_ids)
-                        
-                        if not prompt:
-                            print(f"[GroupExecutor] 筛选 prompt 失败")
-                            continue
-                        
-                        # 设置线程局部存储的组名（用于本地执行时节点获取组名）
-                        try:
-                            from .trans import set_current_group_name
-                            set_current_group_name(group_name)
-                        except:
-                            pass
-                        
-                        # 处理随机种子：为每个有 seed 参数的节点生成新的随机值
-                        # 同时将组名添加到所有节点的 inputs 中（用于远程执行时节点获取组名）
-                        for node_id_str, node_data in prompt.items():
-                            if "seed" in node_data.get("inputs", {}):
-                                new_seed = random.randint(0, 0xffffffffffffffff)
-                                prompt[node_id_str]["inputs"]["seed"] = new_seed
-                            # 也处理 noise_seed（某些节点使用这个名称）
-                            if "noise_seed" in node_data.get("inputs", {}):
-                                new_seed = random.randint(0, 0xffffffffffffffff)
-                                prompt[node_id_str]["inputs"]["noise_seed"] = new_seed
-                            # 将组名添加到节点的 inputs 中（用于 Remote 节点获取组名）
-                            if group_name:
-                                prompt[node_id_str]["inputs"]["_execution_group_name"] = group_name
-                        
-                        # 提交到队列（支持指定服务器）
-                        # 如果是本地服务器（server_id 为 None），通过 WebSocket 事件通知前端提交 prompt
-                        # 这样可以确保预览图能正确显示
-                        if server_id is None:
-                            # 本地执行：通过 WebSocket 事件通知前端提交 prompt
-                            prompt_id = self._queue_prompt_via_frontend(prompt, output_node_ids)
-                        else:
-                            # 远程执行：直接提交到远程服务器
-                            prompt_id = self._queue_prompt(prompt, server_id)
-                            # 非本地服务器执行时，保存状态文件（按组名，只在第一次执行时保存，覆盖式保存）
-                            if prompt_id and i == 0:
-                                try:
-                                    _group_result_manager.save_status_by_group(
-                                        group_name,
-                                        server_id,
-                                        prompt_id=prompt_id,
-                                        started_at=time.time()
-                                    )
-                                except Exception as e:
-                                    print(f"[GroupExecutor] 保存组状态文件失败: {e}")
-                        
-                        if prompt_id:
-                            # 等待执行完成（返回是否检测到中断）
-                            was_interrupted = self._wait_for_completion(prompt_id, node_id, server_id)
-                            
-                            # 如果等待期间检测到中断，立即退出
-                            if was_interrupted:
-                                break
-                            
-                            # 组执行完成，更新状态文件（只在最后一次执行时更新，避免重复，只对非本地服务器）
-                            if i == repeat_count - 1 and server_id is not None:
-                                try:
-                                    _group_result_manager.set_group_result(
-                                        execution_id, 
-                                        group_name, 
-                                        {
-                                            "completed": True,
-                                            "completed_at": time.time(),
-                                            "prompt_id": prompt_id,
-                                            "repeat_count": repeat_count
-                                        },
-                                        server_id=server_id
-                                    )
-                                    # 更新按组名的状态文件（标记为已完成）
-                                    try:
-                                        _group_result_manager.update_status_by_group_completed(
-                                            group_name,
-                                            prompt_id=prompt_id,
-                                            server_id=server_id
-                                        )
-                                    except Exception as e:
-                                        print(f"[GroupExecutor] 更新组状态文件失败: {e}")
-                                except Exception as e:
-                                    print(f"[GroupExecutor] 设置组结果失败: {e}")
-                        else:
-                            print(f"[GroupExecutor] 提交 prompt 失败")
-                        
-                        # 延迟（支持中断）- 只在重复执行时才有延迟
-                        if delay_seconds > 0 and i < repeat_count - 1:
-                            if not self.running_tasks.get(node_id, {}).get("cancel"):
-                                # 分段延迟，以便能快速响应取消
-                                delay_steps = int(delay_seconds * 2)  # 每 0.5 秒检查一次
-                                for _ in range(delay_steps):
-                                    if self.running_tasks.get(node_id, {}).get("cancel"):
-                                        break
-                                    time.sleep(0.5)
-            
-            if self.running_tasks.get(node_id, {}).get("cancel"):
+                    execution_id = self._get_group_execution_id(node_id, exec_item, group_execution_ids, has_remote_server)
+                    self._run_exec_item(node_id, exec_item, full_api_prompt, execution_id, max_per_server)
+            
+            if self._is_cancelled(node_id):
                 print(f"[GroupExecutor] 任务已取消")
             else:
                 print(f"[GroupExecutor] 任务执行完成")
@@ -419,6 +353,555 @@ class GroupExecutorBackend:
                     was_cancelled = self.running_tasks[node_id].get("cancel", False)
                     self.running_tasks[node_id]["status"] = "cancelled" if was_cancelled else "completed"
     
+    def _get_group_execution_id(self, node_id, exec_item, group_execution_ids, has_remote_server):
+        """获取（首次时生成并注册）执行项所属组的 execution_id"""
+        group_name = exec_item.get("group_name", "")
+        server_id = exec_item.get("server_id", None)
+        
+        # 为每个组生成独立的 execution_id
+        if group_name not in group_execution_ids:
+            # 生成唯一的 execution_id：使用 node_id、组名和时间戳
+            safe_group_name = "".join(c for c in group_name if c.isalnum() or c in ('_', '-'))
+            execution_id = f"exec_{node_id}_{safe_group_name}_{int(time.time() * 1000)}"
+            group_execution_ids[group_name] = execution_id
+            
+            # 注册该组的 execution_id（只对非本地服务器）
+            if has_remote_server and server_id:
+                _group_result_manager.register_execution(execution_id, [group_name], server_id)
+                print(f"[GroupExecutor] 为组 '{group_name}' 生成独立的 execution_id: {execution_id}")
+        
+        return group_execution_ids[group_name]
+    
+    def _build_group_prompt(self, group_name, output_node_ids, full_api_prompt):
+        """从完整 prompt 中筛选出该组需要的节点，并刷新随机种子、注入组名"""
+        prompt = filter_prompt_for_nodes(full_api_prompt, output_node_ids)
+        if not prompt:
+            return None
+        
+        # 处理随机种子：为每个有 seed 参数的节点生成新的随机值
+        # 同时将组名添加到所有节点的 inputs 中（用于远程执行时节点获取组名）
+        for node_id_str, node_data in prompt.items():
+            if "seed" in node_data.get("inputs", {}):
+                new_seed = random.randint(0, 0xffffffffffffffff)
+                prompt[node_id_str]["inputs"]["seed"] = new_seed
+            # 也处理 noise_seed（某些节点使用这个名称）
+            if "noise_seed" in node_data.get("inputs", {}):
+                new_seed = random.randint(0, 0xffffffffffffffff)
+                prompt[node_id_str]["inputs"]["noise_seed"] = new_seed
+            # 将组名添加到节点的 inputs 中（用于 Remote 节点获取组名）
+            if group_name:
+                prompt[node_id_str]["inputs"]["_execution_group_name"] = group_name
+        
+        return prompt
+    
+    def _run_exec_item(self, node_id, exec_item, full_api_prompt, execution_id, max_per_server=DEFAULT_MAX_PER_SERVER):
+        """执行单个执行项（包含其 repeat_count 次重复）
+        
+        Returns:
+            bool: 最后一次执行正常完成返回 True，提交失败、被中断或取消返回 False
+        """
+        if int(exec_item.get("fan_out") or 1) > 1:
+            return self._run_fan_out(node_id, exec_item, full_api_prompt, execution_id, max_per_server)
+        
+        group_name = exec_item.get("group_name", "")
+        repeat_count = int(exec_item.get("repeat_count", 1))
+        delay_seconds = float(exec_item.get("delay_seconds", 0))
+        output_node_ids = exec_item.get("output_node_ids", [])
+        server_id = exec_item.get("server_id", None)  # 获取服务器ID
+        
+        # 自动选择服务器：整个执行项（包括重复执行）使用同一个服务器，结果文件从该服务器获取
+        # select() 已为第一次提交占用了待执行数，reserved 表示该占用尚未被提交使用
+        auto_server = server_id == AUTO_SERVER_ID
+        tried_servers = set() if auto_server else None
+        reserved = auto_server
+        if auto_server:
+            server_id = _server_selector.select(group_name, exec_item.get("server_pool"))
+            if server_id is None:
+                print(f"[GroupExecutor] 组 '{group_name}' 没有可用的服务器，跳过执行")
+                return False
+            print(f"[GroupExecutor] 组 '{group_name}' 自动选择服务器: {server_id}")
+        
+        completed = False
+        # repeat_count = 1 时只执行一次（不重复），> 1 时才循环
+        for i in range(repeat_count):
+            completed = False
+            # 检查取消标志
+            if self._is_cancelled(node_id):
+                break
+            
+            if repeat_count > 1:
+                print(f"[GroupExecutor] 执行组 '{group_name}' ({i+1}/{repeat_count})")
+            
+            # 从完整 prompt 中筛选出该组需要的节点
+            prompt = self._build_group_prompt(group_name, output_node_ids, full_api_prompt)
+            
+            if not prompt:
+                print(f"[GroupExecutor] 筛选 prompt 失败")
+                continue
+            
+            prompt_id, server_id = self._submit_prompt(exec_item, prompt, server_id, i, tried_servers=tried_servers, reserved=reserved)
+            reserved = False
+            
+            if prompt_id:
+                # 等待执行完成（返回是否检测到中断），如果等待期间检测到中断，立即退出
+                if self._finish_prompt(node_id, exec_item, execution_id, prompt_id, server_id, i):
+                    break
+                completed = True
+            else:
+                print(f"[GroupExecutor] 提交 prompt 失败")
+                if auto_server and i == 0:
+                    # 所有候选服务器都提交失败
+                    break
+            
+            # 延迟（支持中断）- 只在重复执行时才有延迟
+            if i < repeat_count - 1:
+                self._sleep_with_cancel(node_id, delay_seconds)
+        
+        # 取消或筛选失败导致没有提交时，归还 select() 的占用
+        if reserved:
+            _server_selector.release(server_id)
+        return completed
+    
+    def _submit_prompt(self, exec_item, prompt, server_id, repeat_index, tried_servers=None, direct_local=False, reserved=False):
+        """提交执行项第 repeat_index 次重复的 prompt
+        
+        远程 prompt 在提交时计入服务器选择器的待执行数（每个 prompt 计一次），执行结束时由 _finish_prompt 归还，
+        提交失败时立即归还。
+        
+        Args:
+            server_id: 服务器ID，None 表示本地服务器
+            tried_servers: 自动选择服务器时传入已尝试的服务器集合，首次提交失败时换一个服务器重试
+            reserved: server_id 已由 _server_selector.select() 占用了待执行数
+            direct_local: 本地执行时直接验证并放入本地队列（prompt_id 与队列一致，可以从队列中删除），
+                否则通过前端提交
+        
+        Returns:
+            tuple: (prompt_id, server_id)，提交失败时 prompt_id 为 None
+        """
+        group_name = exec_item.get("group_name", "")
+        
+        # 设置线程局部存储的组名（用于本地执行时节点获取组名）
+        try:
+            from .trans import set_current_group_name
+            set_current_group_name(group_name)
+        except:
+            pass
+        
+        # 提交到队列（支持指定服务器）
+        # 如果是本地服务器（server_id 为 None），通过 WebSocket 事件通知前端提交 prompt
+        # 这样可以确保预览图能正确显示
+        if server_id is None:
+            if direct_local:
+                return self._queue_prompt(prompt), None
+            # 本地执行：通过 WebSocket 事件通知前端提交 prompt
+            return self._queue_prompt_via_frontend(prompt, exec_item.get("output_node_ids", [])), None
+        
+        # 远程执行：直接提交到远程服务器
+        if not reserved:
+            _server_selector.begin(server_id)
+        prompt_id = self._queue_prompt(prompt, server_id)
+        # 自动选择的服务器首次提交失败时，换一个服务器重试（select() 会占用新服务器的待执行数）
+        while not prompt_id and tried_servers is not None and repeat_index == 0:
+            _server_selector.release(server_id)
+            tried_servers.add(server_id)
+            server_id = _server_selector.select(group_name, exec_item.get("server_pool"), exclude=tried_servers)
+            if server_id is None:
+                return None, None
+            print(f"[GroupExecutor] 组 '{group_name}' 改为提交到服务器: {server_id}")
+            prompt_id = self._queue_prompt(prompt, server_id)
+        if not prompt_id:
+            _server_selector.release(server_id)
+            return None, server_id
+        # 非本地服务器执行时，保存状态文件（按组名，只在第一次执行时保存，覆盖式保存）
+        if repeat_index == 0:
+            try:
+                _group_result_manager.save_status_by_group(
+                    group_name,
+                    server_id,
+                    prompt_id=prompt_id,
+                    started_at=time.time()
+                )
+            except Exception as e:
+                print(f"[GroupExecutor] 保存组状态文件失败: {e}")
+        return prompt_id, server_id
+    
+    def _finish_prompt(self, node_id, exec_item, execution_id, prompt_id, server_id, repeat_index):
+        """等待已提交的 prompt 执行完成，最后一次重复完成时更新组状态（只对非本地服务器）
+        
+        Returns:
+            bool: 检测到中断或取消返回 True，正常完成返回 False
+        """
+        group_name = exec_item.get("group_name", "")
+        repeat_count = int(exec_item.get("repeat_count", 1))
+        
+        # 等待执行完成（返回是否检测到中断），远程执行时归还提交时占用的待执行数并记录耗时
+        started_at = time.time()
+        was_interrupted = None
+        try:
+            was_interrupted = self._wait_for_completion(prompt_id, node_id, server_id)
+        finally:
+            if server_id is not None:
+                duration = time.time() - started_at if was_interrupted is False else None
+                _server_selector.finish(server_id, group_name, duration)
+        
+        if was_interrupted:
+            return True
+        
+        # 组执行完成，更新状态文件（只在最后一次执行时更新，避免重复，只对非本地服务器）
+        if repeat_index == repeat_count - 1 and server_id is not None:
+            result_data = {
+                "completed": True,
+                "completed_at": time.time(),
+                "prompt_id": prompt_id
+            }
+            if repeat_count > 1:
+                result_data["repeat_count"] = repeat_count
+            try:
+                _group_result_manager.set_group_result(
+                    execution_id, 
+                    group_name, 
+                    result_data,
+                    server_id=server_id
+                )
+                # 更新按组名的状态文件（标记为已完成）
+                try:
+                    _group_result_manager.update_status_by_group_completed(
+                        group_name,
+                        prompt_id=prompt_id,
+                        server_id=server_id
+                    )
+                except Exception as e:
+                    print(f"[GroupExecutor] 更新组状态文件失败: {e}")
+            except Exception as e:
+                print(f"[GroupExecutor] 设置组结果失败: {e}")
+        return False
+    
+    def _run_fan_out(self, node_id, exec_item, full_api_prompt, execution_id, max_per_server):
+        """分发模式：把执行项的 fan_out 次重复作为独立任务放入共享队列，由各服务器的工作线程取用
+        
+        空闲的服务器立即取下一个任务，处理得快的服务器自然承担更多任务。第 n 次重复以组名
+        {group_name}__r{n} 执行，结果和状态文件互不覆盖；原组名的状态在全部重复结束后标记完成，
+        GroupExecutorWaitAll 按原组名等待即可。提交失败的任务交给其他服务器重试，该服务器不再取任务；
+        有重复在所有服务器上都失败时，原组名的状态标记为失败（记录未完成的重复序号），不标记完成。
+        
+        Returns:
+            bool: 所有重复都正常完成返回 True
+        """
+        group_name = exec_item.get("group_name", "")
+        repeats = int(exec_item.get("fan_out") or 1)
+        server_id = exec_item.get("server_id", None)
+        
+        # 候选服务器：auto 或指定了 server_pool 时使用服务器池，否则只在指定的服务器上执行
+        if server_id == AUTO_SERVER_ID or exec_item.get("server_pool"):
+            servers = [candidate for candidate, _ in _server_selector.get_candidates(exec_item.get("server_pool"))
+                       if _server_health_monitor.is_available(candidate)]
+        else:
+            servers = [server_id]
+        if not servers:
+            print(f"[GroupExecutor] 组 '{group_name}' 没有可用的服务器，跳过执行")
+            return False
+        
+        # 原组名的状态记录到第一个服务器下（只用于等待完成，结果在各次重复的组名下）
+        status_server_id = servers[0]
+        if status_server_id is not None:
+            try:
+                _group_result_manager.save_status_by_group(group_name, status_server_id, prompt_id=f"fan_out_{execution_id}", started_at=time.time(), execution_id=execution_id)
+            except Exception as e:
+                print(f"[GroupExecutor] 保存组状态文件失败: {e}")
+        
+        jobs = deque(range(1, repeats + 1))
+        attempts = {}  # 重复序号 -> 已尝试的服务器数
+        done = []
+        jobs_lock = threading.Lock()
+        
+        def worker(worker_server_id):
+            while not self._is_cancelled(node_id):
+                with jobs_lock:
+                    if not jobs:
+                        return
+                    repeat_index = jobs.popleft()
+                job = {key: value for key, value in exec_item.items() if key not in ("fan_out", "server_pool")}
+                job.update({
+                    "group_name": _get_repeat_group_name(group_name, repeat_index),
+                    "server_id": worker_server_id,
+                })
+                repeat_execution_id = f"{execution_id}_r{repeat_index}"
+                if worker_server_id is not None:
+                    _group_result_manager.register_execution(repeat_execution_id, [job["group_name"]], worker_server_id)
+                print(f"[GroupExecutor] 组 '{group_name}' 第 {repeat_index}/{repeats} 次分发到服务器: {worker_server_id or 'local'}")
+                
+                if self._run_exec_item(node_id, job, full_api_prompt, repeat_execution_id):
+                    with jobs_lock:
+                        done.append(repeat_index)
+                    continue
+                if self._is_cancelled(node_id):
+                    return
+                # 失败：交给其他服务器重试，本服务器不再取任务
+                with jobs_lock:
+                    attempts[repeat_index] = attempts.get(repeat_index, 0) + 1
+                    if attempts[repeat_index] < len(servers):
+                        jobs.appendleft(repeat_index)
+                print(f"[GroupExecutor] 服务器 {worker_server_id or 'local'} 执行组 '{group_name}' 第 {repeat_index} 次失败，停止向其分发")
+                return
+        
+        # 工作线程按服务器轮流创建，重复次数少于线程数时每个服务器都能分到
+        threads = [
+            threading.Thread(target=worker, args=(worker_server_id,), daemon=True)
+            for _ in range(max(1, max_per_server))
+            for worker_server_id in servers
+        ][:repeats]
+        
+        print(f"[GroupExecutor] 组 '{group_name}' 分发 {repeats} 次重复到 {len(servers)} 个服务器（{len(threads)} 个工作线程）")
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        missing = sorted(set(range(1, repeats + 1)) - set(done))
+        if missing:
+            print(f"[GroupExecutor] 组 '{group_name}' 分发完成 {len(done)}/{repeats} 次，未完成: {missing}")
+        
+        if status_server_id is not None and not self._is_cancelled(node_id):
+            try:
+                if missing:
+                    _group_result_manager.set_group_failed(execution_id, group_name, {
+                        "error": f"{len(missing)}/{repeats} 次重复在所有服务器上执行失败",
+                        "repeat_count": repeats,
+                        "missing_repeats": missing,
+                    }, server_id=status_server_id)
+                else:
+                    _group_result_manager.set_group_result(execution_id, group_name, {
+                        "completed": True,
+                        "completed_at": time.time(),
+                        "repeat_count": repeats,
+                    }, server_id=status_server_id)
+            except Exception as e:
+                print(f"[GroupExecutor] 设置组结果失败: {e}")
+        
+        return not missing
+    
+    def _execute_list_pipelined(self, node_id, execution_list, full_api_prompt, group_execution_ids, has_remote_server, lookahead):
+        """流水线顺序执行：当前 prompt 执行期间，提前筛选、验证并提交后续最多 lookahead 个 prompt
+        
+        ComfyUI 队列按提交顺序执行，完成处理也按提交顺序进行，队列中始终有等待执行的 prompt。
+        只在同一个队列（同一服务器）内提前提交：执行项的服务器与已提交的 prompt 不同时，先等待其完成
+        （例如本地组读取远程组的结果，远程组提交时已清除旧结果文件），执行项带 independent: true 时除外。
+        以下情况也会先等待已提交的 prompt 完成再继续提交：延迟/屏障标记、depends_on 中的组尚未完成、
+        远程服务器上的同名组尚未完成（共享状态文件和结果文件）、带 delay_seconds 的重复。
+        自动选择服务器和分发模式的执行项不参与流水线，按原方式执行。
+        本地 prompt 直接验证后放入本地队列（不经过前端），取消时从本地和远程队列中删除已提前提交的 prompt。
+        远程 prompt 在提交时即计入服务器选择器的待执行数，提前提交的工作对自动选择服务器可见。
+        """
+        in_flight = deque()  # (exec_item, execution_id, prompt_id, server_id, repeat_index)，按提交顺序
+        
+        def finish_until(blocked):
+            """按提交顺序等待已提交的 prompt 完成，直到 blocked() 为假；被取消时返回 False"""
+            while in_flight and blocked():
+                exec_item, execution_id, prompt_id, server_id, repeat_index = in_flight.popleft()
+                self._finish_prompt(node_id, exec_item, execution_id, prompt_id, server_id, repeat_index)
+                if self._is_cancelled(node_id):
+                    self._cancel_queued_prompts(in_flight)
+                    in_flight.clear()
+                    return False
+            return not self._is_cancelled(node_id)
+        
+        def drain():
+            return finish_until(lambda: True)
+        
+        for exec_item in execution_list:
+            if self._is_cancelled(node_id):
+                print(f"[GroupExecutor] 任务被取消")
+                break
+            
+            group_name = exec_item.get("group_name", "")
+            output_node_ids = exec_item.get("output_node_ids", [])
+            
+            # 标记项：先等待之前提交的所有 prompt 完成
+            if _is_marker_item(exec_item):
+                if not drain():
+                    break
+                if group_name == DELAY_MARKER:
+                    self._sleep_with_cancel(node_id, float(exec_item.get("delay_seconds", 0)))
+                continue
+            
+            if not group_name or not output_node_ids:
+                print(f"[GroupExecutor] 跳过无效执行项: group_name={group_name}, output_node_ids={output_node_ids}")
+                continue
+            
+            execution_id = self._get_group_execution_id(node_id, exec_item, group_execution_ids, has_remote_server)
+            server_id = exec_item.get("server_id", None)
+            
+            if server_id == AUTO_SERVER_ID or int(exec_item.get("fan_out") or 1) > 1:
+                if not drain():
+                    break
+                self._run_exec_item(node_id, exec_item, full_api_prompt, execution_id)
+                continue
+            
+            depends_on = set(exec_item.get("depends_on") or [])
+            independent = bool(exec_item.get("independent", False))
+            repeat_count = int(exec_item.get("repeat_count", 1))
+            delay_seconds = float(exec_item.get("delay_seconds", 0))
+            
+            for i in range(repeat_count):
+                def blocked():
+                    if len(in_flight) > lookahead:
+                        return True
+                    for entry in in_flight:
+                        entry_group = entry[0].get("group_name")
+                        if entry_group in depends_on:
+                            return True
+                        # 不同队列之间没有执行顺序保证，可能读取对方的结果，除非明确标记为独立
+                        if entry[3] != server_id and not independent:
+                            return True
+                        if entry_group == group_name and (server_id is not None or entry[3] is not None or (i > 0 and delay_seconds > 0)):
+                            return True
+                    return False
+                
+                if not finish_until(blocked):
+                    break
+                if i > 0:
+                    self._sleep_with_cancel(node_id, delay_seconds)
+                    if self._is_cancelled(node_id):
+                        break
+                
+                if repeat_count > 1:
+                    print(f"[GroupExecutor] 执行组 '{group_name}' ({i+1}/{repeat_count})")
+                
+                prompt = self._build_group_prompt(group_name, output_node_ids, full_api_prompt)
+                if not prompt:
+                    print(f"[GroupExecutor] 筛选 prompt 失败")
+                    continue
+                
+                prompt_id, _ = self._submit_prompt(exec_item, prompt, server_id, i, direct_local=True)
+                if not prompt_id:
+                    print(f"[GroupExecutor] 提交 prompt 失败")
+                    continue
+                in_flight.append((exec_item, execution_id, prompt_id, server_id, i))
+        
+        drain()
+    
+    def _cancel_queued_prompts(self, entries):
+        """从本地和远程队列中删除已提交但尚未执行的 prompt（流水线执行被取消时调用）
+        
+        这些 prompt 不会再经过 _finish_prompt，远程 prompt 提交时占用的待执行数在这里归还。
+        """
+        removed = 0
+        for exec_item, execution_id, prompt_id, server_id, repeat_index in entries:
+            if server_id is not None:
+                _server_selector.release(server_id)
+            try:
+                if server_id is None:
+                    self.completion_tracker.discard(prompt_id)
+                    if PromptServer.instance.prompt_queue.delete_queue_item(lambda item: len(item) >= 2 and item[1] == prompt_id):
+                        removed += 1
+                elif HAS_REQUESTS:
+                    server_config = _server_config_manager.get_server(server_id)
+                    if server_config:
+                        _remote_session_pool.post(server_config, "/queue", json={"delete": [prompt_id]}, timeout=5)
+                        removed += 1
+            except Exception as e:
+                print(f"[GroupExecutor] 删除已提交的 prompt 失败 ({prompt_id}): {e}")
+        if entries:
+            print(f"[GroupExecutor] 已从队列中删除 {removed}/{len(entries)} 个提前提交的 prompt")
+    
+    def _execute_list_parallel(self, node_id, execution_list, full_api_prompt, group_execution_ids, has_remote_server, max_per_server):
+        """并行调度执行列表
+        
+        执行列表被 __delay__ / __barrier__ 标记切分为若干段，段与段之间严格按顺序执行；
+        同一段内不同服务器上的执行项同时运行，同一服务器按列表顺序最多同时运行 max_per_server 项。
+        """
+        segment = []
+        for exec_item in execution_list:
+            if self._is_cancelled(node_id):
+                print(f"[GroupExecutor] 任务被取消")
+                return
+            
+            group_name = exec_item.get("group_name", "")
+            
+            # 标记项：先等待之前的所有执行项完成
+            if _is_marker_item(exec_item):
+                self._run_segment_parallel(node_id, segment, full_api_prompt, group_execution_ids, max_per_server)
+                segment = []
+                if group_name == DELAY_MARKER:
+                    self._sleep_with_cancel(node_id, float(exec_item.get("delay_seconds", 0)))
+                continue
+            
+            output_node_ids = exec_item.get("output_node_ids", [])
+            if not group_name or not output_node_ids:
+                print(f"[GroupExecutor] 跳过无效执行项: group_name={group_name}, output_node_ids={output_node_ids}")
+                continue
+            
+            # 在调度线程中提前生成 execution_id，避免并发生成
+            self._get_group_execution_id(node_id, exec_item, group_execution_ids, has_remote_server)
+            segment.append(exec_item)
+        
+        if not self._is_cancelled(node_id):
+            self._run_segment_parallel(node_id, segment, full_api_prompt, group_execution_ids, max_per_server)
+    
+    def _run_segment_parallel(self, node_id, segment, full_api_prompt, group_execution_ids, max_per_server):
+        """并行执行一段（两个屏障之间）的执行项，返回时该段全部执行项已结束"""
+        if not segment:
+            return
+        
+        if len(segment) == 1:
+            exec_item = segment[0]
+            self._run_exec_item(node_id, exec_item, full_api_prompt, group_execution_ids[exec_item.get("group_name")], max_per_server)
+            return
+        
+        # 计算依赖：同名组（共享状态文件和结果文件）以及 depends_on 中列出的组必须先完成
+        dependencies = []
+        for idx, exec_item in enumerate(segment):
+            depends_on = set(exec_item.get("depends_on") or [])
+            depends_on.add(exec_item.get("group_name"))
+            dependencies.append([
+                j for j in range(idx)
+                if segment[j].get("group_name") in depends_on
+            ])
+        
+        done_events = [threading.Event() for _ in segment]
+        
+        # 按服务器分配到各自的队列（保持列表顺序）
+        server_queues = OrderedDict()
+        for idx, exec_item in enumerate(segment):
+            server_key = exec_item.get("server_id") or "local"
+            server_queues.setdefault(server_key, deque()).append(idx)
+        
+        def worker(queue, queue_lock):
+            while True:
+                with queue_lock:
+                    if not queue:
+                        return
+                    idx = queue.popleft()
+                exec_item = segment[idx]
+                try:
+                    # 等待依赖项完成（期间响应取消）
+                    for dep in dependencies[idx]:
+                        while not done_events[dep].wait(0.5):
+                            if self._is_cancelled(node_id):
+                                break
+                    if not self._is_cancelled(node_id):
+                        self._run_exec_item(node_id, exec_item, full_api_prompt, group_execution_ids[exec_item.get("group_name")], max_per_server)
+                except Exception as e:
+                    print(f"[GroupExecutor] 并行执行组 '{exec_item.get('group_name')}' 出错: {e}")
+                    import traceback
+                    traceback.print_exc()
+                finally:
+                    done_events[idx].set()
+        
+        threads = []
+        for server_key, queue in server_queues.items():
+            queue_lock = threading.Lock()
+            # 自动选择服务器的执行项共用一个队列，按候选服务器数量放大并发数
+            concurrency = max_per_server * max(1, len(_server_selector.get_candidates())) if server_key == AUTO_SERVER_ID else max_per_server
+            for _ in range(min(concurrency, len(queue))):
+                threads.append(threading.Thread(target=worker, args=(queue, queue_lock), daemon=True))
+        
+        print(f"[GroupExecutor] 并行执行 {len(segment)} 个执行项，涉及 {len(server_queues)} 个服务器")
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    
     def _queue_prompt_via_frontend(self, prompt, output_node_ids):
         """通过 WebSocket 事件通知前端提交 prompt（用于本地执行，确保预览图正确显示）
         
@@ -432,6 +915,7 @@ class GroupExecutorBackend:
         try:
             server = PromptServer.instance
             prompt_id = str(uuid.uuid4())
+            self.completion_tracker.register(prompt_id)
             
             # 通过 WebSocket 事件通知前端提交 prompt
             # 这样前端会使用 api.queuePrompt 来提交，确保预览图能正确显示
@@ -468,6 +952,12 @@ class GroupExecutorBackend:
                     print(f"[GroupExecutor] 未找到服务器配置: {server_id}")
                     return None
                 
+                # 健康检查判定不可用的服务器直接跳过，避免等待请求超时
+                if not _server_health_monitor.is_available(server_id):
+                    health = _server_health_monitor.get_health(server_id) or {}
+                    print(f"[GroupExecutor] 服务器 '{server_id}' 不可用（连续 {health.get('failure_streak')} 次健康检查失败: {health.get('last_error')}），跳过提交")
+                    return None
+                
                 # 向远程服务器发送请求
                 try:
                     return self._queue_prompt_to_remote(prompt, server_config)
@@ -479,6 +969,7 @@ class GroupExecutorBackend:
             # 本地执行
             server = PromptServer.instance
             prompt_id = str(uuid.uuid4())
+            self.completion_tracker.register(prompt_id)
             
             # 验证 prompt（validate_prompt 是异步函数，需要在事件循环中运行）
             try:
@@ -575,32 +1066,27 @@ class GroupExecutorBackend:
         try:
             
             url = server_config.get("url", "").rstrip('/')
-            auth_token = server_config.get("auth_token")
             
             if not url:
                 print(f"[GroupExecutor] 服务器URL为空")
                 return None
             
-            # 准备请求头
-            headers = {"Content-Type": "application/json"}
-            if auth_token:
-                headers["Authorization"] = f"Bearer {auth_token}"
-            
-            # 发送 prompt 到远程服务器
-            prompt_url = f"{url}/prompt"
+            # 先建立该服务器的 WebSocket 监听，使用监听器的 client_id 提交，执行事件才会推送过来
+            _remote_completion_watcher.ensure_connection(server_config)
+            generation = _remote_completion_watcher.get_generation(server_config.get("id"))
             
-            # 使用 requests 同步发送（在后台线程中运行）
-            response = requests.post(
-                prompt_url,
-                json={"prompt": prompt},
-                headers=headers,
-                timeout=30
+            # 通过连接池同步发送（在后台线程中运行，复用 keep-alive 连接）
+            response = _remote_session_pool.post(
+                server_config,
+                "/prompt",
+                json={"prompt": prompt, "client_id": _remote_completion_watcher.client_id}
             )
             
             if response.status_code == 200:
                 result = response.json()
                 prompt_id = result.get("prompt_id")
                 if prompt_id:
+                    _remote_completion_watcher.set_submit_generation(server_config.get("id"), prompt_id, generation)
                     print(f"[GroupExecutor] 已向远程服务器 {server_config.get('name', url)} 提交 prompt: {prompt_id}")
                     return prompt_id
                 else:
@@ -642,76 +1128,92 @@ class GroupExecutorBackend:
             if server_id:
                 return self._wait_for_remote_completion(prompt_id, node_id, server_id)
             
-            # 本地执行等待逻辑
+            # 本地执行等待逻辑：由 completion_tracker 在执行结束事件到达时唤醒，
+            # 只在漏掉事件时才回退到检查队列和历史记录
             server = PromptServer.instance
+            tracker = self.completion_tracker
+            tracker.register(prompt_id)
             
-            while True:
-                # 检查这个 prompt 是否被中断
-                if prompt_id in self.interrupted_prompts:
-                    # 设置任务取消标志
-                    with self.task_lock:
-                        if node_id in self.running_tasks:
-                            self.running_tasks[node_id]["cancel"] = True
-                    # 从中断集合中移除
-                    self.interrupted_prompts.discard(prompt_id)
-                    return True  # 返回中断状态
-                
-                # 检查是否被取消
-                if self.running_tasks.get(node_id, {}).get("cancel"):
-                    # 从队列中删除这个 prompt（如果还在队列中）
-                    try:
-                        def should_delete(item):
-                            return len(item) >= 2 and item[1] == prompt_id
-                        server.prompt_queue.delete_queue_item(should_delete)
-                    except Exception as del_error:
-                        print(f"[GroupExecutor] 删除队列项时出错: {del_error}")
-                    return True  # 返回中断状态
-                
-                # 检查是否在历史记录中（表示已完成）
-                if prompt_id in server.prompt_queue.history:
-                    # 检查是否是因为中断而完成的
+            try:
+                while True:
+                    # 检查这个 prompt 是否被中断
                     if prompt_id in self.interrupted_prompts:
+                        # 设置任务取消标志
+                        with self.task_lock:
+                            if node_id in self.running_tasks:
+                                self.running_tasks[node_id]["cancel"] = True
+                        # 从中断集合中移除
                         self.interrupted_prompts.discard(prompt_id)
-                        return True
-                    return False  # 正常完成
-                
-                # 检查是否还在队列中
-                running, pending = server.prompt_queue.get_current_queue()
-                
-                in_queue = False
-                for item in running:
-                    if len(item) >= 2 and item[1] == prompt_id:
-                        in_queue = True
-                        break
-                
-                if not in_queue:
-                    for item in pending:
-                        if len(item) >= 2 and item[1] == prompt_id:
-                            in_queue = True
-                            break
-                
-                if not in_queue and prompt_id not in server.prompt_queue.history:
-                    # 可能已经执行完成但还没更新历史记录，再等一会
-                    time.sleep(0.5)
-                    # 再次检查
+                        return True  # 返回中断状态
+                    
+                    # 检查是否被取消
+                    if self.running_tasks.get(node_id, {}).get("cancel"):
+                        # 从队列中删除这个 prompt（如果还在队列中）
+                        try:
+                            def should_delete(item):
+                                return len(item) >= 2 and item[1] == prompt_id
+                            server.prompt_queue.delete_queue_item(should_delete)
+                        except Exception as del_error:
+                            print(f"[GroupExecutor] 删除队列项时出错: {del_error}")
+                        return True  # 返回中断状态
+                    
+                    # 检查是否已收到执行结束事件
+                    status = tracker.get_status(prompt_id)
+                    if status is not None:
+                        if status == "interrupted" or prompt_id in self.interrupted_prompts:
+                            self.interrupted_prompts.discard(prompt_id)
+                            return True
+                        return False  # 正常完成（执行出错也视为该组已结束）
+                    
+                    # 兜底检查：是否在历史记录中（表示已完成）
                     if prompt_id in server.prompt_queue.history:
-                        # 检查是否是因为中断完成的
+                        # 检查是否是因为中断而完成的
                         if prompt_id in self.interrupted_prompts:
                             self.interrupted_prompts.discard(prompt_id)
                             return True
-                        return False
-                    if not in_queue:
-                        return False
-                
-                time.sleep(0.5)
+                        return False  # 正常完成
+                    
+                    # 兜底检查：是否还在队列中
+                    if not self._is_in_local_queue(server, prompt_id):
+                        # 可能已经执行完成但还没更新历史记录，再等一会
+                        status = tracker.wait(prompt_id, 0.5)
+                        if status is None and self.running_tasks.get(node_id, {}).get("cancel"):
+                            continue
+                        if status == "interrupted" or prompt_id in self.interrupted_prompts:
+                            self.interrupted_prompts.discard(prompt_id)
+                            return True
+                        if status is not None or prompt_id in server.prompt_queue.history:
+                            return False
+                        if not self._is_in_local_queue(server, prompt_id):
+                            return False
+                    
+                    # 等待执行结束事件（无需轮询）
+                    tracker.wait(prompt_id, COMPLETION_FALLBACK_INTERVAL)
+            finally:
+                tracker.discard(prompt_id)
                 
         except Exception as e:
             print(f"[GroupExecutor] 等待执行完成时出错: {e}")
             return False
     
+    def _is_in_local_queue(self, server, prompt_id):
+        """检查 prompt 是否还在本地运行或等待队列中"""
+        running, pending = server.prompt_queue.get_current_queue()
+        for item in running:
+            if len(item) >= 2 and item[1] == prompt_id:
+                return True
+        for item in pending:
+            if len(item) >= 2 and item[1] == prompt_id:
+                return True
+        return False
+    
     def _wait_for_remote_completion(self, prompt_id, node_id, server_id):
         """等待远程服务器上的 prompt 执行完成
         
+        通过该服务器共享的 /ws 长连接接收执行结束事件；只有在 WebSocket 断开时
+        才回退到按 prompt_id 查询 /history/{prompt_id}。
+        远程 prompt 执行结束（包括出错、被远程中断）都视为完成，只有本地取消才返回中断。
+        
         Args:
             prompt_id: prompt ID
             node_id: 节点 ID
@@ -731,88 +1233,66 @@ class GroupExecutorBackend:
                 return False
             
             url = server_config.get("url", "").rstrip('/')
-            auth_token = server_config.get("auth_token")
             
             if not url:
                 print(f"[GroupExecutor] 服务器URL为空")
                 return False
             
-            # 准备请求头
-            headers = {}
-            if auth_token:
-                headers["Authorization"] = f"Bearer {auth_token}"
-            
-            queue_url = f"{url}/queue"
+            watcher = _remote_completion_watcher
+            watcher.ensure_connection(server_config)
+            tracker = watcher.get_tracker(server_id)
+            tracker.register(prompt_id)
+            # 提交时 WebSocket 已连接则无需补查历史记录，否则连接建立后需要查一次（可能漏掉了事件）
+            checked_generation = watcher.pop_submit_generation(server_id, prompt_id)
             
-            while True:
-                # 检查是否被取消
-                if self.running_tasks.get(node_id, {}).get("cancel"):
-                    # 尝试中断远程执行
-                    try:
-                        interrupt_url = f"{url}/interrupt"
-                        requests.post(interrupt_url, headers=headers, timeout=5)
-                    except:
-                        pass
-                    return True
-                
-                # 检查远程队列状态
-                try:
-                    response = requests.get(queue_url, headers=headers, timeout=5)
-                    if response.status_code == 200:
-                        data = response.json()
-                        queue_running = data.get("queue_running", [])
-                        queue_pending = data.get("queue_pending", [])
-                        queue_history = data.get("queue_history", [])
-                        
-                        # 检查是否在运行或等待队列中
-                        in_queue = False
-                        for item in queue_running:
-                            if isinstance(item, list) and len(item) >= 2 and item[1] == prompt_id:
-                                in_queue = True
-                                break
-                        
-                        if not in_queue:
-                            for item in queue_pending:
-                                if isinstance(item, list) and len(item) >= 2 and item[1] == prompt_id:
-                                    in_queue = True
-                                    break
-                        
-                        # 检查是否在历史记录中
-                        in_history = False
-                        for item in queue_history:
-                            if isinstance(item, list) and len(item) >= 2 and item[1] == prompt_id:
-                                in_history = True
-                                break
-                        
-                        if in_history:
-                            # 已完成
-                            return False
-                        
-                        if not in_queue and not in_history:
-                            # 可能已完成但历史记录还没更新，再等一会
-                            time.sleep(0.5)
-                            # 再次检查
-                            response = requests.get(queue_url, headers=headers, timeout=5)
-                            if response.status_code == 200:
-                                data = response.json()
-                                queue_history = data.get("queue_history", [])
-                                for item in queue_history:
-                                    if isinstance(item, list) and len(item) >= 2 and item[1] == prompt_id:
-                                        return False
-                            # 如果还是不在队列中，可能已完成
+            try:
+                while True:
+                    # 检查是否被取消
+                    if self._is_cancelled(node_id):
+                        # 尝试中断远程执行
+                        try:
+                            _remote_session_pool.post(server_config, "/interrupt", timeout=5)
+                        except:
+                            pass
+                        return True
+                    
+                    # 检查是否已收到执行结束事件
+                    if tracker.get_status(prompt_id) is not None:
+                        return False
+                    
+                    generation = watcher.get_generation(server_id)
+                    if generation is not None:
+                        # WebSocket 已连接：连接（重新）建立后补查一次历史记录，之后只等待事件
+                        if generation != checked_generation:
+                            checked_generation = generation
+                            if self._remote_history_has_prompt(server_config, prompt_id):
+                                return False
+                            continue
+                        tracker.wait(prompt_id, COMPLETION_FALLBACK_INTERVAL)
+                    else:
+                        # WebSocket 断开：按 prompt_id 查询历史记录（服务器被健康检查判定不可用时暂不查询，避免反复等待超时）
+                        if not _server_health_monitor.is_down(server_id) and self._remote_history_has_prompt(server_config, prompt_id):
                             return False
-                except Exception as e:
-                    # 捕获所有异常（包括 requests.exceptions.RequestException）
-                    print(f"[GroupExecutor] 检查远程队列状态失败: {e}")
-                    # 继续等待
-                
-                time.sleep(0.5)
+                        tracker.wait(prompt_id, REMOTE_HISTORY_POLL_INTERVAL)
+            finally:
+                tracker.discard(prompt_id)
                 
         except Exception as e:
             print(f"[GroupExecutor] 等待远程执行完成时出错: {e}")
             import traceback
             traceback.print_exc()
             return False
+    
+    def _remote_history_has_prompt(self, server_config, prompt_id):
+        """查询远程 /history/{prompt_id}，判断 prompt 是否已执行结束"""
+        try:
+            response = _remote_session_pool.get(server_config, f"/history/{prompt_id}", timeout=5)
+            if response.status_code == 200:
+                return prompt_id in (response.json() or {})
+        except Exception as e:
+            # 捕获所有异常（包括 requests.exceptions.RequestException）
+            print(f"[GroupExecutor] 查询远程历史记录失败: {e}")
+        return False
 
 # 全局后台执行器实例
 _backend_executor = GroupExecutorBackend()
@@ -827,16 +1307,632 @@ except:
     STATUS_DIR = os.path.join(os.path.dirname(os.path.realpath(__file__)), "execution_status")
 os.makedirs(STATUS_DIR, exist_ok=True)
 
+# 远程结果文件的扩展名（PNG / 无损 WebP / 未压缩 NPY）
+REMOTE_RESULT_EXTENSIONS = ('.png', '.webp', '.npy')
+# 结果清单文件后缀：remote_results/{group_name}_{link_id}.manifest.json，由发送端原子写入，
+# 列出该组/link 的全部结果文件；结果文件本身放在 remote_results/{group_name}/{link_id}/ 下。
+# 旧版平铺布局的文件为 {group_name}_{link_id}_{index}.png 等，启动时迁移到分组目录
+REMOTE_MANIFEST_SUFFIX = '.manifest.json'
+# 异步编码进行中的标记文件后缀：{group_name}_{link_id}_{token}.pending，编码全部写完后删除
+REMOTE_PENDING_SUFFIX = '.pending'
+# 标记组完成前等待异步编码写完的最长时间（秒）
+REMOTE_PENDING_TIMEOUT = 300.0
+
+# 等待组完成时的兜底重新扫描间隔（秒）：本进程写入会立即唤醒等待者，
+# 只有其他进程写入状态文件时才依赖该扫描
+STATUS_RESCAN_INTERVAL = 1.0
+
+# 状态写入是否 fsync（持久化到磁盘后才返回），默认关闭，与原先行为一致
+STATUS_STORE_FSYNC = False
+# 组提交窗口（秒）：大于 0 时，窗口内的写入合并为一批，由后台线程统一写出并 fsync，
+# 同一文件的多次写入只落盘最后一次；为 0 时在调用线程中直接写出
+STATUS_STORE_BATCH_WINDOW = 0.0
+
+class StatusStore:
+    """状态/结果 JSON 文件的统一读写
+    
+    写入：紧凑 JSON 写到同目录的唯一临时文件，再 os.replace 原子替换（不再先删除目标文件），
+    读取方要么看到旧内容、要么看到新内容，不会出现文件暂时不存在的窗口。
+    可选 fsync 与组提交：开启 batch_window 后，多个线程的写入合并为一批，每个目录只 fsync 一次。
+    读取时优先返回尚未落盘的最新内容。
+    """
+    
+    def __init__(self, fsync=STATUS_STORE_FSYNC, batch_window=STATUS_STORE_BATCH_WINDOW):
+        self.fsync = fsync
+        self.batch_window = batch_window
+        self.lock = threading.Lock()
+        self.condition = threading.Condition(self.lock)
+        self._pending = {}      # path -> payload（等待组提交）
+        self._batch_seq = 0     # 当前正在收集的批次号
+        self._committed_seq = 0
+        self._errors = {}       # 批次号 -> {path: 异常}
+        self._flusher = None
+    
+    @staticmethod
+    def dumps(data):
+        """紧凑序列化（无缩进、无多余空格）"""
+        return json.dumps(data, ensure_ascii=False, separators=(',', ':'))
+    
+    def _write_file(self, path, payload):
+        temp_file = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(temp_file, 'w', encoding='utf-8') as f:
+                f.write(payload)
+                if self.fsync:
+                    f.flush()
+                    os.fsync(f.fileno())
+            os.replace(temp_file, path)
+        except Exception:
+            if os.path.exists(temp_file):
+                try:
+                    os.remove(temp_file)
+                except OSError:
+                    pass
+            raise
+    
+    def _fsync_dirs(self, paths):
+        """fsync 目录，保证 rename 持久化（不支持目录 fsync 的平台忽略）"""
+        if not self.fsync:
+            return
+        for directory in {os.path.dirname(path) or '.' for path in paths}:
+            try:
+                fd = os.open(directory, os.O_RDONLY)
+            except OSError:
+                continue
+            try:
+                os.fsync(fd)
+            except OSError:
+                pass
+            finally:
+                os.close(fd)
+    
+    def write(self, path, data, wait=True):
+        """原子写入 JSON 文件，失败时抛出异常
+        
+        组提交模式下 wait 为 True 时等待所在批次落盘（并抛出该文件的写入异常），
+        为 False 时立即返回，后续读取仍能读到最新内容。
+        """
+        payload = self.dumps(data)
+        if self.batch_window <= 0:
+            self._write_file(path, payload)
+            self._fsync_dirs([path])
+            return
+        
+        with self.condition:
+            self._pending[path] = payload
+            seq = self._batch_seq
+            if self._flusher is None or not self._flusher.is_alive():
+                self._flusher = threading.Thread(target=self._run_flusher, daemon=True, name="LG_StatusStore")
+                self._flusher.start()
+            self.condition.notify_all()
+            if not wait:
+                return
+            while self._committed_seq <= seq:
+                self.condition.wait()
+            error = self._errors.get(seq, {}).pop(path, None)
+        if error is not None:
+            raise error
+    
+    def _run_flusher(self):
+        while True:
+            with self.condition:
+                while not self._pending:
+                    if not self.condition.wait(timeout=60):
+                        self._flusher = None
+                        return
+            # 等待窗口结束，收集同一批次的其他写入
+            time.sleep(self.batch_window)
+            self.flush()
+    
+    def flush(self):
+        """立即写出所有等待组提交的内容"""
+        with self.condition:
+            batch = self._pending
+            seq = self._batch_seq
+            self._pending = {}
+            self._batch_seq += 1
+        errors = {}
+        for path, payload in batch.items():
+            try:
+                self._write_file(path, payload)
+            except Exception as e:
+                print(f"[StatusStore] 写入失败: {path}, 错误: {e}")
+                errors[path] = e
+        self._fsync_dirs(batch.keys())
+        with self.condition:
+            if errors:
+                self._errors[seq] = errors
+            self._errors.pop(seq - 16, None)
+            self._committed_seq = seq + 1
+            self.condition.notify_all()
+    
+    def read(self, path):
+        """读取 JSON 文件，优先返回尚未落盘的内容；文件不存在或内容无效时返回 None"""
+        with self.lock:
+            payload = self._pending.get(path)
+        try:
+            if payload is None:
+                with open(path, 'r', encoding='utf-8') as f:
+                    payload = f.read()
+            return json.loads(payload)
+        except (OSError, ValueError):
+            return None
+
+# 全局状态读写实例（状态文件、文本结果、结果清单共用）
+_status_store = StatusStore()
+
+def _get_result_subdir(results_dir, safe_group_name, link_id=None):
+    """结果文件所在的分组目录：{results_dir}/{group_name}/{link_id}（link_id 为 None 时返回组目录）"""
+    if link_id is None:
+        return os.path.join(results_dir, safe_group_name)
+    return os.path.join(results_dir, safe_group_name, str(link_id))
+
+def _get_result_manifest_path(results_dir, safe_group_name, link_id):
+    """结果清单路径：{results_dir}/{group_name}_{link_id}.manifest.json"""
+    return os.path.join(results_dir, f"{safe_group_name}_{link_id}{REMOTE_MANIFEST_SUFFIX}")
+
+def _read_result_manifest(manifest_path):
+    """读取结果清单，不存在或损坏时返回 None"""
+    manifest = _status_store.read(manifest_path)
+    return manifest if isinstance(manifest, dict) else None
+
+def _get_manifest_files(manifest):
+    """清单中引用的全部文件（相对 results_dir 的路径，使用 / 分隔）"""
+    names = []
+    for entry in manifest.get("entries", []):
+        for key in ("image", "mask"):
+            if entry.get(key):
+                names.append(entry[key])
+    return names
+
+# 组状态存储后端："json"（每个组一个 JSON 文件，默认）或 "sqlite"（execution_status/execution_ledger.db，WAL 模式）。
+# 同一个 execution_status 目录的所有进程需使用相同的后端；SQLite 的 WAL 模式不适用于网络文件系统
+STATUS_BACKEND = "json"
+STATUS_SQLITE_FILENAME = "execution_ledger.db"
+
+class JsonStatusBackend:
+    """组状态后端：每个组一个 JSON 文件（{status_dir}/{安全组名}.json），通过 StatusStore 原子写入"""
+    
+    name = "json"
+    # 其他进程的写入由 StatusChangeFeed 监听文件变化得知
+    watches_files = True
+    
+    def __init__(self, status_dir, read_status_file):
+        self.status_dir = status_dir
+        self._read_status_file = read_status_file
+    
+    def load_all(self):
+        """读取全部组状态，返回 {安全组名: 状态数据}"""
+        index = {}
+        for filename in os.listdir(self.status_dir):
+            status_data = self._read_status_file(os.path.join(self.status_dir, filename))
+            if status_data is not None:
+                index[filename[:-len('.json')]] = status_data
+        return index
+    
+    def put(self, safe_name, status_data):
+        _status_store.write(os.path.join(self.status_dir, f"{safe_name}.json"), status_data)
+    
+    def delete(self, safe_name):
+        status_file = os.path.join(self.status_dir, f"{safe_name}.json")
+        if not os.path.exists(status_file):
+            return False
+        os.remove(status_file)
+        return True
+    
+    def has_external_changes(self):
+        return False
+    
+    def record_artifacts(self, safe_name, execution_id, names):
+        """结果文件本身即为记录，无需额外保存"""
+        pass
+
+class SqliteStatusBackend:
+    """组状态后端：SQLite（WAL 模式，读写并发互不阻塞）
+    
+    表结构：
+        executions: 执行ID及创建时间
+        group_runs: 每个组最近一次运行（执行ID、服务器、prompt_id、完成状态、各时间点，完整状态 JSON 存在 data 列），
+            按 execution_id / prompt_id / created_at 建索引
+        result_artifacts: 组完成时确认的结果文件（相对 remote_results 的路径）
+    首次启用时从现有的 JSON 状态文件迁移；其他进程的写入通过 PRAGMA data_version 检测。
+    """
+    
+    name = "sqlite"
+    watches_files = False
+    
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS executions (
+            execution_id TEXT PRIMARY KEY,
+            created_at REAL
+        );
+        CREATE TABLE IF NOT EXISTS group_runs (
+            safe_name TEXT PRIMARY KEY,
+            group_name TEXT NOT NULL,
+            execution_id TEXT,
+            server_id TEXT,
+            prompt_id TEXT,
+            completed INTEGER NOT NULL DEFAULT 0,
+            started_at REAL,
+            completed_at REAL,
+            created_at REAL,
+            updated_at REAL,
+            data TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_group_runs_execution ON group_runs(execution_id);
+        CREATE INDEX IF NOT EXISTS idx_group_runs_prompt ON group_runs(prompt_id);
+        CREATE INDEX IF NOT EXISTS idx_group_runs_created ON group_runs(created_at);
+        CREATE TABLE IF NOT EXISTS result_artifacts (
+            safe_name TEXT NOT NULL,
+            execution_id TEXT,
+            path TEXT NOT NULL,
+            recorded_at REAL,
+            PRIMARY KEY (safe_name, path)
+        );
+        CREATE INDEX IF NOT EXISTS idx_result_artifacts_execution ON result_artifacts(execution_id);
+    """
+    
+    def __init__(self, status_dir, read_status_file, db_path=None):
+        self.status_dir = status_dir
+        self.db_path = db_path or os.path.join(status_dir, STATUS_SQLITE_FILENAME)
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(self.db_path, timeout=30, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(self.SCHEMA)
+        self._data_version = self._get_data_version()
+        self._migrate_json(read_status_file)
+    
+    def _get_data_version(self):
+        return self.conn.execute("PRAGMA data_version").fetchone()[0]
+    
+    def _migrate_json(self, read_status_file):
+        """数据库为空时导入现有的 JSON 组状态文件（文件保留不删除）"""
+        with self.lock:
+            if self.conn.execute("SELECT COUNT(*) FROM group_runs").fetchone()[0]:
+                return
+        migrated = 0
+        for filename in os.listdir(self.status_dir):
+            status_data = read_status_file(os.path.join(self.status_dir, filename))
+            if status_data is not None:
+                self.put(filename[:-len('.json')], status_data)
+                migrated += 1
+        if migrated:
+            print(f"[GroupResultManager] 已从 JSON 状态文件迁移 {migrated} 个组状态到 {self.db_path}")
+    
+    def load_all(self):
+        with self.lock:
+            rows = self.conn.execute("SELECT safe_name, data FROM group_runs").fetchall()
+        index = {}
+        for safe_name, data in rows:
+            try:
+                index[safe_name] = json.loads(data)
+            except ValueError:
+                print(f"[GroupResultManager] 组状态数据损坏，已忽略: {safe_name}")
+        return index
+    
+    def put(self, safe_name, status_data):
+        execution_id = status_data.get("execution_id")
+        created_at = status_data.get("created_at", status_data.get("timestamp"))
+        with self.lock, self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO group_runs (safe_name, group_name, execution_id, server_id, prompt_id, completed, "
+                "started_at, completed_at, created_at, updated_at, data) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (safe_name, status_data.get("group_name", safe_name), execution_id, status_data.get("server_id"),
+                 status_data.get("prompt_id"), 1 if status_data.get("completed") else 0, status_data.get("started_at"),
+                 status_data.get("completed_at"), created_at, time.time(), StatusStore.dumps(status_data)))
+            if execution_id:
+                self.conn.execute("INSERT OR IGNORE INTO executions (execution_id, created_at) VALUES (?, ?)",
+                                  (execution_id, created_at or time.time()))
+    
+    def delete(self, safe_name):
+        with self.lock, self.conn:
+            return self.conn.execute("DELETE FROM group_runs WHERE safe_name = ?", (safe_name,)).rowcount > 0
+    
+    def has_external_changes(self):
+        """自上次检查以来其他连接（进程）是否提交过写入"""
+        with self.lock:
+            version = self._get_data_version()
+            changed = version != self._data_version
+            self._data_version = version
+            return changed
+    
+    def record_artifacts(self, safe_name, execution_id, names):
+        """记录组完成时确认的结果文件"""
+        now = time.time()
+        with self.lock, self.conn:
+            self.conn.execute("DELETE FROM result_artifacts WHERE safe_name = ?", (safe_name,))
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO result_artifacts (safe_name, execution_id, path, recorded_at) VALUES (?, ?, ?, ?)",
+                [(safe_name, execution_id, name, now) for name in names])
+
+def _create_status_backend(backend_name, status_dir, read_status_file):
+    """按名称创建组状态后端，SQLite 不可用时回退到 JSON 文件"""
+    if backend_name == "sqlite":
+        try:
+            return SqliteStatusBackend(status_dir, read_status_file)
+        except Exception as e:
+            print(f"[GroupResultManager] 初始化 SQLite 状态后端失败，使用 JSON 文件: {e}")
+    elif backend_name != "json":
+        print(f"[GroupResultManager] 未知的状态后端 '{backend_name}'，使用 JSON 文件")
+    return JsonStatusBackend(status_dir, read_status_file)
+
+# GroupResultManager 组锁的分段数量（按安全组名哈希分配，不同组的写入互不阻塞）
+STATUS_LOCK_STRIPES = 16
+
+class MeteredLock:
+    """带计数的互斥锁（可用于 threading.Condition）
+    
+    记录获取次数、发生争用的次数、等待时间与持有时间；计数只在持有锁时更新，无需额外加锁。
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._owner = None
+        self._acquired_at = 0.0
+        self.acquisitions = 0
+        self.contended = 0
+        self.wait_time = 0.0
+        self.hold_time = 0.0
+        self.max_hold_time = 0.0
+    
+    def acquire(self, blocking=True, timeout=-1):
+        if self._lock.acquire(False):
+            wait_time = 0.0
+        elif not blocking:
+            return False
+        else:
+            start = time.perf_counter()
+            if not self._lock.acquire(True, timeout):
+                return False
+            wait_time = time.perf_counter() - start
+            self.contended += 1
+        self.acquisitions += 1
+        self.wait_time += wait_time
+        self._owner = threading.get_ident()
+        self._acquired_at = time.perf_counter()
+        return True
+    
+    def release(self):
+        hold_time = time.perf_counter() - self._acquired_at
+        self.hold_time += hold_time
+        if hold_time > self.max_hold_time:
+            self.max_hold_time = hold_time
+        self._owner = None
+        self._lock.release()
+    
+    def _is_owned(self):
+        # 供 threading.Condition 判断当前线程是否持有锁（避免其默认实现尝试获取锁而计入统计）
+        return self._owner == threading.get_ident()
+    
+    __enter__ = acquire
+    
+    def __exit__(self, *args):
+        self.release()
+    
+    def stats(self):
+        return {
+            "acquisitions": self.acquisitions,
+            "contended": self.contended,
+            "wait_time": self.wait_time,
+            "hold_time": self.hold_time,
+            "max_hold_time": self.max_hold_time,
+        }
+
+def _merge_lock_stats(locks):
+    """汇总多把锁的计数"""
+    merged = {"acquisitions": 0, "contended": 0, "wait_time": 0.0, "hold_time": 0.0, "max_hold_time": 0.0}
+    for lock in locks:
+        for key, value in lock.stats().items():
+            merged[key] = max(merged[key], value) if key == "max_hold_time" else merged[key] + value
+    return merged
+
 class GroupResultManager:
-    """基于文件系统的组执行结果管理器"""
+    """组执行结果管理器
     
-    def __init__(self, status_dir=None):
+    读取由内存索引提供；持久化由可替换的后端完成（STATUS_BACKEND：JSON 文件或 SQLite）。
+    
+    锁的划分：
+    - 组锁（按组名分段，STATUS_LOCK_STRIPES 把）：串行化同一组的读取-合并-写入，以及该组的文件清理；
+    - self.lock：只在发布新的索引快照时短暂持有；
+    - 读取不加锁：索引以不可变快照 (组状态, execution_id 索引) 整体替换（写时复制）。
+    """
+    
+    def __init__(self, status_dir=None, backend=None):
         self.status_dir = status_dir or STATUS_DIR
-        self.lock = threading.Lock()
+        self.lock = MeteredLock()
+        # 索引变化时通知等待者（与 self.lock 共用同一把锁）
+        self.condition = threading.Condition(self.lock)
+        self._group_locks = [MeteredLock() for _ in range(STATUS_LOCK_STRIPES)]
         os.makedirs(self.status_dir, exist_ok=True)
         # 远程结果文件存储目录
         self.remote_results_dir = os.path.join(self.status_dir, "remote_results")
         os.makedirs(self.remote_results_dir, exist_ok=True)
+        # 内存索引快照（磁盘文件为持久化存储，写入时同步更新索引）
+        # (安全组名 -> 组状态数据, execution_id -> 安全组名 frozenset)；发布后不再修改，读取方直接引用
+        self._snapshot = ({}, {})
+        # 本进程写入次数，用于避免扫描结果覆盖扫描期间的新写入
+        self._write_seq = 0
+        # 状态目录变更通知（StatusChangeFeed），未接入时等待者按间隔重新扫描
+        self._change_feed = None
+        # 持久化后端
+        self.backend = backend or _create_status_backend(STATUS_BACKEND, self.status_dir, self._read_status_file)
+        self.rescan_index()
+    
+    def _get_safe_group_name(self, group_name):
+        """生成安全的组名（与文件命名规则一致）"""
+        safe_name = "".join(c for c in group_name if c.isalnum() or c in ('_', '-', ' '))
+        return safe_name.replace(' ', '_')
+    
+    def _group_lock(self, group_name):
+        """获取组名对应的分段组锁"""
+        return self._group_locks[hash(self._get_safe_group_name(group_name)) % len(self._group_locks)]
+    
+    @staticmethod
+    def _snapshot_remove(index, execution_index, safe_name):
+        """从快照副本中移除一项（原地修改传入的副本）"""
+        old_data = index.pop(safe_name, None)
+        if old_data is None:
+            return
+        execution_id = old_data.get("execution_id")
+        names = execution_index.get(execution_id)
+        if names is not None and safe_name in names:
+            names = names - {safe_name}
+            if names:
+                execution_index[execution_id] = names
+            else:
+                del execution_index[execution_id]
+    
+    def _publish(self, index, execution_index):
+        """发布新的索引快照并唤醒等待者（调用方需持有 self.lock）"""
+        self._snapshot = (index, execution_index)
+        self.condition.notify_all()
+    
+    def _index_put(self, safe_name, status_data):
+        """写入索引（复制当前快照后修改并发布，调用方需持有 self.lock）"""
+        index, execution_index = self._snapshot
+        index, execution_index = dict(index), dict(execution_index)
+        self._snapshot_remove(index, execution_index, safe_name)
+        index[safe_name] = status_data
+        execution_id = status_data.get("execution_id")
+        if execution_id:
+            execution_index[execution_id] = execution_index.get(execution_id, frozenset()) | {safe_name}
+        self._publish(index, execution_index)
+    
+    def _index_remove(self, safe_name):
+        """从索引中移除（调用方需持有 self.lock）"""
+        index, execution_index = self._snapshot
+        if safe_name not in index:
+            return
+        index, execution_index = dict(index), dict(execution_index)
+        self._snapshot_remove(index, execution_index, safe_name)
+        self._publish(index, execution_index)
+    
+    def get_lock_stats(self):
+        """获取锁的使用统计（获取次数、争用次数、等待/持有时间，时间单位为秒）"""
+        return {
+            "index": self.lock.stats(),
+            "group": _merge_lock_stats(self._group_locks),
+            "stripes": len(self._group_locks),
+        }
+    
+    def _read_status_file(self, status_file):
+        """读取组状态文件，仅返回组状态数据（文件名与组名一致），其他文件返回 None"""
+        filename = os.path.basename(status_file)
+        if not filename.endswith('.json') or filename.startswith('exec_ui_'):
+            return None
+        status_data = _status_store.read(status_file)
+        if not isinstance(status_data, dict):
+            return None
+        group_name = status_data.get("group_name")
+        # 文本结果文件（{group_name}_{link_id}.json）同样包含 group_name，按文件名区分
+        if not group_name or self._get_safe_group_name(group_name) != filename[:-len('.json')]:
+            return None
+        return status_data
+    
+    def rescan_index(self):
+        """从后端重新加载全部组状态，重建内存索引（启动时或收到变更通知时调用）"""
+        with self.lock:
+            write_seq = self._write_seq
+        try:
+            index = self.backend.load_all()
+        except Exception as e:
+            print(f"[GroupResultManager] 扫描状态目录失败: {e}")
+            return
+        
+        with self.lock:
+            if write_seq != self._write_seq:
+                # 扫描期间本进程有新的写入，磁盘快照可能已过期，保留当前索引
+                return
+            execution_index = {}
+            for safe_name, status_data in index.items():
+                execution_id = status_data.get("execution_id")
+                if execution_id:
+                    execution_index.setdefault(execution_id, set()).add(safe_name)
+            self._publish(dict(index), {key: frozenset(names) for key, names in execution_index.items()})
+    
+    def attach_change_feed(self, change_feed):
+        """订阅状态目录变更通知，由通知驱动索引刷新"""
+        self._change_feed = change_feed
+        change_feed.subscribe(self._on_status_event)
+    
+    def _on_status_event(self, event):
+        """处理状态目录变更事件（仅 JSON 后端需要）"""
+        if not self.backend.watches_files:
+            return
+        event_type = event["type"]
+        if event_type == StatusChangeFeed.EVENT_RESCAN:
+            self.rescan_index()
+        elif event_type in (StatusChangeFeed.EVENT_GROUP_STATUS, StatusChangeFeed.EVENT_REMOVED):
+            if os.path.dirname(event["path"]) == self.status_dir:
+                self.notify_status_file_changed(event["path"])
+    
+    def notify_status_file_changed(self, status_file):
+        """状态文件被外部修改时调用，只刷新该文件对应的索引项"""
+        filename = os.path.basename(status_file)
+        if not filename.endswith('.json'):
+            return
+        safe_name = filename[:-len('.json')]
+        with self.lock:
+            write_seq = self._write_seq
+        status_data = self._read_status_file(status_file) if os.path.exists(status_file) else None
+        with self.lock:
+            if write_seq != self._write_seq:
+                # 读取期间本进程有新的写入，索引已是最新
+                return
+            if status_data is None:
+                # 文件被删除，或不是组状态文件：仅在原先是组状态文件时移除
+                if safe_name in self._snapshot[0] and not os.path.exists(status_file):
+                    self._index_remove(safe_name)
+            else:
+                self._index_put(safe_name, status_data)
+    
+    def _write_group_status(self, status_file, status_data):
+        """写入组状态（后端保证原子性）并同步更新索引（调用方需持有该组的组锁，失败时抛出异常）"""
+        safe_name = os.path.basename(status_file)[:-len('.json')]
+        self.backend.put(safe_name, status_data)
+        with self.lock:
+            self._write_seq += 1
+            self._index_put(safe_name, status_data)
+    
+    def _needs_rescan(self):
+        """等待超时未被唤醒时，是否需要重新加载（其他进程的写入可能尚未反映到索引）"""
+        if self.backend.watches_files:
+            return not (self._change_feed and self._change_feed.running)
+        return self.backend.has_external_changes()
+    
+    def _sync_external(self):
+        """后端不依赖文件通知时，读取前检查其他进程的写入并刷新索引"""
+        if not self.backend.watches_files and self.backend.has_external_changes():
+            self.rescan_index()
+    
+    def _wait_until(self, predicate, timeout=None):
+        """阻塞等待 predicate() 为真（predicate 读取索引快照，在持有 self.lock 时调用以免错过通知）
+        
+        本进程内的状态写入会通过 self.condition 立即唤醒等待者，其他进程的写入由 StatusChangeFeed
+        通知；变更通知未运行时，若 STATUS_RESCAN_INTERVAL 内没有被唤醒则重新扫描磁盘。
+        
+        Returns:
+            bool: predicate 为真返回 True，超时返回 False
+        """
+        deadline = time.time() + timeout if timeout else None
+        while True:
+            with self.condition:
+                if predicate():
+                    return True
+                wait_time = STATUS_RESCAN_INTERVAL
+                if deadline is not None:
+                    remaining = deadline - time.time()
+                    if remaining <= 0:
+                        return False
+                    wait_time = min(wait_time, remaining)
+                notified = self.condition.wait(wait_time)
+            if not notified and self._needs_rescan():
+                self.rescan_index()
+    
+    def _get_indexed_status(self, group_name):
+        """从当前索引快照获取组状态数据（无需加锁，返回内部对象，不可修改）"""
+        return self._snapshot[0].get(self._get_safe_group_name(group_name))
     
     def _get_status_file(self, execution_id):
         """获取状态文件路径"""
@@ -846,10 +1942,8 @@ class GroupResultManager:
     
     def _get_status_file_by_group(self, group_name):
         """按组名获取状态文件路径（用于非本地服务器执行）"""
-        # 使用安全的文件名（移除特殊字符）
-        safe_name = "".join(c for c in group_name if c.isalnum() or c in ('_', '-', ' '))
-        safe_name = safe_name.replace(' ', '_')  # 将空格替换为下划线
-        return os.path.join(self.status_dir, f"{safe_name}.json")
+        # 使用安全的文件名（移除特殊字符，空格替换为下划线）
+        return os.path.join(self.status_dir, f"{self._get_safe_group_name(group_name)}.json")
     
     def _clear_group_result_files(self, group_name):
         """清除该组的所有历史结果文件（包括图像和文本结果文件）
@@ -867,8 +1961,9 @@ class GroupResultManager:
             # 清除图像结果文件（在 remote_results 目录中）
             if os.path.exists(self.remote_results_dir):
                 for filename in os.listdir(self.remote_results_dir):
-                    # 匹配格式：{group_name}_{link_id}_{index}.png 或 {group_name}_{link_id}_{index}_preview.jpg
-                    if filename.startswith(f"{safe_group_name}_") and (filename.endswith('.png') or filename.endswith('_preview.jpg')):
+                    # 匹配格式：结果清单 {group_name}_{link_id}.manifest.json、上次中断遗留的异步编码标记文件，
+                    # 以及旧版平铺布局的 {group_name}_{link_id}_{index}.png/.webp/.npy、_preview.jpg
+                    if filename.startswith(f"{safe_group_name}_") and filename.endswith(REMOTE_RESULT_EXTENSIONS + ('_preview.jpg', REMOTE_PENDING_SUFFIX, REMOTE_MANIFEST_SUFFIX)):
                         file_path = os.path.join(self.remote_results_dir, filename)
                         try:
                             os.remove(file_path)
@@ -876,6 +1971,13 @@ class GroupResultManager:
                         except Exception as e:
                             print(f"[GroupResultManager] 删除图像结果文件失败: {file_path}, 错误: {e}")
             
+            # 清除分组目录 remote_results/{group_name}/ 下的结果文件
+            group_dir = _get_result_subdir(self.remote_results_dir, safe_group_name)
+            if os.path.isdir(group_dir):
+                for root, _dirs, files in os.walk(group_dir):
+                    deleted_count += len(files)
+                shutil.rmtree(group_dir, ignore_errors=True)
+            
             # 清除文本结果文件（在 status_dir 目录中，格式：{group_name}_{link_id}.json）
             if os.path.exists(self.status_dir):
                 for filename in os.listdir(self.status_dir):
@@ -896,35 +1998,19 @@ class GroupResultManager:
             traceback.print_exc()
     
     def _load_status(self, execution_id):
-        """从组名配置文件中加载状态（通过查找包含该execution_id的组名配置文件）"""
-        # 从组名配置文件中查找包含该execution_id的文件
-        if not os.path.exists(self.status_dir):
-            return None
-        
-        try:
-            for filename in os.listdir(self.status_dir):
-                if filename.endswith('.json') and not filename.endswith('.tmp'):
-                    # 跳过exec_ui开头的文件（不再使用）
-                    if filename.startswith('exec_ui_'):
-                        continue
-                    
-                    status_file = os.path.join(self.status_dir, filename)
-                    try:
-                        with open(status_file, 'r', encoding='utf-8') as f:
-                            status = json.load(f)
-                            if status.get("execution_id") == execution_id:
-                                # 找到匹配的组名配置文件，返回其groups信息
-                                return {
-                                    "execution_id": execution_id,
-                                    "groups": status.get("groups", {}),
-                                    "completed": status.get("completed", False),
-                                    "completed_at": status.get("completed_at"),
-                                    "timestamp": status.get("timestamp", 0)
-                                }
-                    except:
-                        continue
-        except Exception as e:
-            print(f"[GroupResultManager] 从组名配置文件读取状态失败: {e}")
+        """从组名配置文件中加载状态（通过索引查找包含该execution_id的组名配置文件）"""
+        self._sync_external()
+        index, execution_index = self._snapshot
+        for safe_name in execution_index.get(execution_id, ()):
+            status = index[safe_name]
+            # 找到匹配的组名配置文件，返回其groups信息
+            return {
+                "execution_id": execution_id,
+                "groups": dict(status.get("groups", {})),
+                "completed": status.get("completed", False),
+                "completed_at": status.get("completed_at"),
+                "timestamp": status.get("timestamp", 0)
+            }
         
         return None
     
@@ -932,24 +2018,10 @@ class GroupResultManager:
         """保存状态到文件"""
         status_file = self._get_status_file(execution_id)
         try:
-            # 使用临时文件确保原子性写入
-            temp_file = status_file + ".tmp"
-            with open(temp_file, 'w', encoding='utf-8') as f:
-                json.dump(status_data, f, ensure_ascii=False, indent=2)
-            # 原子性替换
-            if os.path.exists(status_file):
-                os.remove(status_file)
-            os.rename(temp_file, status_file)
+            _status_store.write(status_file, status_data)
             return True
         except Exception as e:
             print(f"[GroupResultManager] 保存状态文件失败: {e}")
-            # 清理临时文件
-            temp_file = status_file + ".tmp"
-            if os.path.exists(temp_file):
-                try:
-                    os.remove(temp_file)
-                except Exception as e:
-                    print(f"[GroupResultManager] 删除临时文件失败: {e}")
             return False
     
     def _is_local_server(self, server_id):
@@ -968,17 +2040,11 @@ class GroupResultManager:
         if self._is_local_server(server_id):
             return
         
-        with self.lock:
-            # 为每个组保存独立的 execution_id
-            for group_name in group_names:
+        # 为每个组保存独立的 execution_id（逐组持有组锁）
+        for group_name in group_names:
+            with self._group_lock(group_name):
                 group_status_file = self._get_status_file_by_group(group_name)
-                group_status_data = None
-                if os.path.exists(group_status_file):
-                    try:
-                        with open(group_status_file, 'r', encoding='utf-8') as f:
-                            group_status_data = json.load(f)
-                    except:
-                        pass
+                group_status_data = self._get_indexed_status(group_name)
                 
                 # 构建优化后的组状态数据（只包含单个组的信息）
                 merged_group_data = {
@@ -1003,12 +2069,7 @@ class GroupResultManager:
                 
                 # 保存合并后的组状态文件
                 try:
-                    temp_file = group_status_file + ".tmp"
-                    with open(temp_file, 'w', encoding='utf-8') as f:
-                        json.dump(merged_group_data, f, ensure_ascii=False, indent=2)
-                    if os.path.exists(group_status_file):
-                        os.remove(group_status_file)
-                    os.rename(temp_file, group_status_file)
+                    self._write_group_status(group_status_file, merged_group_data)
                 except Exception as e:
                     print(f"[GroupResultManager] 保存合并后的组状态文件失败 ({group_name}): {e}")
     
@@ -1025,16 +2086,10 @@ class GroupResultManager:
         if self._is_local_server(server_id):
             return True
         
-        with self.lock:
+        with self._group_lock(group_name):
             # 直接更新当前组的配置文件（优化后的结构，只包含单个组的信息）
             group_status_file = self._get_status_file_by_group(group_name)
-            group_status_data = None
-            if os.path.exists(group_status_file):
-                try:
-                    with open(group_status_file, 'r', encoding='utf-8') as f:
-                        group_status_data = json.load(f)
-                except:
-                    pass
+            group_status_data = self._get_indexed_status(group_name)
             
             # 构建优化后的组状态数据（只包含单个组的信息，去掉groups字段）
             merged_group_data = {
@@ -1054,29 +2109,61 @@ class GroupResultManager:
                 if "created_at" in group_status_data:
                     merged_group_data["created_at"] = group_status_data["created_at"]
             
-            # 如果result_data中有prompt_id，使用它；否则保留现有的
-            if result_data.get("prompt_id"):
-                merged_group_data["prompt_id"] = result_data["prompt_id"]
-            elif group_status_data and group_status_data.get("prompt_id"):
-                merged_group_data["prompt_id"] = group_status_data["prompt_id"]
+            # 如果result_data中有prompt_id，使用它；否则保留现有的
+            if result_data.get("prompt_id"):
+                merged_group_data["prompt_id"] = result_data["prompt_id"]
+            elif group_status_data and group_status_data.get("prompt_id"):
+                merged_group_data["prompt_id"] = group_status_data["prompt_id"]
+            
+            # 保存合并后的组状态文件
+            try:
+                self._write_group_status(group_status_file, merged_group_data)
+                print(f"[GroupResultManager] 已更新组状态文件: {group_status_file}")
+            except Exception as e:
+                print(f"[GroupResultManager] 保存合并后的组状态文件失败 ({group_name}): {e}")
+            
+            print(f"[GroupResultManager] 组 '{group_name}' 完成: {execution_id}")
+            return True
+    
+    def set_group_failed(self, execution_id, group_name, error_data, server_id=None):
+        """标记某个组执行失败（completed 保持 False，只对非本地服务器保存到组名配置文件）
+        
+        Args:
+            execution_id: 执行ID
+            group_name: 组名
+            error_data: 失败信息（如 error、missing_repeats），合并到状态数据中
+            server_id: 服务器ID，如果为None或"local"（本地服务器）则不保存配置文件
+        """
+        if self._is_local_server(server_id):
+            return True
+        
+        with self._group_lock(group_name):
+            group_status_file = self._get_status_file_by_group(group_name)
+            group_status_data = self._get_indexed_status(group_name)
+            
+            status_data = dict(group_status_data) if group_status_data else {"group_name": group_name, "created_at": time.time()}
+            status_data.pop("groups", None)
+            status_data.update(error_data)
+            status_data.update({
+                "group_name": group_name,
+                "execution_id": execution_id,
+                "completed": False,
+                "completed_at": None,
+                "failed": True,
+                "failed_at": time.time(),
+            })
             
-            # 保存合并后的组状态文件
             try:
-                temp_file = group_status_file + ".tmp"
-                with open(temp_file, 'w', encoding='utf-8') as f:
-                    json.dump(merged_group_data, f, ensure_ascii=False, indent=2)
-                if os.path.exists(group_status_file):
-                    os.remove(group_status_file)
-                os.rename(temp_file, group_status_file)
-                print(f"[GroupResultManager] 已更新组状态文件: {group_status_file}")
+                self._write_group_status(group_status_file, status_data)
             except Exception as e:
-                print(f"[GroupResultManager] 保存合并后的组状态文件失败 ({group_name}): {e}")
+                print(f"[GroupResultManager] 保存组状态文件失败 ({group_name}): {e}")
+                return False
             
-            print(f"[GroupResultManager] 组 '{group_name}' 完成: {execution_id}")
+            print(f"[GroupResultManager] 组 '{group_name}' 失败: {execution_id}")
             return True
     
     def get_group_result(self, execution_id=None, group_name=None):
-        """获取某个组的执行结果（从组名配置文件直接读取）
+        """获取某个组的执行结果（从内存索引读取）
         
         Args:
             execution_id: 执行ID（可选，如果提供则验证是否匹配）
@@ -1085,178 +2172,131 @@ class GroupResultManager:
         if not group_name:
             return None
             
-        with self.lock:
-            # 直接从组名配置文件读取
-            status_file = self._get_status_file_by_group(group_name)
-            if not os.path.exists(status_file):
-                return None
-            
-            try:
-                with open(status_file, 'r', encoding='utf-8') as f:
-                    status_data = json.load(f)
-                
-                # 如果提供了 execution_id，检查是否匹配
-                if execution_id and status_data.get("execution_id") != execution_id:
-                    return None
-                
-                # 检查是否已完成
-                if status_data.get("completed", False):
-                    # 返回结果数据（包含 completed, completed_at, prompt_id, execution_id 等信息）
-                    return {
-                        "completed": status_data.get("completed", False),
-                        "completed_at": status_data.get("completed_at"),
-                        "prompt_id": status_data.get("prompt_id"),
-                        "execution_id": status_data.get("execution_id")  # 返回该组的 execution_id
-                    }
-            except:
-                pass
-            
+        self._sync_external()
+        status_data = self._get_indexed_status(group_name)
+        if status_data is None:
             return None
+        
+        # 如果提供了 execution_id，检查是否匹配
+        if execution_id and status_data.get("execution_id") != execution_id:
+            return None
+        
+        # 检查是否已完成
+        if status_data.get("completed", False):
+            # 返回结果数据（包含 completed, completed_at, prompt_id, execution_id 等信息）
+            return {
+                "completed": status_data.get("completed", False),
+                "completed_at": status_data.get("completed_at"),
+                "prompt_id": status_data.get("prompt_id"),
+                "execution_id": status_data.get("execution_id")  # 返回该组的 execution_id
+            }
+        
+        return None
     
     def get_group_execution_id(self, group_name):
-        """获取某个组的 execution_id（从组名配置文件读取）"""
-        with self.lock:
-            status_file = self._get_status_file_by_group(group_name)
-            if not os.path.exists(status_file):
-                return None
-            
-            try:
-                with open(status_file, 'r', encoding='utf-8') as f:
-                    status_data = json.load(f)
-                return status_data.get("execution_id")
-            except:
-                pass
-            
+        """获取某个组的 execution_id（从内存索引读取）"""
+        self._sync_external()
+        status_data = self._get_indexed_status(group_name)
+        if status_data is None:
             return None
+        return status_data.get("execution_id")
     
     def get_all_results(self, execution_id):
-        """获取所有组的执行结果（遍历所有包含相同execution_id的组名配置文件）"""
-        with self.lock:
-            if not os.path.exists(self.status_dir):
-                return None
-            
-            results = {}
-            try:
-                # 遍历所有组名配置文件
-                for filename in os.listdir(self.status_dir):
-                    if filename.endswith('.json') and not filename.endswith('.tmp'):
-                        # 跳过exec_ui开头的文件（不再使用）
-                        if filename.startswith('exec_ui_'):
-                            continue
-                        
-                        status_file = os.path.join(self.status_dir, filename)
-                        try:
-                            with open(status_file, 'r', encoding='utf-8') as f:
-                                status_data = json.load(f)
-                            
-                            # 检查 execution_id 是否匹配，且已完成
-                            if status_data.get("execution_id") == execution_id and status_data.get("completed", False):
-                                group_name = status_data.get("group_name")
-                                if group_name:
-                                    # 返回结果数据
-                                    results[group_name] = {
-                                        "completed": status_data.get("completed", False),
-                                        "completed_at": status_data.get("completed_at"),
-                                        "prompt_id": status_data.get("prompt_id")
-                                    }
-                        except:
-                            continue
-            except Exception as e:
-                print(f"[GroupResultManager] 获取所有结果失败: {e}")
-            
-            return results if results else None
+        """获取所有组的执行结果（通过索引查找包含相同execution_id的组）"""
+        self._sync_external()
+        results = {}
+        index, execution_index = self._snapshot
+        for safe_name in execution_index.get(execution_id, ()):
+            status_data = index[safe_name]
+            # 检查是否已完成
+            if status_data.get("completed", False):
+                group_name = status_data.get("group_name")
+                if group_name:
+                    # 返回结果数据
+                    results[group_name] = {
+                        "completed": status_data.get("completed", False),
+                        "completed_at": status_data.get("completed_at"),
+                        "prompt_id": status_data.get("prompt_id")
+                    }
+        
+        return results if results else None
     
     def is_completed(self, execution_id):
         """检查执行是否完成（检查所有包含相同execution_id的组是否都完成）"""
-        with self.lock:
-            if not os.path.exists(self.status_dir):
-                return False
-            
-            # 查找所有包含相同execution_id的组名配置文件
-            group_files = []
-            try:
-                for filename in os.listdir(self.status_dir):
-                    if filename.endswith('.json') and not filename.endswith('.tmp'):
-                        if filename.startswith('exec_ui_'):
-                            continue
-                        
-                        status_file = os.path.join(self.status_dir, filename)
-                        try:
-                            with open(status_file, 'r', encoding='utf-8') as f:
-                                status_data = json.load(f)
-                            if status_data.get("execution_id") == execution_id:
-                                group_files.append(status_data)
-                        except:
-                            continue
-            except:
-                return False
-            
-            if not group_files:
-                return False
-            
-            # 检查是否所有组都已完成
-            return all(group_data.get("completed", False) for group_data in group_files)
+        self._sync_external()
+        return self._is_completed_in_snapshot(execution_id)
     
-    def wait_for_completion(self, execution_id, timeout=None):
-        """等待执行完成（通过轮询文件）"""
-        start_time = time.time()
-        check_interval = 0.5  # 每0.5秒检查一次
+    def _is_completed_in_snapshot(self, execution_id):
+        """按当前索引快照检查执行是否完成"""
+        index, execution_index = self._snapshot
+        safe_names = execution_index.get(execution_id)
+        if not safe_names:
+            return False
         
-        while True:
-            if self.is_completed(execution_id):
-                return True
-            
-            if timeout and (time.time() - start_time) > timeout:
-                return False
-            
-            time.sleep(check_interval)
+        # 检查是否所有组都已完成
+        return all(index[safe_name].get("completed", False) for safe_name in safe_names)
     
-    def clear_execution(self, execution_id):
-        """清除执行结果（删除状态文件）"""
-        with self.lock:
-            status_file = self._get_status_file(execution_id)
-            if os.path.exists(status_file):
-                try:
-                    os.remove(status_file)
-                    return True
-                except Exception as e:
-                    print(f"[GroupResultManager] 删除状态文件失败: {e}")
+    def wait_for_completion(self, execution_id, timeout=None):
+        """等待执行完成（状态更新时立即唤醒）"""
+        return self._wait_until(lambda: self._is_completed_in_snapshot(execution_id), timeout)
+    
+    def wait_for_groups_completed(self, group_names, timeout=None):
+        """等待所有组完成（状态更新时立即唤醒）
+        
+        Args:
+            group_names: 组名列表
+            timeout: 超时时间（秒），None 或 0 表示不限时
+        
+        Returns:
+            bool: 所有组都完成返回 True，超时或有组被标记为失败时返回 False
+        """
+        def all_completed():
+            for group_name in group_names:
+                status = self._get_indexed_status(group_name)
+                if status is None or not status.get("completed", False):
                     return False
+            return True
+        
+        def any_failed():
+            for group_name in group_names:
+                status = self._get_indexed_status(group_name)
+                if status is not None and status.get("failed", False):
+                    return True
             return False
+        
+        self._wait_until(lambda: all_completed() or any_failed(), timeout)
+        return all_completed()
     
-    def get_latest_execution_id(self):
-        """获取最新的execution_id（按时间戳排序，从组名配置文件中查找）"""
-        with self.lock:
-            if not os.path.exists(self.status_dir):
-                return None
-            
-            latest_id = None
-            latest_time = 0
-            
+    def clear_execution(self, execution_id):
+        """清除执行结果（删除状态记录）"""
+        safe_name = os.path.basename(self._get_status_file(execution_id))[:-len('.json')]
+        with self._group_lock(safe_name):
             try:
-                for filename in os.listdir(self.status_dir):
-                    if filename.endswith('.json') and not filename.endswith('.tmp'):
-                        # 跳过exec_ui开头的文件（不再使用）
-                        if filename.startswith('exec_ui_'):
-                            continue
-                        
-                        # 从组名配置文件中查找
-                        status_file = os.path.join(self.status_dir, filename)
-                        try:
-                            with open(status_file, 'r', encoding='utf-8') as f:
-                                status = json.load(f)
-                                if "execution_id" in status:
-                                    # 使用 created_at 字段，如果没有则使用 timestamp（向后兼容）
-                                    created_at = status.get("created_at", status.get("timestamp", 0))
-                                    if created_at > latest_time:
-                                        latest_time = created_at
-                                        latest_id = status.get("execution_id")
-                        except:
-                            continue
+                if not self.backend.delete(safe_name):
+                    return False
+                with self.lock:
+                    self._write_seq += 1
+                    self._index_remove(safe_name)
+                return True
             except Exception as e:
-                print(f"[GroupResultManager] 获取最新执行ID失败: {e}")
-            
-            return latest_id
+                print(f"[GroupResultManager] 删除状态文件失败: {e}")
+                return False
+    
+    def get_latest_execution_id(self):
+        """获取最新的execution_id（按时间戳排序，从内存索引中查找）"""
+        self._sync_external()
+        latest_id = None
+        latest_time = 0
+        
+        for status in self._snapshot[0].values():
+            if "execution_id" in status:
+                # 使用 created_at 字段，如果没有则使用 timestamp（向后兼容）
+                created_at = status.get("created_at", status.get("timestamp", 0))
+                if created_at > latest_time:
+                    latest_time = created_at
+                    latest_id = status.get("execution_id")
+        
+        return latest_id
     
     def save_status_by_group(self, group_name, server_id, prompt_id=None, started_at=None, execution_id=None, groups=None):
         """按组名保存状态文件（覆盖式保存，用于非本地服务器执行）
@@ -1273,17 +2313,11 @@ class GroupResultManager:
         if self._is_local_server(server_id):
             return False
         
-        with self.lock:
+        with self._group_lock(group_name):
             status_file = self._get_status_file_by_group(group_name)
             
-            # 尝试加载现有状态，以便合并数据
-            existing_data = None
-            if os.path.exists(status_file):
-                try:
-                    with open(status_file, 'r', encoding='utf-8') as f:
-                        existing_data = json.load(f)
-                except:
-                    pass
+            # 从索引加载现有状态，以便合并数据
+            existing_data = self._get_indexed_status(group_name)
             
             # 构建状态数据，合并现有数据（优化后的结构，只包含单个组的信息）
             # 如果提供了 prompt_id，表示新任务开始，completed 应该为 False
@@ -1319,30 +2353,35 @@ class GroupResultManager:
                 status_data["execution_id"] = existing_data["execution_id"]
             
             try:
-                # 使用临时文件确保原子性写入
-                temp_file = status_file + ".tmp"
-                with open(temp_file, 'w', encoding='utf-8') as f:
-                    json.dump(status_data, f, ensure_ascii=False, indent=2)
-                # 原子性替换（覆盖式保存）
-                if os.path.exists(status_file):
-                    os.remove(status_file)
-                os.rename(temp_file, status_file)
+                # 使用临时文件确保原子性写入（覆盖式保存）
+                self._write_group_status(status_file, status_data)
                 print(f"[GroupResultManager] 保存组状态文件: {status_file}")
                 return True
             except Exception as e:
                 print(f"[GroupResultManager] 保存组状态文件失败: {e}")
-                # 清理临时文件
-                temp_file = status_file + ".tmp"
-                if os.path.exists(temp_file):
-                    try:
-                        os.remove(temp_file)
-                    except Exception as e:
-                        print(f"[GroupResultManager] 删除临时文件失败: {e}")
                 return False
     
+    def _wait_for_pending_results(self, group_name, timeout=REMOTE_PENDING_TIMEOUT):
+        """等待该组的异步编码写完（由结果索引按 .pending 标记的增删唤醒，不轮询目录）
+        
+        Returns:
+            bool: 已写完返回 True，超时返回 False
+        """
+        try:
+            from .trans import _remote_result_index
+        except Exception:
+            # 发送节点不可用时本进程不会产生异步编码
+            return True
+        if _remote_result_index.wait_flushed(group_name, timeout=timeout):
+            return True
+        print(f"[GroupResultManager] 等待组 '{group_name}' 的结果文件写入超时")
+        return False
+    
     def update_status_by_group_completed(self, group_name, prompt_id=None, server_id=None):
         """更新按组名的状态文件，标记为已完成（只对非本地服务器）
         
+        结果文件仍在异步编码时，先等待其写完再标记完成。
+        
         Args:
             group_name: 组名
             prompt_id: prompt ID（可选）
@@ -1352,16 +2391,18 @@ class GroupResultManager:
         if self._is_local_server(server_id):
             return False
         
-        with self.lock:
+        self._wait_for_pending_results(group_name)
+        
+        with self._group_lock(group_name):
             status_file = self._get_status_file_by_group(group_name)
-            if not os.path.exists(status_file):
+            existing_data = self._get_indexed_status(group_name)
+            if existing_data is None:
                 print(f"[GroupResultManager] 状态文件不存在: {status_file}")
                 return False
             
             try:
-                # 读取现有状态
-                with open(status_file, 'r', encoding='utf-8') as f:
-                    status_data = json.load(f)
+                # 复制现有状态（索引中的对象不可原地修改）
+                status_data = dict(existing_data)
                 
                 # 获取 execution_id
                 execution_id = status_data.get("execution_id")
@@ -1377,13 +2418,7 @@ class GroupResultManager:
                     del status_data["groups"]
                 
                 # 保存状态
-                temp_file = status_file + ".tmp"
-                with open(temp_file, 'w', encoding='utf-8') as f:
-                    json.dump(status_data, f, ensure_ascii=False, indent=2)
-                # 原子性替换
-                if os.path.exists(status_file):
-                    os.remove(status_file)
-                os.rename(temp_file, status_file)
+                self._write_group_status(status_file, status_data)
                 print(f"[GroupResultManager] 更新组状态文件（已完成）: {status_file}")
                 
                 # 在组任务完成时，根据 execution_id 和组名，确保图片和蒙版已保存到文件中
@@ -1395,13 +2430,6 @@ class GroupResultManager:
                 print(f"[GroupResultManager] 更新组状态文件失败: {e}")
                 import traceback
                 traceback.print_exc()
-                # 清理临时文件
-                temp_file = status_file + ".tmp"
-                if os.path.exists(temp_file):
-                    try:
-                        os.remove(temp_file)
-                    except:
-                        pass
                 return False
     
     def _ensure_images_saved_for_group(self, group_name, execution_id):
@@ -1419,28 +2447,31 @@ class GroupResultManager:
             # 生成安全的 execution_id（用于文件名）
             safe_execution_id = "".join(c for c in execution_id if c.isalnum() or c in ('_', '-'))
             
-            # 检查 remote_results 目录中是否存在该组的图片文件
-            if not os.path.exists(self.remote_results_dir):
-                print(f"[GroupResultManager] 远程结果目录不存在: {self.remote_results_dir}")
+            # 按清单检查该组各个 link 的结果文件（分组目录 remote_results/{group_name}/{link_id}/）
+            group_dir = _get_result_subdir(self.remote_results_dir, safe_group_name)
+            if not os.path.isdir(group_dir):
+                print(f"[GroupResultManager] 组 '{group_name}' (execution_id={execution_id}) 完成，但未找到结果目录: {group_dir}")
                 return
             
-            # 查找所有匹配的图片文件（格式：{group_name}_{link_id}_{index}.png）
             image_files = []
-            for filename in os.listdir(self.remote_results_dir):
-                # 匹配格式：{group_name}_{link_id}_{index}.png
-                if filename.startswith(f"{safe_group_name}_") and filename.endswith('.png') and not filename.endswith('_preview.jpg'):
-                    image_files.append(filename)
-            
-            if image_files:
-                print(f"[GroupResultManager] 组 '{group_name}' (execution_id={execution_id}) 完成，已找到 {len(image_files)} 个图片文件")
-                # 图片文件已经在执行过程中由 LG_RemoteImageSenderPlus 保存
-                # 这里只需要确认文件存在即可
-                for filename in image_files:
-                    file_path = os.path.join(self.remote_results_dir, filename)
-                    if os.path.exists(file_path):
-                        print(f"[GroupResultManager] 确认图片文件已保存: {filename}")
+            missing_files = []
+            for link_id in os.listdir(group_dir):
+                manifest = _read_result_manifest(_get_result_manifest_path(self.remote_results_dir, safe_group_name, link_id))
+                if manifest is None:
+                    continue
+                for name in _get_manifest_files(manifest):
+                    file_path = _resolve_result_path(self.remote_results_dir, name)
+                    if file_path and os.path.exists(file_path):
+                        image_files.append(name)
                     else:
-                        print(f"[GroupResultManager] 警告: 图片文件不存在: {filename}")
+                        missing_files.append(name)
+            
+            if image_files or missing_files:
+                # 图片文件已经在执行过程中由 LG_RemoteImageSenderPlus 保存，这里只确认清单中的文件存在
+                print(f"[GroupResultManager] 组 '{group_name}' (execution_id={execution_id}) 完成，已确认 {len(image_files)} 个图片文件")
+                for name in missing_files:
+                    print(f"[GroupResultManager] 警告: 图片文件不存在: {name}")
+                self.backend.record_artifacts(safe_group_name, execution_id, image_files)
             else:
                 print(f"[GroupResultManager] 组 '{group_name}' (execution_id={execution_id}) 完成，但未找到图片文件")
         except Exception as e:
@@ -1457,17 +2488,10 @@ class GroupResultManager:
         Returns:
             dict: 状态数据，如果不存在返回 None
         """
-        with self.lock:
-            status_file = self._get_status_file_by_group(group_name)
-            if not os.path.exists(status_file):
-                return None
-            
-            try:
-                with open(status_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-            except Exception as e:
-                print(f"[GroupResultManager] 读取组状态文件失败: {e}")
-                return None
+        self._sync_external()
+        status_data = self._get_indexed_status(group_name)
+        # 返回副本，避免调用方修改索引
+        return dict(status_data) if status_data is not None else None
     
     def is_group_completed(self, group_name):
         """检查组任务是否完成（按组名读取状态文件）
@@ -1478,14 +2502,249 @@ class GroupResultManager:
         Returns:
             bool: 如果完成返回 True，如果未完成或状态文件不存在返回 False
         """
-        status = self.load_status_by_group(group_name)
+        self._sync_external()
+        status = self._get_indexed_status(group_name)
         if status is None:
             return False
         return status.get("completed", False)
 
+# ============ 执行状态目录变更通知 ============
+
+# inotify 常量（见 linux/inotify.h）
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_DELETE = 0x00000200
+_IN_Q_OVERFLOW = 0x00004000
+_IN_CLOEXEC = 0o2000000
+
+# 不支持 inotify 时的 mtime 轮询间隔（秒）
+STATUS_FEED_POLL_INTERVAL = 1.0
+# 保留的最近事件数量（供长轮询接口按序号补取）
+STATUS_FEED_HISTORY = 512
+
+class StatusChangeFeed:
+    """执行状态目录的变更通知
+    
+    监听 execution_status/ 和 execution_status/remote_results/，把文件变化转换为带类型的事件
+    发布给订阅者。Linux 上使用 inotify，其他平台（或 inotify 不可用时）回退为按 mtime 轮询，
+    因此共享同一状态目录的多个 ComfyUI 进程也能相互感知，无需反复全量扫描目录。
+    
+    事件为 dict：{"seq", "type", "filename", "path", "group_name", "link_id", "time"}
+    """
+    
+    EVENT_GROUP_STATUS = "group_status"        # 组状态文件 {group}.json 写入
+    EVENT_GROUP_COMPLETED = "group_completed"  # 组状态文件写入且已完成
+    EVENT_RESULT_TEXT = "result_text"          # 文本结果文件 {group}_{link}.json 写入
+    EVENT_RESULT_IMAGE = "result_image"        # 图像结果文件 remote_results/*.png|webp|npy|manifest.json 写入
+    EVENT_RESULT_PENDING = "result_pending"    # 异步编码标记 remote_results/*.pending 创建
+    EVENT_REMOVED = "removed"                  # 文件被删除
+    EVENT_RESCAN = "rescan"                    # 事件丢失（队列溢出），订阅者需重新扫描
+    
+    def __init__(self, status_dir, results_dir):
+        self.status_dir = status_dir
+        self.results_dir = results_dir
+        self._subscribers = []
+        self._history = deque(maxlen=STATUS_FEED_HISTORY)
+        self._seq = 0
+        self._condition = threading.Condition()
+        self._thread = None
+        self.mode = None  # "inotify" / "poll"
+    
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+    
+    def start(self):
+        """启动监听线程（重复调用无副作用）"""
+        with self._condition:
+            if self.running:
+                return
+            inotify = self._init_inotify()
+            if inotify is not None:
+                self.mode = "inotify"
+                target, args = self._run_inotify, inotify
+            else:
+                self.mode = "poll"
+                target, args = self._run_poll, ()
+            self._thread = threading.Thread(target=target, args=args, daemon=True, name="StatusChangeFeed")
+            self._thread.start()
+        print(f"[StatusChangeFeed] 开始监听状态目录 ({self.mode}): {self.status_dir}")
+    
+    def subscribe(self, callback):
+        """订阅事件，callback(event) 在监听线程中调用；返回取消订阅函数"""
+        with self._condition:
+            self._subscribers.append(callback)
+        
+        def unsubscribe():
+            with self._condition:
+                if callback in self._subscribers:
+                    self._subscribers.remove(callback)
+        return unsubscribe
+    
+    def get_seq(self):
+        with self._condition:
+            return self._seq
+    
+    def wait_events(self, since, timeout=None):
+        """获取序号大于 since 的事件，没有时阻塞等待（用于长轮询）
+        
+        Returns:
+            tuple: (事件列表, 最新序号)；since 早于保留的历史时返回一个 rescan 事件
+        """
+        deadline = time.time() + timeout if timeout else None
+        with self._condition:
+            while self._seq <= since:
+                remaining = None if deadline is None else deadline - time.time()
+                if remaining is not None and remaining <= 0:
+                    return [], self._seq
+                self._condition.wait(remaining)
+            if self._history and self._history[0]["seq"] > since + 1:
+                return [{"seq": self._seq, "type": self.EVENT_RESCAN, "time": time.time()}], self._seq
+            return [event for event in self._history if event["seq"] > since], self._seq
+    
+    def _classify(self, directory, filename, removed):
+        """根据文件位置和内容生成事件列表"""
+        if filename.endswith('.tmp'):
+            return []
+        path = os.path.join(directory, filename)
+        base = {"filename": filename, "path": path, "group_name": None, "link_id": None}
+        if removed:
+            return [dict(base, type=self.EVENT_REMOVED)]
+        
+        if directory == self.results_dir:
+            if filename.endswith(REMOTE_RESULT_EXTENSIONS + (REMOTE_MANIFEST_SUFFIX,)):
+                return [dict(base, type=self.EVENT_RESULT_IMAGE)]
+            if filename.endswith(REMOTE_PENDING_SUFFIX):
+                return [dict(base, type=self.EVENT_RESULT_PENDING)]
+            return []
+        
+        if not filename.endswith('.json'):
+            return []
+        data = _status_store.read(path)
+        if data is None:
+            # 文件已被删除或内容无效，稍后的事件会再次触发
+            return []
+        if not isinstance(data, dict):
+            return []
+        base["group_name"] = data.get("group_name")
+        if "link_id" in data:
+            base["link_id"] = data.get("link_id")
+            return [dict(base, type=self.EVENT_RESULT_TEXT)]
+        events = [dict(base, type=self.EVENT_GROUP_STATUS)]
+        if data.get("completed", False):
+            events.append(dict(base, type=self.EVENT_GROUP_COMPLETED))
+        return events
+    
+    def _publish(self, events):
+        if not events:
+            return
+        with self._condition:
+            for event in events:
+                self._seq += 1
+                event["seq"] = self._seq
+                event["time"] = time.time()
+                self._history.append(event)
+            subscribers = list(self._subscribers)
+            self._condition.notify_all()
+        for event in events:
+            for callback in subscribers:
+                try:
+                    callback(event)
+                except Exception as e:
+                    print(f"[StatusChangeFeed] 事件处理失败 ({event['type']}): {e}")
+    
+    def _init_inotify(self):
+        """初始化 inotify，不可用时返回 None"""
+        if not sys.platform.startswith('linux'):
+            return None
+        try:
+            import ctypes
+            import ctypes.util
+            libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+            fd = libc.inotify_init1(_IN_CLOEXEC)
+            if fd < 0:
+                return None
+            mask = _IN_CLOSE_WRITE | _IN_MOVED_TO | _IN_MOVED_FROM | _IN_DELETE
+            watches = {}
+            for directory in (self.status_dir, self.results_dir):
+                wd = libc.inotify_add_watch(fd, os.fsencode(directory), mask)
+                if wd < 0:
+                    os.close(fd)
+                    return None
+                watches[wd] = directory
+            return (fd, watches)
+        except Exception as e:
+            print(f"[StatusChangeFeed] inotify 不可用，使用轮询: {e}")
+            return None
+    
+    def _run_inotify(self, fd, watches):
+        header = struct.Struct('iIII')
+        while True:
+            try:
+                data = os.read(fd, 64 * 1024)
+            except InterruptedError:
+                continue
+            except Exception as e:
+                print(f"[StatusChangeFeed] 读取 inotify 事件失败: {e}")
+                return
+            events = []
+            offset = 0
+            while offset + header.size <= len(data):
+                wd, mask, _cookie, name_len = header.unpack_from(data, offset)
+                offset += header.size
+                name = data[offset:offset + name_len].split(b'\0', 1)[0]
+                offset += name_len
+                if mask & _IN_Q_OVERFLOW:
+                    events.append({"type": self.EVENT_RESCAN, "filename": None, "path": None,
+                                   "group_name": None, "link_id": None})
+                    continue
+                directory = watches.get(wd)
+                if directory is None or not name:
+                    continue
+                removed = bool(mask & (_IN_DELETE | _IN_MOVED_FROM))
+                events.extend(self._classify(directory, os.fsdecode(name), removed))
+            self._publish(events)
+    
+    def _snapshot(self):
+        snapshot = {}
+        for directory in (self.status_dir, self.results_dir):
+            try:
+                with os.scandir(directory) as it:
+                    for entry in it:
+                        if entry.is_file():
+                            stat = entry.stat()
+                            snapshot[(directory, entry.name)] = (stat.st_mtime_ns, stat.st_size)
+            except FileNotFoundError:
+                continue
+        return snapshot
+    
+    def _run_poll(self):
+        previous = self._snapshot()
+        while True:
+            time.sleep(STATUS_FEED_POLL_INTERVAL)
+            try:
+                current = self._snapshot()
+            except Exception as e:
+                print(f"[StatusChangeFeed] 扫描状态目录失败: {e}")
+                continue
+            events = []
+            for key, signature in current.items():
+                if previous.get(key) != signature:
+                    events.extend(self._classify(key[0], key[1], False))
+            for key in previous.keys() - current.keys():
+                events.extend(self._classify(key[0], key[1], True))
+            previous = current
+            self._publish(events)
+
 # 全局结果管理器实例
 _group_result_manager = GroupResultManager()
 
+# 全局状态变更通知（结果管理器订阅以刷新索引）
+_status_change_feed = StatusChangeFeed(_group_result_manager.status_dir, _group_result_manager.remote_results_dir)
+_group_result_manager.attach_change_feed(_status_change_feed)
+_status_change_feed.start()
+
 # ============ 节点定义 ============
 
 class GroupExecutorSingle:
@@ -1544,7 +2803,11 @@ class GroupExecutorSender:
         return {
             "required": {
                 "signal": ("SIGNAL",),
-                "execution_mode": (["前端执行", "后台执行"], {"default": "后台执行"}),
+                "execution_mode": (["前端执行", "后台执行", "后台并行执行"], {"default": "后台执行"}),
+            },
+            "optional": {
+                "max_per_server": ("INT", {"default": DEFAULT_MAX_PER_SERVER, "min": 1, "max": 16, "step": 1, "tooltip": "后台并行执行时每个服务器同时运行的最大组数"}),
+                "lookahead": ("INT", {"default": DEFAULT_LOOKAHEAD, "min": 0, "max": 16, "step": 1, "tooltip": "后台顺序执行时提前提交的 prompt 数，当前组执行期间同一服务器上的后续组已在队列中等待，0 表示不提前提交"}),
             },
             "hidden": {
                 "unique_id": "UNIQUE_ID",
@@ -1558,19 +2821,22 @@ class GroupExecutorSender:
     CATEGORY = CATEGORY_TYPE
     OUTPUT_NODE = True
 
-    def execute(self, signal, execution_mode, unique_id=None, prompt=None, extra_pnginfo=None):
+    def execute(self, signal, execution_mode, max_per_server=DEFAULT_MAX_PER_SERVER, lookahead=DEFAULT_LOOKAHEAD, unique_id=None, prompt=None, extra_pnginfo=None):
         try:
             if not signal:
                 raise ValueError("没有收到执行信号")
 
             execution_list = signal if isinstance(signal, list) else [signal]
 
-            if execution_mode == "后台执行":
+            if execution_mode in ("后台执行", "后台并行执行"):
                 # 后台执行模式：通知前端生成 API prompt 并发送给后端
                 PromptServer.instance.send_sync(
                     "execute_group_list_backend", {
                         "node_id": unique_id,
-                        "execution_list": execution_list
+                        "execution_list": execution_list,
+                        "parallel": execution_mode == "后台并行执行",
+                        "max_per_server": max_per_server,
+                        "lookahead": lookahead
                     }
                 )
                 
@@ -1612,13 +2878,20 @@ class GroupExecutorRepeater:
                     "step": 0.1
                 }),
             },
+            "optional": {
+                "fan_out": ("BOOLEAN", {
+                    "default": False,
+                    "tooltip": "分发模式：各次重复作为独立任务分发到服务器池（server_id 为 auto 或指定 server_pool）并行执行，"
+                               "第 n 次的结果保存在组名 {组名}__r{n} 下；该模式下忽略 group_delay"
+                }),
+            },
         }
     
     RETURN_TYPES = ("SIGNAL",)
     FUNCTION = "repeat"
     CATEGORY = CATEGORY_TYPE
 
-    def repeat(self, signal, repeat_count, group_delay):
+    def repeat(self, signal, repeat_count, group_delay, fan_out=False):
         try:
             if not signal:
                 raise ValueError("没有收到执行信号")
@@ -1631,6 +2904,14 @@ class GroupExecutorRepeater:
                 # 不重复，直接返回原始列表
                 return (execution_list,)
             
+            # 分发模式：不展开列表，由后台执行时把每个执行项的重复分发到服务器池
+            if fan_out:
+                return ([
+                    exec_item if _is_marker_item(exec_item)
+                    else dict(exec_item, fan_out=int(exec_item.get("fan_out") or 1) * repeat_count)
+                    for exec_item in execution_list
+                ],)
+            
             # repeat_count > 1，进入循环重复
             repeated_list = []
             for i in range(repeat_count):
@@ -1639,7 +2920,7 @@ class GroupExecutorRepeater:
                 # 在重复之间添加延迟（最后一次不需要延迟）
                 if i < repeat_count - 1:
                     repeated_list.append({
-                        "group_name": "__delay__",
+                        "group_name": DELAY_MARKER,
                         "repeat_count": 1,
                         "delay_seconds": group_delay
                     })
@@ -1650,6 +2931,33 @@ class GroupExecutorRepeater:
             print(f"重复处理错误: {str(e)}")
             return ([],)
 
+class GroupExecutorBarrier:
+    """并行调度屏障节点：后台并行执行时，屏障之后的组要等待之前所有组完成才开始"""
+    
+    @classmethod
+    def INPUT_TYPES(s):
+        return {
+            "required": {
+                "signal": ("SIGNAL",),
+            },
+        }
+    
+    RETURN_TYPES = ("SIGNAL",)
+    FUNCTION = "add_barrier"
+    CATEGORY = CATEGORY_TYPE
+
+    def add_barrier(self, signal):
+        try:
+            if not signal:
+                raise ValueError("没有收到执行信号")
+
+            execution_list = signal if isinstance(signal, list) else [signal]
+            return (execution_list + [{"group_name": BARRIER_MARKER, "repeat_count": 1, "delay_seconds": 0}],)
+
+        except Exception as e:
+            print(f"[GroupExecutorBarrier] 错误: {str(e)}")
+            return ([],)
+
 class GroupExecutorWaitAll:
     """等待所有组异步运行结果的节点"""
     
@@ -1744,35 +3052,15 @@ class GroupExecutorWaitAll:
             if not group_list:
                 raise ValueError("组名列表不能为空，请在前端UI中选择组")
             
-            # 按组名读取配置文件来判断任务是否结束
-            # 检查每个组的配置文件，判断是否完成
-            start_time = time.time()
-            check_interval = 0.5  # 每0.5秒检查一次
-            completed = False
-            
+            # 按组名等待状态更新来判断任务是否结束
+            # 组状态写入时会立即唤醒等待，无需轮询
             print(f"[GroupExecutorWaitAll] 开始按组名等待任务完成，组: {group_list}")
             
-            while True:
-                # 检查所有组是否都完成（按组名读取状态文件）
-                all_completed = True
-                for group_name in group_list:
-                    group_completed = _group_result_manager.is_group_completed(group_name)
-                    if not group_completed:
-                        all_completed = False
-                        break
-                
-                if all_completed:
-                    completed = True
-                    print(f"[GroupExecutorWaitAll] 所有组执行完成，组: {group_list}")
-                    break
-                
-                # 检查超时
-                if timeout_seconds and (time.time() - start_time) > timeout_seconds:
-                    print(f"[GroupExecutorWaitAll] 等待超时，组: {group_list}")
-                    break
-                
-                # 等待一段时间后再次检查
-                time.sleep(check_interval)
+            completed = _group_result_manager.wait_for_groups_completed(group_list, timeout_seconds)
+            if completed:
+                print(f"[GroupExecutorWaitAll] 所有组执行完成，组: {group_list}")
+            else:
+                print(f"[GroupExecutorWaitAll] 等待超时或有组执行失败，组: {group_list}")
             
             # 返回信号和完成状态
             if signal is not None:
@@ -1900,12 +3188,26 @@ SERVERS_CONFIG_FILE = os.path.join(CONFIG_DIR, "servers.json")
 
 # ============ 服务器配置管理 ============
 
+# 检查 servers.json 是否被外部修改（mtime/大小）的最小间隔（秒），间隔内的查询直接使用内存缓存
+SERVER_CONFIG_CHECK_INTERVAL = 1.0
+
 class ServerConfigManager:
-    """服务器配置管理器"""
+    """服务器配置管理器
+    
+    配置缓存在内存中，并建立 id -> 服务器、url -> 服务器 索引；本管理器的写入直接更新缓存，
+    外部修改通过 servers.json 的 mtime/大小变化发现（最多每 SERVER_CONFIG_CHECK_INTERVAL 检查一次）。
+    返回给调用方的都是副本，修改不会影响缓存。
+    """
     
     def __init__(self):
         self.config_file = SERVERS_CONFIG_FILE
-        self._lock = threading.Lock()
+        self._lock = threading.RLock()
+        # 缓存的配置及其文件签名 (mtime_ns, size)
+        self._config = None
+        self._signature = None
+        self._checked_at = 0.0
+        self._servers_by_id = {}
+        self._servers_by_url = {}
         self._ensure_default_config()
     
     def _ensure_default_config(self):
@@ -1927,23 +3229,51 @@ class ServerConfigManager:
             }
             self._save_config(default_config)
     
+    def _get_file_signature(self):
+        """获取配置文件签名，文件不存在返回 None"""
+        try:
+            stat = os.stat(self.config_file)
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+    
+    def _set_cache(self, config, signature):
+        """更新缓存配置并重建索引（调用方需持有 self._lock）"""
+        # 验证配置格式
+        if "servers" not in config:
+            config["servers"] = []
+        if "default_server" not in config:
+            config["default_server"] = None
+        self._config = config
+        self._signature = signature
+        self._checked_at = time.time()
+        self._servers_by_id = {server.get("id"): server for server in config["servers"]}
+        self._servers_by_url = {(server.get("url") or "").rstrip('/'): server for server in config["servers"]}
+    
+    def _get_cached_config(self):
+        """获取缓存的配置，文件签名变化时重新加载（调用方需持有 self._lock，返回内部对象，不可修改）"""
+        now = time.time()
+        if self._config is not None and now - self._checked_at < SERVER_CONFIG_CHECK_INTERVAL:
+            return self._config
+        
+        signature = self._get_file_signature()
+        if signature is None:
+            self._ensure_default_config()
+            signature = self._get_file_signature()
+        if self._config is not None and signature == self._signature:
+            self._checked_at = now
+            return self._config
+        
+        with open(self.config_file, 'r', encoding='utf-8') as f:
+            config = json.load(f)
+        self._set_cache(config, signature)
+        return self._config
+    
     def _load_config(self):
-        """加载服务器配置"""
+        """加载服务器配置（返回缓存的副本，可修改后传给 _save_config）"""
         try:
             with self._lock:
-                if not os.path.exists(self.config_file):
-                    self._ensure_default_config()
-                
-                with open(self.config_file, 'r', encoding='utf-8') as f:
-                    config = json.load(f)
-                
-                # 验证配置格式
-                if "servers" not in config:
-                    config["servers"] = []
-                if "default_server" not in config:
-                    config["default_server"] = None
-                
-                return config
+                return copy.deepcopy(self._get_cached_config())
         except Exception as e:
             print(f"[ServerConfigManager] 加载配置失败: {e}")
             # 返回默认配置
@@ -1954,14 +3284,24 @@ class ServerConfigManager:
             }
     
     def _save_config(self, config):
-        """保存服务器配置"""
+        """保存服务器配置（写入临时文件后用 os.replace 原子替换，并同步更新缓存）"""
         try:
             with self._lock:
                 # 确保目录存在
                 os.makedirs(os.path.dirname(self.config_file), exist_ok=True)
                 
-                with open(self.config_file, 'w', encoding='utf-8') as f:
-                    json.dump(config, f, ensure_ascii=False, indent=2)
+                tmp_path = f"{self.config_file}.{os.getpid()}.{threading.get_ident()}.tmp"
+                try:
+                    with open(tmp_path, 'w', encoding='utf-8') as f:
+                        json.dump(config, f, ensure_ascii=False, indent=2)
+                    os.replace(tmp_path, self.config_file)
+                except BaseException:
+                    try:
+                        os.remove(tmp_path)
+                    except OSError:
+                        pass
+                    raise
+                self._set_cache(copy.deepcopy(config), self._get_file_signature())
         except Exception as e:
             print(f"[ServerConfigManager] 保存配置失败: {e}")
             raise
@@ -1978,15 +3318,38 @@ class ServerConfigManager:
         
         return servers, default_id
     
-    def get_server(self, server_id):
-        """获取指定服务器配置"""
-        config = self._load_config()
-        servers = config.get("servers", [])
-        
-        for server in servers:
-            if server.get("id") == server_id:
-                return server
-        return None
+    def get_server(self, server_id):
+        """获取指定服务器配置（按 id 索引查找，返回副本）"""
+        try:
+            with self._lock:
+                self._get_cached_config()
+                server = self._servers_by_id.get(server_id)
+                return dict(server) if server is not None else None
+        except Exception as e:
+            print(f"[ServerConfigManager] 加载配置失败: {e}")
+            return None
+    
+    def get_server_by_url(self, url):
+        """按 URL 获取服务器配置（忽略末尾斜杠，返回副本）"""
+        if not url:
+            return None
+        try:
+            with self._lock:
+                self._get_cached_config()
+                server = self._servers_by_url.get(url.rstrip('/'))
+                return dict(server) if server is not None else None
+        except Exception as e:
+            print(f"[ServerConfigManager] 加载配置失败: {e}")
+            return None
+    
+    def get_default_server_id(self):
+        """获取默认服务器ID"""
+        try:
+            with self._lock:
+                return self._get_cached_config().get("default_server")
+        except Exception as e:
+            print(f"[ServerConfigManager] 加载配置失败: {e}")
+            return None
     
     def add_server(self, name, url, auth_token=None):
         """添加新服务器配置"""
@@ -2113,6 +3476,9 @@ class ServerConfigManager:
             config["default_server"] = None
         
         self._save_config(config)
+        if HAS_REQUESTS:
+            _remote_session_pool.close(server_id)
+        _remote_completion_watcher.close(server_id)
         return server_to_delete
     
     def set_default_server(self, server_id):
@@ -2132,6 +3498,472 @@ class ServerConfigManager:
 # 全局服务器配置管理器实例
 _server_config_manager = ServerConfigManager()
 
+# ============ 远程服务器 HTTP 连接池 ============
+
+# 连接池默认参数（可在 servers.json 的服务器配置中用 pool_size / max_retries / timeout 覆盖）
+REMOTE_POOL_SIZE = 8  # 每个服务器保持的最大连接数
+REMOTE_MAX_RETRIES = 3  # 连接失败及 GET 请求的最大重试次数
+REMOTE_RETRY_BACKOFF = 0.5  # 重试退避系数（秒）
+REMOTE_CONNECT_TIMEOUT = 5  # 连接超时（秒）
+REMOTE_READ_TIMEOUT = 30  # 读取超时（秒）
+
+class RemoteSessionPool:
+    """远程服务器 HTTP 连接池：按服务器ID复用 requests.Session，保持 keep-alive 连接
+    
+    POST 请求只在连接阶段失败时重试，避免重复提交 prompt；GET 请求在读取失败和 502/503/504 时也会重试。
+    服务器的 url、auth_token 或连接池参数变化时会自动重建会话。
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._sessions = {}  # server_id -> (signature, session)
+    
+    def _get_settings(self, server_config):
+        """读取服务器的连接池参数"""
+        pool_size = int(server_config.get("pool_size") or REMOTE_POOL_SIZE)
+        max_retries = server_config.get("max_retries")
+        max_retries = REMOTE_MAX_RETRIES if max_retries is None else int(max_retries)
+        read_timeout = float(server_config.get("timeout") or REMOTE_READ_TIMEOUT)
+        return pool_size, max_retries, read_timeout
+    
+    def _create_session(self, server_config):
+        """创建带连接池和重试策略的会话"""
+        pool_size, max_retries, _ = self._get_settings(server_config)
+        retry_kwargs = {
+            "total": max_retries,
+            "connect": max_retries,
+            "read": max_retries,
+            "status": max_retries,
+            "backoff_factor": REMOTE_RETRY_BACKOFF,
+            "status_forcelist": (502, 503, 504),
+            "raise_on_status": False,
+        }
+        try:
+            retry = Retry(allowed_methods=frozenset(["GET", "HEAD"]), **retry_kwargs)
+        except TypeError:
+            # 兼容旧版本 urllib3
+            retry = Retry(method_whitelist=frozenset(["GET", "HEAD"]), **retry_kwargs)
+        
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=retry)
+        session = requests.Session()
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        
+        auth_token = server_config.get("auth_token")
+        if auth_token:
+            session.headers["Authorization"] = f"Bearer {auth_token}"
+        return session
+    
+    def get_session(self, server_config):
+        """获取服务器对应的会话（不存在或配置已变化时创建）"""
+        key = server_config.get("id") or server_config.get("url")
+        signature = (
+            server_config.get("url", "").rstrip('/'),
+            server_config.get("auth_token"),
+        ) + self._get_settings(server_config)[:2]
+        
+        with self._lock:
+            entry = self._sessions.get(key)
+            if entry is not None and entry[0] == signature:
+                return entry[1]
+            if entry is not None:
+                try:
+                    entry[1].close()
+                except Exception:
+                    pass
+            session = self._create_session(server_config)
+            self._sessions[key] = (signature, session)
+            return session
+    
+    def request(self, server_config, method, path, timeout=None, **kwargs):
+        """向远程服务器发送请求
+        
+        Args:
+            server_config: 服务器配置字典
+            method: HTTP 方法
+            path: 请求路径（如 /prompt）
+            timeout: 读取超时（秒），为 None 时使用服务器配置或默认值
+        """
+        url = server_config.get("url", "").rstrip('/') + path
+        session = self.get_session(server_config)
+        _, _, read_timeout = self._get_settings(server_config)
+        return session.request(
+            method,
+            url,
+            timeout=(REMOTE_CONNECT_TIMEOUT, timeout if timeout is not None else read_timeout),
+            **kwargs
+        )
+    
+    def get(self, server_config, path, timeout=None, **kwargs):
+        return self.request(server_config, "GET", path, timeout=timeout, **kwargs)
+    
+    def post(self, server_config, path, timeout=None, **kwargs):
+        return self.request(server_config, "POST", path, timeout=timeout, **kwargs)
+    
+    def close(self, server_id=None):
+        """关闭指定服务器（或全部服务器）的会话"""
+        with self._lock:
+            keys = [server_id] if server_id is not None else list(self._sessions.keys())
+            for key in keys:
+                entry = self._sessions.pop(key, None)
+                if entry is not None:
+                    try:
+                        entry[1].close()
+                    except Exception:
+                        pass
+
+# 全局远程连接池实例
+_remote_session_pool = RemoteSessionPool()
+
+# ============ 远程执行完成监听（WebSocket） ============
+
+REMOTE_WS_RECONNECT_DELAY = 1.0  # 首次重连等待（秒），之后指数退避
+REMOTE_WS_MAX_RECONNECT_DELAY = 30.0  # 最大重连等待（秒）
+REMOTE_HISTORY_POLL_INTERVAL = 1.0  # WebSocket 断开时查询 /history/{prompt_id} 的间隔（秒）
+
+class RemoteCompletionWatcher:
+    """远程执行完成监听器：每个服务器保持一条 /ws?clientId=... 长连接，所有等待该服务器的组共享
+    
+    连接运行在 PromptServer 的事件循环中，收到的执行事件交给该服务器的 PromptCompletionTracker。
+    """
+    
+    def __init__(self):
+        self.client_id = f"lg_group_executor_{uuid.uuid4().hex}"
+        self._lock = threading.Lock()
+        self._connections = {}  # server_id -> {"signature": ..., "future": ...}
+        self._trackers = {}  # server_id -> PromptCompletionTracker
+        self._generations = {}  # server_id -> 当前连接的序号（未连接时不存在）
+        self._generation_counter = 0
+        self._submit_generations = {}  # (server_id, prompt_id) -> 提交时的连接序号
+    
+    def get_tracker(self, server_id):
+        """获取服务器对应的完成通知器"""
+        with self._lock:
+            tracker = self._trackers.get(server_id)
+            if tracker is None:
+                tracker = PromptCompletionTracker()
+                self._trackers[server_id] = tracker
+            return tracker
+    
+    def get_generation(self, server_id):
+        """获取服务器当前连接的序号，未连接返回 None"""
+        with self._lock:
+            return self._generations.get(server_id)
+    
+    def set_submit_generation(self, server_id, prompt_id, generation):
+        """记录 prompt 提交时的连接序号"""
+        with self._lock:
+            self._submit_generations[(server_id, prompt_id)] = generation
+    
+    def pop_submit_generation(self, server_id, prompt_id):
+        with self._lock:
+            return self._submit_generations.pop((server_id, prompt_id), None)
+    
+    def ensure_connection(self, server_config):
+        """确保服务器的 WebSocket 监听已启动（配置变化时重建）"""
+        server_id = server_config.get("id")
+        url = server_config.get("url", "").rstrip('/')
+        if not server_id or not url:
+            return
+        signature = (url, server_config.get("auth_token"))
+        
+        with self._lock:
+            entry = self._connections.get(server_id)
+            if entry is not None and entry["signature"] == signature and not entry["future"].done():
+                return
+            if entry is not None:
+                entry["future"].cancel()
+            try:
+                loop = PromptServer.instance.loop
+                future = asyncio.run_coroutine_threadsafe(self._run(server_id, url, server_config.get("auth_token")), loop)
+            except Exception as e:
+                print(f"[GroupExecutor] 启动远程 WebSocket 监听失败 ({server_id}): {e}")
+                return
+            self._connections[server_id] = {"signature": signature, "future": future}
+    
+    def wake_all(self):
+        """唤醒所有服务器上的等待者（用于取消任务）"""
+        with self._lock:
+            trackers = list(self._trackers.values())
+        for tracker in trackers:
+            tracker.wake_all()
+    
+    def close(self, server_id):
+        """停止服务器的 WebSocket 监听"""
+        with self._lock:
+            entry = self._connections.pop(server_id, None)
+        if entry is not None:
+            entry["future"].cancel()
+    
+    def _set_connected(self, server_id, connected):
+        with self._lock:
+            if connected:
+                self._generation_counter += 1
+                self._generations[server_id] = self._generation_counter
+            else:
+                self._generations.pop(server_id, None)
+        # 连接状态变化时唤醒等待者，让它们切换到对应的检查方式
+        self.get_tracker(server_id).wake_all()
+    
+    async def _run(self, server_id, url, auth_token):
+        """WebSocket 连接循环：断开后自动重连"""
+        ws_url = url.replace("https://", "wss://", 1).replace("http://", "ws://", 1)
+        ws_url = f"{ws_url}/ws?clientId={self.client_id}"
+        headers = {}
+        if auth_token:
+            headers["Authorization"] = f"Bearer {auth_token}"
+        
+        tracker = self.get_tracker(server_id)
+        delay = REMOTE_WS_RECONNECT_DELAY
+        try:
+            while True:
+                try:
+                    async with aiohttp.ClientSession() as session:
+                        async with session.ws_connect(ws_url, headers=headers, heartbeat=30) as ws:
+                            self._set_connected(server_id, True)
+                            delay = REMOTE_WS_RECONNECT_DELAY
+                            print(f"[GroupExecutor] 已连接远程服务器 WebSocket: {url}")
+                            async for msg in ws:
+                                if msg.type == aiohttp.WSMsgType.TEXT:
+                                    try:
+                                        message = json.loads(msg.data)
+                                    except ValueError:
+                                        continue
+                                    if isinstance(message, dict):
+                                        tracker.handle_event(message.get("type"), message.get("data"))
+                                elif msg.type in (aiohttp.WSMsgType.CLOSED, aiohttp.WSMsgType.ERROR):
+                                    break
+                    print(f"[GroupExecutor] 远程服务器 WebSocket 已断开: {url}")
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    if delay == REMOTE_WS_RECONNECT_DELAY:
+                        print(f"[GroupExecutor] 远程服务器 WebSocket 连接失败 ({url}): {e}")
+                
+                self._set_connected(server_id, False)
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, REMOTE_WS_MAX_RECONNECT_DELAY)
+        finally:
+            self._set_connected(server_id, False)
+
+# 全局远程执行完成监听器实例
+_remote_completion_watcher = RemoteCompletionWatcher()
+
+# ============ 远程结果传输（HTTP） ============
+
+REMOTE_FETCH_CHUNK_SIZE = 1024 * 1024  # 下载时每次读取的字节数
+REMOTE_FETCH_PENDING_INTERVAL = 0.5    # 远端仍在异步编码时的重新查询间隔（秒）
+
+REMOTE_CHECKSUM_CACHE_SIZE = 4096     # 文件摘要缓存的最大条目数
+
+_checksum_cache = OrderedDict()  # (文件路径, size, mtime_ns) -> sha256，按最近使用排序
+_checksum_cache_lock = threading.Lock()
+
+def _remember_checksum(file_path, stat, checksum):
+    """记录文件在该签名下的摘要"""
+    with _checksum_cache_lock:
+        _checksum_cache[(file_path, stat.st_size, stat.st_mtime_ns)] = checksum
+        _checksum_cache.move_to_end((file_path, stat.st_size, stat.st_mtime_ns))
+        while len(_checksum_cache) > REMOTE_CHECKSUM_CACHE_SIZE:
+            _checksum_cache.popitem(last=False)
+
+def _file_checksum(file_path):
+    """计算文件的 sha256，文件不存在时返回 None
+    
+    按 (路径, size, mtime_ns) 缓存，签名不变时只需一次 stat，不重新读取文件。
+    """
+    try:
+        stat = os.stat(file_path)
+    except OSError:
+        return None
+    key = (file_path, stat.st_size, stat.st_mtime_ns)
+    with _checksum_cache_lock:
+        checksum = _checksum_cache.get(key)
+        if checksum is not None:
+            _checksum_cache.move_to_end(key)
+    if checksum is not None:
+        return checksum
+    
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(REMOTE_FETCH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    checksum = digest.hexdigest()
+    _remember_checksum(file_path, stat, checksum)
+    return checksum
+
+def _list_result_files(results_dir, group_name, link_id):
+    """列出某个组/link 的全部结果文件，返回 (相对路径列表, 是否仍在写入)
+    
+    文件来自结果清单（清单本身排在最后，下载端写完数据文件后才替换清单），
+    另外包含旧版平铺布局中尚未迁移的文件。
+    """
+    safe_name = _group_result_manager._get_safe_group_name(group_name)
+    prefix = f"{safe_name}_{link_id}_"
+    manifest_name = f"{safe_name}_{link_id}{REMOTE_MANIFEST_SUFFIX}"
+    names = []
+    pending = False
+    try:
+        filenames = os.listdir(results_dir)
+    except FileNotFoundError:
+        return names, pending
+    for filename in filenames:
+        if filename.startswith(prefix):
+            if filename.endswith(REMOTE_PENDING_SUFFIX):
+                pending = True
+            elif filename.endswith(REMOTE_RESULT_EXTENSIONS):
+                names.append(filename)
+    
+    manifest = _read_result_manifest(os.path.join(results_dir, manifest_name))
+    if manifest is not None:
+        names.extend(name for name in _get_manifest_files(manifest) if name not in names)
+        return sorted(names) + [manifest_name], pending
+    return sorted(names), pending
+
+class RemoteResultFetcher:
+    """远程结果下载器：本地与远端不共享 execution_status 目录时，通过 HTTP 拉取远端的结果文件
+    
+    根据组状态文件中的 server_id 找到执行该组的远程服务器，先查询结果文件列表（含 sha256），
+    只下载本地缺失或内容不同的文件；下载时分块流式写入临时文件，校验通过后原子替换。
+    数据文件按原有相对路径放到本地分组目录中，清单最后下载，接收节点按原有方式读取。
+    """
+    
+    def __init__(self, results_dir, status_dir):
+        self.results_dir = results_dir
+        self.status_dir = status_dir
+        self._lock = threading.Lock()
+        self._fetch_locks = {}  # (group_name, link_id) -> Lock，避免同一结果被并发下载
+    
+    def _get_fetch_lock(self, group_name, link_id):
+        with self._lock:
+            return self._fetch_locks.setdefault((group_name, str(link_id)), threading.Lock())
+    
+    def _get_group_server(self, group_name):
+        """返回执行该组的远程服务器配置，本地执行或未知时返回 None"""
+        status = _group_result_manager.load_status_by_group(group_name)
+        if not status:
+            return None
+        server_id = status.get("server_id")
+        if _group_result_manager._is_local_server(server_id):
+            return None
+        return _server_config_manager.get_server(server_id)
+    
+    def _download(self, server_config, filename, expected_checksum):
+        """流式下载单个结果文件并校验 sha256（filename 为相对 results_dir 的路径）"""
+        file_path = _resolve_result_path(self.results_dir, filename)
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        temp_file = file_path + ".part"
+        digest = hashlib.sha256()
+        try:
+            response = _remote_session_pool.get(server_config, f"/group_executor/results/file/{quote(filename)}", stream=True)
+            with response:
+                response.raise_for_status()
+                with open(temp_file, 'wb') as f:
+                    for chunk in response.iter_content(chunk_size=REMOTE_FETCH_CHUNK_SIZE):
+                        digest.update(chunk)
+                        f.write(chunk)
+            if expected_checksum and digest.hexdigest() != expected_checksum:
+                raise ValueError(f"校验失败: 期望 {expected_checksum}, 实际 {digest.hexdigest()}")
+            os.replace(temp_file, file_path)
+            # 下载时已算出摘要，直接写入缓存，读取端无需再次哈希
+            _remember_checksum(file_path, os.stat(file_path), digest.hexdigest())
+        finally:
+            if os.path.exists(temp_file):
+                try:
+                    os.remove(temp_file)
+                except OSError:
+                    pass
+    
+    def fetch_images(self, group_name, link_id, timeout=REMOTE_PENDING_TIMEOUT):
+        """把远端的图像结果同步到本地 remote_results 目录
+        
+        Returns:
+            bool: 进行了同步返回 True；组在本地执行、远端不支持或失败时返回 False
+        """
+        if not HAS_REQUESTS:
+            return False
+        server_config = self._get_group_server(group_name)
+        if server_config is None:
+            return False
+        
+        path = f"/group_executor/results/files/{quote(group_name, safe='')}/{quote(str(link_id), safe='')}"
+        deadline = time.time() + timeout
+        with self._get_fetch_lock(group_name, link_id):
+            try:
+                while True:
+                    response = _remote_session_pool.get(server_config, path)
+                    if response.status_code == 404:
+                        print(f"[RemoteResultFetcher] 远程服务器不支持结果下载，使用本地文件: {server_config.get('url')}")
+                        return False
+                    response.raise_for_status()
+                    listing = response.json()
+                    # 远端仍在异步编码，等待写完再下载
+                    if listing.get("pending") and time.time() < deadline:
+                        time.sleep(REMOTE_FETCH_PENDING_INTERVAL)
+                        continue
+                    break
+                
+                os.makedirs(self.results_dir, exist_ok=True)
+                remote_files = listing.get("files", [])
+                downloaded = 0
+                for item in remote_files:
+                    filename = item.get("name", "")
+                    if _resolve_result_path(self.results_dir, filename) is None:
+                        continue
+                    checksum = item.get("sha256")
+                    if checksum and _file_checksum(_resolve_result_path(self.results_dir, filename)) == checksum:
+                        continue
+                    self._download(server_config, filename, checksum)
+                    downloaded += 1
+                
+                # 删除远端已不存在的旧结果文件
+                remote_names = {item.get("name", "") for item in remote_files}
+                local_names, _ = _list_result_files(self.results_dir, group_name, link_id)
+                for filename in local_names:
+                    if filename not in remote_names:
+                        try:
+                            os.remove(_resolve_result_path(self.results_dir, filename))
+                        except OSError as e:
+                            print(f"[RemoteResultFetcher] 删除旧结果文件失败: {filename}, 错误: {e}")
+                
+                print(f"[RemoteResultFetcher] 组 '{group_name}' (link_id={link_id}) 同步完成: 共 {len(remote_files)} 个文件，下载 {downloaded} 个")
+                return True
+            except Exception as e:
+                print(f"[RemoteResultFetcher] 下载组 '{group_name}' 的结果失败: {e}")
+                return False
+    
+    def fetch_text(self, group_name, link_id):
+        """把远端的文本结果文件同步到本地状态目录
+        
+        Returns:
+            bool: 进行了同步返回 True；组在本地执行、远端不支持或失败时返回 False
+        """
+        if not HAS_REQUESTS:
+            return False
+        server_config = self._get_group_server(group_name)
+        if server_config is None:
+            return False
+        
+        path = f"/group_executor/results/text/{quote(group_name, safe='')}/{quote(str(link_id), safe='')}"
+        try:
+            response = _remote_session_pool.get(server_config, path)
+            if response.status_code == 404:
+                return False
+            response.raise_for_status()
+            data = response.json().get("data")
+            if not isinstance(data, dict):
+                return False
+            
+            safe_name = _group_result_manager._get_safe_group_name(group_name)
+            _status_store.write(os.path.join(self.status_dir, f"{safe_name}_{link_id}.json"), data)
+            return True
+        except Exception as e:
+            print(f"[RemoteResultFetcher] 下载组 '{group_name}' 的文本结果失败: {e}")
+            return False
+
+# 全局远程结果下载器实例
+_remote_result_fetcher = RemoteResultFetcher(_group_result_manager.remote_results_dir, _group_result_manager.status_dir)
+
 # ============ 服务器连接测试 ============
 
 async def test_server_connection(url, auth_token=None):
@@ -2153,16 +3985,17 @@ async def test_server_connection(url, auth_token=None):
         test_url = f"{url.rstrip('/')}/queue"
         
         timeout = aiohttp.ClientTimeout(total=5)  # 5秒超时
-        async with aiohttp.ClientSession(timeout=timeout) as session:
-            async with session.get(test_url, headers=headers) as response:
-                if response.status == 200:
-                    return True, "连接成功"
-                elif response.status == 401:
-                    return False, "认证失败：Token无效"
-                elif response.status == 403:
-                    return False, "访问被拒绝：权限不足"
-                else:
-                    return False, f"连接失败：HTTP {response.status}"
+        # 复用健康检查的共享会话（测试运行在 PromptServer 的事件循环中）
+        session = _server_health_monitor.get_session()
+        async with session.get(test_url, headers=headers, timeout=timeout) as response:
+            if response.status == 200:
+                return True, "连接成功"
+            elif response.status == 401:
+                return False, "认证失败：Token无效"
+            elif response.status == 403:
+                return False, "访问被拒绝：权限不足"
+            else:
+                return False, f"连接失败：HTTP {response.status}"
     
     except aiohttp.ClientError as e:
         return False, f"连接错误：{str(e)}"
@@ -2171,6 +4004,314 @@ async def test_server_connection(url, auth_token=None):
     except Exception as e:
         return False, f"未知错误：{str(e)}"
 
+# ============ 远程服务器健康检查 ============
+
+SERVER_HEALTH_INTERVAL = 10.0  # 健康检查间隔（秒）
+SERVER_HEALTH_TIMEOUT = 5.0  # 单次探测超时（秒）
+SERVER_HEALTH_MAX_FAILURES = 3  # 连续失败多少次视为服务器不可用
+SERVER_HEALTH_MAX_QUEUE = 32  # 队列（运行中 + 等待中）达到该长度视为过载，可在服务器配置中用 max_queue 覆盖
+
+class ServerHealthMonitor:
+    """远程服务器健康检查：在 PromptServer 的事件循环中定期探测每个服务器的 /queue 和 /system_stats
+    
+    所有探测共用一个 aiohttp.ClientSession，记录往返延迟、队列长度、显存和连续失败次数。
+    状态：unknown（尚未探测）、healthy、overloaded（队列过长）、failing（连续失败但未达阈值）、down。
+    本地服务器（id 为 local）不经过 HTTP 提交，不参与探测。
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._health = {}  # server_id -> 健康状态字典
+        self._session = None
+        self._future = None
+        self._wake_event = None
+        self._loop = None
+    
+    def start(self):
+        """启动后台探测（已启动时忽略）"""
+        with self._lock:
+            if self._future is not None and not self._future.done():
+                return
+            try:
+                self._loop = PromptServer.instance.loop
+                self._future = asyncio.run_coroutine_threadsafe(self._run(), self._loop)
+            except Exception as e:
+                print(f"[ServerHealthMonitor] 启动健康检查失败: {e}")
+    
+    def refresh(self, server_id=None):
+        """立即进行一轮探测（服务器配置变化时调用，server_id 的旧记录会被清除）"""
+        if server_id is not None:
+            with self._lock:
+                self._health.pop(server_id, None)
+        loop = self._loop
+        if loop is None or self._wake_event is None:
+            return
+        try:
+            loop.call_soon_threadsafe(self._wake_event.set)
+        except RuntimeError:
+            pass
+    
+    def get_session(self):
+        """获取共享的 aiohttp 会话（需在事件循环中调用）"""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession()
+        return self._session
+    
+    def get_health(self, server_id):
+        """获取服务器的健康状态（副本），未探测过返回 None"""
+        with self._lock:
+            health = self._health.get(server_id)
+            return dict(health) if health is not None else None
+    
+    def get_all_health(self):
+        with self._lock:
+            return {server_id: dict(health) for server_id, health in self._health.items()}
+    
+    def is_down(self, server_id):
+        """服务器是否已连续探测失败达到阈值"""
+        with self._lock:
+            health = self._health.get(server_id)
+            return health is not None and health["status"] == "down"
+    
+    def is_available(self, server_id, allow_overloaded=True):
+        """服务器是否可以接收任务（未探测过的服务器视为可用）"""
+        with self._lock:
+            health = self._health.get(server_id)
+        if health is None:
+            return True
+        if health["status"] == "down":
+            return False
+        return allow_overloaded or health["status"] != "overloaded"
+    
+    async def _run(self):
+        self._wake_event = asyncio.Event()
+        while True:
+            try:
+                servers, _ = _server_config_manager.get_all_servers()
+                servers = [s for s in servers if s.get("id") and s.get("id") != "local" and s.get("url")]
+                await asyncio.gather(*(self._probe(server) for server in servers))
+                # 移除已删除服务器的记录
+                server_ids = {server["id"] for server in servers}
+                with self._lock:
+                    for server_id in list(self._health.keys()):
+                        if server_id not in server_ids:
+                            del self._health[server_id]
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"[ServerHealthMonitor] 健康检查出错: {e}")
+            
+            try:
+                await asyncio.wait_for(self._wake_event.wait(), SERVER_HEALTH_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+            self._wake_event.clear()
+    
+    async def _get_json(self, session, url, headers):
+        timeout = aiohttp.ClientTimeout(total=SERVER_HEALTH_TIMEOUT)
+        async with session.get(url, headers=headers, timeout=timeout) as response:
+            if response.status != 200:
+                raise RuntimeError(f"HTTP {response.status}")
+            return await response.json(content_type=None)
+    
+    async def _probe(self, server_config):
+        """探测单个服务器并记录结果"""
+        server_id = server_config["id"]
+        url = server_config["url"].rstrip('/')
+        headers = {}
+        if server_config.get("auth_token"):
+            headers["Authorization"] = f"Bearer {server_config['auth_token']}"
+        
+        session = self.get_session()
+        start = time.perf_counter()
+        try:
+            queue = await self._get_json(session, f"{url}/queue", headers)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self._record_failure(server_id, url, str(e) or type(e).__name__)
+            return
+        rtt = time.perf_counter() - start
+        
+        # /system_stats 只用于显存信息，失败不影响健康状态
+        try:
+            stats = await self._get_json(session, f"{url}/system_stats", headers)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            stats = None
+        
+        try:
+            max_queue = int(server_config.get("max_queue") or SERVER_HEALTH_MAX_QUEUE)
+        except (TypeError, ValueError):
+            max_queue = SERVER_HEALTH_MAX_QUEUE
+        self._record_success(server_id, url, rtt, queue, stats, max_queue)
+    
+    def _record_success(self, server_id, url, rtt, queue, stats, max_queue):
+        queue = queue if isinstance(queue, dict) else {}
+        queue_running = len(queue.get("queue_running") or [])
+        queue_pending = len(queue.get("queue_pending") or [])
+        devices = stats.get("devices") if isinstance(stats, dict) else None
+        device = devices[0] if devices and isinstance(devices[0], dict) else {}
+        
+        status = "overloaded" if queue_running + queue_pending >= max_queue else "healthy"
+        with self._lock:
+            previous = self._health.get(server_id)
+            self._health[server_id] = {
+                "status": status,
+                "rtt_ms": round(rtt * 1000, 1),
+                "queue_running": queue_running,
+                "queue_pending": queue_pending,
+                "vram_total": device.get("vram_total"),
+                "vram_free": device.get("vram_free"),
+                "failure_streak": 0,
+                "last_error": None,
+                "last_checked": time.time(),
+                "last_success": time.time(),
+            }
+        if previous is not None and previous["status"] == "down":
+            print(f"[ServerHealthMonitor] 服务器已恢复: {server_id} ({url})")
+    
+    def _record_failure(self, server_id, url, error):
+        with self._lock:
+            previous = self._health.get(server_id) or {}
+            failure_streak = previous.get("failure_streak", 0) + 1
+            status = "down" if failure_streak >= SERVER_HEALTH_MAX_FAILURES else "failing"
+            health = dict(previous)
+            health.update({
+                "status": status,
+                "failure_streak": failure_streak,
+                "last_error": error,
+                "last_checked": time.time(),
+            })
+            health.setdefault("last_success", None)
+            self._health[server_id] = health
+        if status == "down" and previous.get("status") != "down":
+            print(f"[ServerHealthMonitor] 服务器连续 {failure_streak} 次探测失败，标记为不可用: {server_id} ({url}): {error}")
+
+# 全局服务器健康检查实例
+_server_health_monitor = ServerHealthMonitor()
+_server_health_monitor.start()
+
+# ============ 自动选择服务器 ============
+
+SERVER_DURATION_EWMA_ALPHA = 0.3  # 执行耗时指数加权平均的新样本权重
+SERVER_STICKY_TOLERANCE = 1.5  # 沿用上次分配的服务器时，允许其得分超过最优得分的倍数
+
+class ServerSelector:
+    """按负载为执行项选择服务器（执行项 server_id 为 AUTO_SERVER_ID 时使用）
+    
+    得分 =（待执行数 + 1）× 预计耗时 / 权重，选择得分最低的服务器：
+    - 待执行数：健康检查得到的远端队列长度与本进程已提交未完成数中的较大值；
+    - 预计耗时：该组在该服务器上执行耗时的指数加权平均，没有记录时用该服务器所有组的平均值；
+    - 权重：server_pool 中的 weight，其次是服务器配置中的 weight，默认 1。
+    down 的服务器不参与选择，overloaded 的服务器只在没有其他服务器时才选择。
+    同一组优先沿用上次分配的服务器（已加载的模型可以复用），除非其得分超过最优得分的 SERVER_STICKY_TOLERANCE 倍。
+    select() 选中服务器时即占用一个待执行数，并发选择不会都落到同一个服务器；提交失败时调用 release() 归还，
+    执行结束时由 finish() 归还。
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._inflight = {}  # server_id -> 本进程已提交未完成的 prompt 数
+        self._durations = {}  # (server_id, group_name) -> 耗时平均值（秒）
+        self._server_durations = {}  # server_id -> 耗时平均值（秒）
+        self._sticky = {}  # group_name -> 上次分配的 server_id
+    
+    def get_candidates(self, server_pool=None):
+        """解析候选服务器，返回 [(server_id, weight)]（本地服务器不参与自动选择）"""
+        if server_pool:
+            entries = []
+            for entry in server_pool:
+                if isinstance(entry, dict):
+                    server_id, weight = entry.get("id"), entry.get("weight")
+                else:
+                    server_id, weight = entry, None
+                server = _server_config_manager.get_server(server_id) if server_id and server_id != "local" else None
+                if server is not None:
+                    entries.append((server_id, server.get("weight") if weight is None else weight))
+        else:
+            servers, _ = _server_config_manager.get_all_servers()
+            entries = [(server["id"], server.get("weight")) for server in servers
+                       if server.get("id") and server.get("id") != "local" and server.get("url")]
+        
+        candidates = []
+        for server_id, weight in entries:
+            try:
+                weight = 1.0 if weight is None else float(weight)
+            except (TypeError, ValueError):
+                weight = 1.0
+            if weight > 0:
+                candidates.append((server_id, weight))
+        return candidates
+    
+    def select(self, group_name, server_pool=None, exclude=()):
+        """为组选择服务器并占用一个待执行数，没有可用服务器时返回 None"""
+        candidates = [(server_id, weight) for server_id, weight in self.get_candidates(server_pool) if server_id not in exclude]
+        with self._lock:
+            scored = []
+            for server_id, weight in candidates:
+                health = _server_health_monitor.get_health(server_id) or {}
+                status = health.get("status", "unknown")
+                if status == "down":
+                    continue
+                queue_depth = (health.get("queue_running") or 0) + (health.get("queue_pending") or 0)
+                pending = max(queue_depth, self._inflight.get(server_id, 0))
+                duration = self._durations.get((server_id, group_name)) or self._server_durations.get(server_id) or 1.0
+                scored.append((status == "overloaded", (pending + 1) * duration / weight, server_id))
+            if not scored:
+                return None
+            
+            scored.sort()
+            best = scored[0]
+            sticky_id = self._sticky.get(group_name)
+            for entry in scored:
+                if entry[2] == sticky_id:
+                    if entry[0] == best[0] and entry[1] <= best[1] * SERVER_STICKY_TOLERANCE:
+                        best = entry
+                    break
+            self._sticky[group_name] = best[2]
+            self._inflight[best[2]] = self._inflight.get(best[2], 0) + 1
+            return best[2]
+    
+    def begin(self, server_id):
+        """记录向服务器提交了一个 prompt（未经 select() 占用时调用）"""
+        with self._lock:
+            self._inflight[server_id] = self._inflight.get(server_id, 0) + 1
+    
+    def release(self, server_id):
+        """归还 select() 或 begin() 占用的待执行数（提交失败、未提交或已从队列中删除时调用）"""
+        with self._lock:
+            self._release(server_id)
+    
+    def _release(self, server_id):
+        remaining = self._inflight.get(server_id, 0) - 1
+        if remaining > 0:
+            self._inflight[server_id] = remaining
+        else:
+            self._inflight.pop(server_id, None)
+    
+    def finish(self, server_id, group_name, duration=None):
+        """记录 prompt 执行结束（duration 为 None 表示被中断，不计入耗时）"""
+        with self._lock:
+            self._release(server_id)
+            if duration is None:
+                return
+            for key, averages in (((server_id, group_name), self._durations), (server_id, self._server_durations)):
+                previous = averages.get(key)
+                averages[key] = duration if previous is None else previous + SERVER_DURATION_EWMA_ALPHA * (duration - previous)
+    
+    def get_load(self, server_id):
+        """获取本进程记录的服务器负载（已提交未完成数、平均耗时）"""
+        with self._lock:
+            return {
+                "inflight": self._inflight.get(server_id, 0),
+                "avg_duration": self._server_durations.get(server_id),
+            }
+
+# 全局服务器选择器实例
+_server_selector = ServerSelector()
+
 routes = PromptServer.instance.routes
 
 @routes.post("/group_executor/execute_backend")
@@ -2181,6 +4322,15 @@ async def execute_backend(request):
         node_id = data.get("node_id")
         execution_list = data.get("execution_list", [])
         full_api_prompt = data.get("api_prompt", {})
+        parallel = bool(data.get("parallel", False))
+        try:
+            max_per_server = max(1, int(data.get("max_per_server", DEFAULT_MAX_PER_SERVER)))
+        except (TypeError, ValueError):
+            max_per_server = DEFAULT_MAX_PER_SERVER
+        try:
+            lookahead = max(0, int(data.get("lookahead", DEFAULT_LOOKAHEAD)))
+        except (TypeError, ValueError):
+            lookahead = DEFAULT_LOOKAHEAD
         
         if not node_id:
             return web.json_response({"status": "error", "message": "缺少 node_id"}, status=400)
@@ -2191,13 +4341,16 @@ async def execute_backend(request):
         if not full_api_prompt:
             return web.json_response({"status": "error", "message": "缺少 API prompt"}, status=400)
         
-        print(f"[GroupExecutor] 收到后台执行请求: node_id={node_id}, 执行项数={len(execution_list)}")
+        print(f"[GroupExecutor] 收到后台执行请求: node_id={node_id}, 执行项数={len(execution_list)}, 并行={parallel}, 提前提交={lookahead}")
         
         # 启动后台执行
         success = _backend_executor.execute_in_background(
             node_id,
             execution_list,
-            full_api_prompt
+            full_api_prompt,
+            parallel=parallel,
+            max_per_server=max_per_server,
+            lookahead=lookahead
         )
         
         if success:
@@ -2323,6 +4476,26 @@ async def check_group_completed(request):
         traceback.print_exc()
         return web.json_response({"status": "error", "message": str(e)}, status=500)
 
+@routes.get('/group_executor/status_events')
+async def get_status_events(request):
+    """长轮询获取状态目录变更事件（since 为上次返回的 seq）"""
+    try:
+        since = int(request.query.get('since', 0))
+        timeout = min(float(request.query.get('timeout', 25)), 60.0)
+        loop = asyncio.get_event_loop()
+        events, seq = await loop.run_in_executor(None, _status_change_feed.wait_events, since, timeout)
+        return web.json_response({"status": "success", "seq": seq, "mode": _status_change_feed.mode, "events": events})
+    except ValueError:
+        return web.json_response({"status": "error", "message": "参数无效"}, status=400)
+    except Exception as e:
+        print(f"[GroupExecutor] 获取状态变更事件失败: {e}")
+        return web.json_response({"status": "error", "message": str(e)}, status=500)
+
+@routes.get('/group_executor/status/lock_stats')
+async def get_status_lock_stats(request):
+    """获取 GroupResultManager 锁的持有时间与争用统计"""
+    return web.json_response({"status": "success", "locks": _group_result_manager.get_lock_stats()})
+
 # ============ 服务器配置管理API ============
 
 @routes.get("/group_executor/servers")
@@ -2330,6 +4503,9 @@ async def get_servers(request):
     """获取所有服务器配置列表"""
     try:
         servers, default_id = _server_config_manager.get_all_servers()
+        for server in servers:
+            server["health"] = _server_health_monitor.get_health(server.get("id"))
+            server["load"] = _server_selector.get_load(server.get("id"))
         return web.json_response({
             "status": "success",
             "servers": servers,
@@ -2362,8 +4538,9 @@ async def get_server(request):
                 "message": f"服务器ID '{server_id}' 不存在"
             }, status=404)
         
-        config = _server_config_manager._load_config()
-        server["is_default"] = (server_id == config.get("default_server"))
+        server["is_default"] = (server_id == _server_config_manager.get_default_server_id())
+        server["health"] = _server_health_monitor.get_health(server_id)
+        server["load"] = _server_selector.get_load(server_id)
         
         return web.json_response({
             "status": "success",
@@ -2404,6 +4581,7 @@ async def add_server(request):
             }, status=400)
         
         server = _server_config_manager.add_server(name, url, auth_token)
+        _server_health_monitor.refresh(server.get("id"))
         
         return web.json_response({
             "status": "success",
@@ -2466,6 +4644,7 @@ async def update_server(request):
             url=url,
             auth_token=auth_token
         )
+        _server_health_monitor.refresh(server_id)
         
         return web.json_response({
             "status": "success",
@@ -2670,6 +4849,61 @@ async def set_group_result(request):
             "message": str(e)
         }, status=500)
 
+@routes.get("/group_executor/results/files/{group_name}/{link_id}")
+async def list_result_files(request):
+    """列出某个组/link 的结果文件（供其他服务器下载）"""
+    try:
+        group_name = request.match_info.get('group_name')
+        link_id = request.match_info.get('link_id')
+        if not group_name or not link_id.isdigit():
+            return web.json_response({"status": "error", "message": "参数无效"}, status=400)
+        results_dir = _group_result_manager.remote_results_dir
+        names, pending = _list_result_files(results_dir, group_name, link_id)
+        
+        loop = asyncio.get_event_loop()
+        files = []
+        for name in names:
+            file_path = _resolve_result_path(results_dir, name)
+            if file_path is None:
+                continue
+            checksum = await loop.run_in_executor(None, _file_checksum, file_path)
+            if checksum is None:
+                continue
+            files.append({"name": name, "size": os.path.getsize(file_path), "sha256": checksum})
+        return web.json_response({"status": "success", "pending": pending, "files": files})
+    except Exception as e:
+        print(f"[GroupExecutor] 列出结果文件失败: {e}")
+        return web.json_response({"status": "error", "message": str(e)}, status=500)
+
+@routes.get("/group_executor/results/file/{filename:.+}")
+async def download_result_file(request):
+    """下载单个结果文件（分块传输），filename 为相对 remote_results 的路径"""
+    filename = request.match_info.get('filename', '')
+    file_path = _resolve_result_path(_group_result_manager.remote_results_dir, filename)
+    if file_path is None:
+        return web.json_response({"status": "error", "message": "文件名无效"}, status=400)
+    if not os.path.isfile(file_path):
+        return web.json_response({"status": "error", "message": "文件不存在"}, status=404)
+    return web.FileResponse(file_path, chunk_size=REMOTE_FETCH_CHUNK_SIZE)
+
+@routes.get("/group_executor/results/text/{group_name}/{link_id}")
+async def get_result_text(request):
+    """获取某个组/link 的文本结果文件内容"""
+    try:
+        group_name = request.match_info.get('group_name')
+        link_id = request.match_info.get('link_id')
+        if not group_name or not link_id.isdigit():
+            return web.json_response({"status": "error", "message": "参数无效"}, status=400)
+        safe_name = _group_result_manager._get_safe_group_name(group_name)
+        config_file_path = os.path.join(_group_result_manager.status_dir, f"{safe_name}_{link_id}.json")
+        data = _status_store.read(config_file_path)
+        if data is None:
+            return web.json_response({"status": "error", "message": "文本结果不存在"}, status=404)
+        return web.json_response({"status": "success", "data": data})
+    except Exception as e:
+        print(f"[GroupExecutor] 读取文本结果失败: {e}")
+        return web.json_response({"status": "error", "message": str(e)}, status=500)
+
 @routes.get("/group_executor/results/{execution_id}")
 async def get_execution_results(request):
     """获取执行的所有结果"""
@@ -13,6 +13,11 @@ from PIL.PngImagePlugin import PngInfo
 import time
 import node_helpers
 import threading
+import hashlib
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from aiohttp import web
+from .group_names import _get_repeat_group_name, _resolve_result_path
 
 CATEGORY_TYPE = "🎈LAOGOU/Group"
 class AnyType(str):
@@ -25,6 +30,486 @@ class AnyType(str):
 
 any_typ = AnyType("*")
 
+# 图像编码线程池：PIL 的 PNG/WebP/JPEG 压缩会释放 GIL，多帧可以并行编码
+IMAGE_ENCODE_WORKERS = os.cpu_count() or 1
+_encode_executor = None
+_encode_executor_lock = threading.Lock()
+
+def _get_encode_executor():
+    """获取（按需创建）图像编码线程池"""
+    global _encode_executor
+    with _encode_executor_lock:
+        if _encode_executor is None:
+            _encode_executor = ThreadPoolExecutor(max_workers=IMAGE_ENCODE_WORKERS, thread_name_prefix="LG_ImageEncode")
+        return _encode_executor
+
+# 图像解码线程池：PIL 解码和 numpy 的类型转换会释放 GIL，多个文件可以并行解码
+IMAGE_DECODE_WORKERS = min(8, os.cpu_count() or 1)
+_decode_executor = None
+_decode_executor_lock = threading.Lock()
+
+def _get_decode_executor():
+    """获取（按需创建）图像解码线程池"""
+    global _decode_executor
+    with _decode_executor_lock:
+        if _decode_executor is None:
+            _decode_executor = ThreadPoolExecutor(max_workers=IMAGE_DECODE_WORKERS, thread_name_prefix="LG_ImageDecode")
+        return _decode_executor
+
+def _decode_files_parallel(decode, items, workers=0):
+    """在解码线程池中并发执行 decode(item)，按 items 的原始顺序返回结果
+    
+    同时在途的任务不超过 workers 个（0 表示使用 IMAGE_DECODE_WORKERS），只有一项或 workers 为 1 时
+    直接在当前线程执行。decode 需要自行捕获单个文件的异常，返回 None 表示跳过该文件。
+    """
+    workers = IMAGE_DECODE_WORKERS if not workers or workers <= 0 else min(workers, IMAGE_DECODE_WORKERS)
+    if workers <= 1 or len(items) <= 1:
+        return [decode(item) for item in items]
+    
+    executor = _get_decode_executor()
+    results = []
+    in_flight = deque()
+    for item in items:
+        in_flight.append(executor.submit(decode, item))
+        if len(in_flight) >= workers:
+            results.append(in_flight.popleft().result())
+    while in_flight:
+        results.append(in_flight.popleft().result())
+    return results
+
+def _images_to_rgba_frames(images, masks=None, log_prefix="[ImageSender]", with_tensors=False):
+    """把 IMAGE 列表（每项 [B,H,W,C]）和对应的 MASK 批量转换为 uint8 RGBA 帧
+    
+    每个批次只做一次向量化的 clip/量化（与 np.clip(255*x).astype(uint8) 一样截断取整），
+    不经过 PIL 的 split/merge；遮罩尺寸与图像不一致时才逐帧用 LANCZOS 缩放。
+    
+    Args:
+        with_tensors: 为 True 时每项返回 (rgba, image, mask)，image 为 [1,H,W,3] 的原始张量视图，
+            mask 为 [1,H,W]（与接收端解码 PNG 得到的含义一致）；遮罩需要缩放时 mask 为 None
+    
+    Returns:
+        list: [H,W,4] uint8 数组列表，按输入顺序展开所有帧；转换失败的批次会被跳过
+    """
+    frames = []
+    for idx, image_batch in enumerate(images):
+        try:
+            image = image_batch if image_batch.dim() == 4 else image_batch.unsqueeze(0)
+            rgb_tensor = image.expand(-1, -1, -1, 3) if image.shape[-1] == 1 else image[..., :3]
+            rgb = torch.clamp(255. * rgb_tensor, 0, 255).to(torch.uint8).cpu().numpy()
+            batch, height, width = rgb.shape[:3]
+            
+            rgba = np.empty((batch, height, width, 4), dtype=np.uint8)
+            rgba[..., :3] = rgb
+            
+            mask = masks[idx] if masks is not None and idx < len(masks) else None
+            mask_matches = True
+            if mask is None:
+                rgba[..., 3] = 255
+            else:
+                mask = mask.reshape(-1, mask.shape[-2], mask.shape[-1])
+                # 遮罩数量与帧数不一致时，使用第一张遮罩
+                if mask.shape[0] != batch:
+                    mask = mask[:1]
+                alpha = torch.clamp(255. * (1 - mask), 0, 255).to(torch.uint8).cpu().numpy()
+                if alpha.shape[1:] != (height, width):
+                    # 确保 mask 尺寸与图像匹配
+                    mask_matches = False
+                    alpha = np.stack([
+                        np.array(Image.fromarray(a).resize((width, height), Image.Resampling.LANCZOS))
+                        for a in alpha
+                    ])
+                rgba[..., 3] = alpha
+            
+            if not with_tensors:
+                frames.extend(rgba[i] for i in range(batch))
+                continue
+            
+            rgb_tensor = rgb_tensor.cpu()
+            for i in range(batch):
+                if mask is None:
+                    frame_mask = torch.zeros((1, height, width), dtype=torch.float32)
+                elif mask_matches:
+                    frame_mask = mask[i:i + 1] if mask.shape[0] == batch else mask[:1]
+                    frame_mask = frame_mask.cpu()
+                else:
+                    frame_mask = None
+                frames.append((rgba[i], rgb_tensor[i:i + 1], frame_mask))
+        except Exception as e:
+            print(f"{log_prefix} 处理图像 {idx+1} 时出错: {str(e)}")
+            import traceback
+            traceback.print_exc()
+            continue
+    return frames
+
+# 结果图像支持的输出格式及对应扩展名（npy 为未压缩的 uint8 RGBA 数组，写入最快）
+IMAGE_FORMAT_EXTENSIONS = {"png": ".png", "webp_lossless": ".webp", "npy": ".npy"}
+
+def _write_image_frame(rgba, file_path, compress_level, image_format="png"):
+    """按格式保存单帧 RGBA（compress_level 为 0-9，WebP 无损时换算为压缩力度）"""
+    if image_format == "npy":
+        with open(file_path, 'wb') as f:
+            np.save(f, rgba)
+    elif image_format == "webp_lossless":
+        Image.fromarray(rgba).save(file_path, format="WEBP", lossless=True,
+                                   quality=round(compress_level * 100 / 9), method=min(6, compress_level * 6 // 9))
+    else:
+        Image.fromarray(rgba).save(file_path, compress_level=compress_level)
+
+def _encode_image_frames(jobs, compress_level, log_prefix="[ImageSender]", image_format="png", callback=None):
+    """在线程池中并行保存 RGBA 帧
+    
+    Args:
+        jobs: [(rgba 数组, 文件路径, jpeg 预览路径或 None)]
+        compress_level: 压缩级别（0-9）
+        image_format: 输出格式，见 IMAGE_FORMAT_EXTENSIONS
+        callback: 为 None 时等待全部保存完成再返回；否则提交后立即返回，
+            全部完成后在编码线程中调用 callback(saved)
+    
+    Returns:
+        list: 每项是否保存成功（异步模式下返回 None）
+    """
+    def encode(job):
+        rgba, file_path, preview_path = job
+        _write_image_frame(rgba, file_path, compress_level, image_format)
+        if preview_path:
+            Image.fromarray(np.ascontiguousarray(rgba[..., :3])).save(preview_path, format="JPEG", quality=95)
+    
+    def collect(futures):
+        saved = []
+        for i, job in enumerate(jobs):
+            try:
+                if futures is None:
+                    encode(job)
+                else:
+                    futures[i].result()
+                saved.append(True)
+            except Exception as e:
+                print(f"{log_prefix} 保存图像文件失败 ({job[1]}): {str(e)}")
+                saved.append(False)
+        return saved
+    
+    if callback is None and len(jobs) <= 1:
+        return collect(None)
+    
+    executor = _get_encode_executor()
+    futures = [executor.submit(encode, job) for job in jobs]
+    if callback is None:
+        return collect(futures)
+    
+    # 异步模式：最后一个完成的任务负责汇总结果并回调
+    remaining = [len(futures)]
+    remaining_lock = threading.Lock()
+    
+    def on_done(_future):
+        with remaining_lock:
+            remaining[0] -= 1
+            if remaining[0] > 0:
+                return
+        try:
+            callback(collect(futures))
+        except Exception as e:
+            print(f"{log_prefix} 编码完成回调失败: {str(e)}")
+    
+    if not futures:
+        callback([])
+        return None
+    for future in futures:
+        future.add_done_callback(on_done)
+    return None
+
+# 进程内张量交接的内存上限（字节），超出后按最近最少使用淘汰
+TENSOR_HANDOFF_BUDGET = 2 * 1024 ** 3
+
+class TensorHandoffRegistry:
+    """进程内图像张量交接
+    
+    发送端与接收端在同一 ComfyUI 进程中时，发送端把原始 IMAGE/MASK 张量（零拷贝视图）按
+    (类型, 文件名) 登记在这里，接收端直接取用，无需再解码 PNG。每个 link_id 有独立的代数，
+    非累积模式下新的一代会替换该 link 的旧条目；总大小超过 TENSOR_HANDOFF_BUDGET 时按 LRU 淘汰。
+    PNG 文件仍会写出，供界面预览、遮罩编辑和跨进程读取使用；登记时记录文件的 mtime/size，
+    文件被修改后条目自动失效。
+    """
+    
+    def __init__(self, budget=TENSOR_HANDOFF_BUDGET):
+        self.budget = budget
+        self.lock = threading.Lock()
+        self._entries = OrderedDict()  # (type, filename) -> entry
+        self._generations = {}         # link_id -> 当前代数
+        self._bytes = 0
+    
+    @staticmethod
+    def _tensor_bytes(tensor):
+        return tensor.element_size() * tensor.nelement() if tensor is not None else 0
+    
+    def _remove(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry["bytes"]
+    
+    def publish(self, link_id, file_type, items, replace=True):
+        """登记一批帧
+        
+        Args:
+            link_id: 发送端连接ID
+            file_type: 文件所在目录类型（"temp" / "input"）
+            items: [(文件名, 文件路径, image [1,H,W,3], mask [1,H,W])]，mask 为 None 的帧不登记
+            replace: 为 True 时移除该 link 之前各代的条目（累积模式下传 False）
+        
+        Returns:
+            int: 本次登记的代数
+        """
+        with self.lock:
+            generation = self._generations.get(link_id, 0) + 1
+            self._generations[link_id] = generation
+            if replace:
+                for key in [k for k, e in self._entries.items() if e["link_id"] == link_id]:
+                    self._remove(key)
+            
+            for filename, file_path, image, mask in items:
+                if mask is None:
+                    continue
+                try:
+                    stat = os.stat(file_path)
+                except OSError:
+                    continue
+                key = (file_type, filename)
+                self._remove(key)
+                size = self._tensor_bytes(image) + self._tensor_bytes(mask)
+                self._entries[key] = {
+                    "link_id": link_id,
+                    "generation": generation,
+                    "image": image,
+                    "mask": mask,
+                    "file_path": file_path,
+                    "signature": (stat.st_mtime_ns, stat.st_size),
+                    "bytes": size,
+                }
+                self._bytes += size
+            
+            while self._bytes > self.budget and self._entries:
+                self._remove(next(iter(self._entries)))
+            return generation
+    
+    def get(self, file_type, filename, link_id=None):
+        """取出登记的 (image, mask)，不存在、link_id 不一致或文件已被修改时返回 None"""
+        key = (file_type, filename)
+        with self.lock:
+            entry = self._entries.get(key)
+            if entry is None or (link_id is not None and entry["link_id"] != link_id):
+                return None
+            file_path = entry["file_path"]
+            signature = entry["signature"]
+        
+        try:
+            stat = os.stat(file_path)
+            if (stat.st_mtime_ns, stat.st_size) != signature:
+                raise OSError("文件已变化")
+        except OSError:
+            with self.lock:
+                if self._entries.get(key) is entry:
+                    self._remove(key)
+            return None
+        
+        with self.lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+        return entry["image"], entry["mask"]
+    
+    def get_generation(self, link_id):
+        with self.lock:
+            return self._generations.get(link_id, 0)
+
+_tensor_handoff = TensorHandoffRegistry()
+
+# 已解码结果缓存的内存上限（字节），超出后按最近最少使用淘汰
+DECODED_IMAGE_CACHE_BUDGET = 1024 ** 3
+
+class DecodedImageCache:
+    """已解码图像的 LRU 缓存
+    
+    键由调用方给出（需包含文件内容或签名，保证文件变化后不会命中），值为 (image, mask) 张量。
+    总大小超过 budget 时按 LRU 淘汰，并统计命中、未命中和淘汰次数。
+    """
+    
+    def __init__(self, budget=DECODED_IMAGE_CACHE_BUDGET):
+        self.budget = budget
+        self.lock = threading.Lock()
+        self._entries = OrderedDict()  # key -> (image, mask, bytes)
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    @staticmethod
+    def _tensor_bytes(tensor):
+        return tensor.element_size() * tensor.nelement() if tensor is not None else 0
+    
+    def get(self, key):
+        """取出缓存的 (image, mask)，不存在时返回 None"""
+        with self.lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0], entry[1]
+    
+    def put(self, key, image, mask):
+        size = self._tensor_bytes(image) + self._tensor_bytes(mask)
+        if size > self.budget:
+            return
+        with self.lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old[2]
+            self._entries[key] = (image, mask, size)
+            self._bytes += size
+            self._evict_locked()
+    
+    def _evict_locked(self):
+        while self._bytes > self.budget and self._entries:
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= evicted[2]
+            self.evictions += 1
+    
+    def set_budget(self, budget):
+        """调整内存上限，缩小时立即淘汰超出部分"""
+        with self.lock:
+            self.budget = max(0, int(budget))
+            self._evict_locked()
+    
+    def clear(self):
+        with self.lock:
+            self._entries.clear()
+            self._bytes = 0
+    
+    def stats(self):
+        with self.lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "budget": self.budget,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+def _select_frame_indices(n_frames, frame_start=0, frame_count=0, frame_stride=1):
+    """按起始帧 / 帧数（0 表示全部）/ 步长选取要解码的源帧序号"""
+    indices = range(max(0, frame_start), n_frames, max(1, frame_stride))
+    if frame_count and frame_count > 0:
+        indices = indices[:frame_count]
+    return list(indices)
+
+def _decode_image_frames(img_path, frame_start=0, frame_count=0, frame_stride=1):
+    """流式解码图像文件（支持 GIF、APNG 等多帧格式）
+    
+    先探测帧数和首帧尺寸，预分配连续的 [N,H,W,3] 图像张量和 [N,H,W] 遮罩张量，逐帧原地填充，
+    不再为每帧单独分配再 torch.cat；只解码选中的帧。尺寸与首帧不一致的帧会被跳过。
+    
+    Returns:
+        (image, mask, frame_indices) 或 None（没有有效帧）；frame_indices 为实际填充的源帧序号
+    """
+    img = node_helpers.pillow(Image.open, img_path)
+    # MPO 格式只取第一帧
+    n_frames = 1 if img.format == "MPO" else getattr(img, "n_frames", 1)
+    indices = _select_frame_indices(n_frames, frame_start, frame_count, frame_stride)
+    
+    images = masks = None
+    w = h = None
+    filled = []
+    for index in indices:
+        img.seek(index)
+        frame = node_helpers.pillow(ImageOps.exif_transpose, img)
+        if frame.mode == 'I':
+            frame = frame.point(lambda i: i * (1 / 255))
+        rgb_image = frame.convert("RGB")
+        
+        if images is None:
+            w, h = rgb_image.size
+            images = torch.empty((len(indices), h, w, 3), dtype=torch.float32)
+            masks = torch.empty((len(indices), h, w), dtype=torch.float32)
+            images_np = images.numpy()
+            masks_np = masks.numpy()
+        elif rgb_image.size != (w, h):
+            continue
+        
+        k = len(filled)
+        np.divide(np.asarray(rgb_image), np.float32(255.0), out=images_np[k])
+        
+        # 处理遮罩
+        if 'A' in frame.getbands():
+            alpha = np.asarray(frame.getchannel('A'))
+        elif frame.mode == 'P' and 'transparency' in frame.info:
+            alpha = np.asarray(frame.convert('RGBA').getchannel('A'))
+        else:
+            alpha = None
+        if alpha is None:
+            masks_np[k] = 0.0
+        else:
+            np.divide(alpha, np.float32(255.0), out=masks_np[k])
+            np.subtract(np.float32(1.0), masks_np[k], out=masks_np[k])
+        filled.append(index)
+    
+    if not filled:
+        return None
+    return images[:len(filled)], masks[:len(filled)], filled
+
+def _apply_mask_override(masks, mask_file_path, frame_indices=None):
+    """用遮罩文件覆盖已解码的遮罩（原地写入 [N,H,W]）
+    
+    遮罩文件只有一帧时应用到所有帧；多帧时按源帧序号与图像帧对应，只解码用得到的帧。
+    """
+    n, h, w = masks.shape
+    mask_img = node_helpers.pillow(Image.open, mask_file_path)
+    n_mask_frames = 1 if mask_img.format == "MPO" else getattr(mask_img, "n_frames", 1)
+    if n_mask_frames == 1:
+        targets = [(0, slice(None))]
+    else:
+        sources = frame_indices if frame_indices is not None else range(n)
+        targets = [(src, k) for k, src in enumerate(sources) if src < n_mask_frames]
+    
+    masks_np = masks.numpy()
+    for src, target in targets:
+        mask_img.seek(src)
+        mask_frame = node_helpers.pillow(ImageOps.exif_transpose, mask_img)
+        
+        # 提取遮罩通道
+        if mask_frame.mode == 'RGBA':
+            channel = mask_frame.getchannel('A')
+        elif mask_frame.mode == 'L':
+            channel = mask_frame
+        elif mask_frame.mode == 'P' and 'transparency' in mask_frame.info:
+            channel = mask_frame.convert('RGBA').getchannel('A')
+        else:
+            channel = mask_frame.convert('L')
+        
+        # 调整遮罩大小以匹配图像
+        if channel.size != (w, h):
+            channel = channel.resize((w, h), Image.LANCZOS)
+        
+        # 反转遮罩（ComfyUI中白色=透明区域）
+        np.subtract(np.float32(1.0), np.asarray(channel, dtype=np.float32) / np.float32(255.0), out=masks_np[target])
+
+def _decoded_cache_key(img_path, mask_file_path=None):
+    """本地图像的缓存键：(解析后路径, mtime, size, 遮罩路径, 遮罩 mtime, 遮罩 size)，文件不存在时返回 None"""
+    try:
+        stat = os.stat(img_path)
+    except OSError:
+        return None
+    mask_signature = (None, None)
+    if mask_file_path:
+        try:
+            mask_stat = os.stat(mask_file_path)
+            mask_signature = (mask_stat.st_mtime_ns, mask_stat.st_size)
+        except OSError:
+            pass
+    return (img_path, stat.st_mtime_ns, stat.st_size, mask_file_path) + mask_signature
+
+# 本地图像（input/temp）的已解码缓存，供 LG_ImageReceiverPlus 在重复执行时复用
+_decoded_image_cache = DecodedImageCache()
+
 class LG_ImageSender:
     def __init__(self):
         self.output_dir = folder_paths.get_temp_directory()
@@ -78,79 +563,57 @@ class LG_ImageSender:
         accumulate = accumulate[0] if isinstance(accumulate, list) else accumulate
         preview_rgba = preview_rgba[0] if isinstance(preview_rgba, list) else preview_rgba
         
-        for idx, image_batch in enumerate(images):
-            try:
-                image = image_batch.squeeze()
-                rgb_image = Image.fromarray(np.clip(255. * image.cpu().numpy(), 0, 255).astype(np.uint8))
-
-                if masks is not None and idx < len(masks):
-                    mask = masks[idx].squeeze()
-                    mask_array = np.clip(255. * (1 - mask.cpu().numpy()), 0, 255).astype(np.uint8)
-                    mask_img = Image.fromarray(mask_array, mode='L')
-                    
-                    # 确保 mask 尺寸与 rgb_image 匹配
-                    if mask_img.size != rgb_image.size:
-                        mask_img = mask_img.resize(rgb_image.size, Image.Resampling.LANCZOS)
-                else:
-                    mask_img = Image.new('L', rgb_image.size, 255)
-
-                # 确保 mask_img 是 'L' 模式
-                if mask_img.mode != 'L':
-                    mask_img = mask_img.convert('L')
-
-                r, g, b = rgb_image.convert('RGB').split()
-                rgba_image = Image.merge('RGBA', (r, g, b, mask_img))
-
-                # 保存RGBA格式，这是实际要发送的文件
-                filename = f"{filename_prefix}_{link_id}_{timestamp}_{idx}.png"
-                file_path = os.path.join(self.output_dir, filename)
-                rgba_image.save(file_path, compress_level=self.compress_level)
-                
-                # 准备要发送的数据项
-                original_result = {
-                    "filename": filename,
+        # 整批转换为 RGBA 帧，再交给线程池并行编码
+        frames = _images_to_rgba_frames(images, masks, "[ImageSender]", with_tensors=True)
+        
+        jobs = []
+        handoff_items = []
+        for idx, (rgba, image_tensor, mask_tensor) in enumerate(frames):
+            # 保存RGBA格式，这是实际要发送的文件
+            filename = f"{filename_prefix}_{link_id}_{timestamp}_{idx}.png"
+            file_path = os.path.join(self.output_dir, filename)
+            # 如果是要显示RGB预览
+            preview_filename = None if preview_rgba else f"{filename_prefix}_{link_id}_{timestamp}_{idx}_preview.jpg"
+            preview_path = os.path.join(self.output_dir, preview_filename) if preview_filename else None
+            jobs.append((rgba, file_path, preview_path))
+            handoff_items.append((filename, file_path, image_tensor, mask_tensor))
+        
+        send_results = []
+        saved_items = []
+        for (rgba, file_path, preview_path), item, saved in zip(jobs, handoff_items, _encode_image_frames(jobs, self.compress_level, "[ImageSender]")):
+            if not saved:
+                continue
+            saved_items.append(item)
+            
+            # 准备要发送的数据项
+            original_result = {
+                "filename": os.path.basename(file_path),
+                "subfolder": "",
+                "type": self.type
+            }
+            send_results.append(original_result)
+            
+            if preview_path:
+                # 将预览图添加到UI显示结果中
+                results.append({
+                    "filename": os.path.basename(preview_path),
                     "subfolder": "",
                     "type": self.type
-                }
-                
-                # 如果是要显示RGB预览
-                if not preview_rgba:
-                    preview_filename = f"{filename_prefix}_{link_id}_{timestamp}_{idx}_preview.jpg"
-                    preview_path = os.path.join(self.output_dir, preview_filename)
-                    rgb_image.save(preview_path, format="JPEG", quality=95)
-                    # 将预览图添加到UI显示结果中
-                    results.append({
-                        "filename": preview_filename,
-                        "subfolder": "",
-                        "type": self.type
-                    })
-                else:
-                    # 显示RGBA
-                    results.append(original_result)
+                })
+            else:
+                # 显示RGBA
+                results.append(original_result)
 
-                # 累积的始终是原始图像结果
-                if accumulate:
-                    self.accumulated_results.append(original_result)
+            # 累积的始终是原始图像结果
+            if accumulate:
+                self.accumulated_results.append(original_result)
 
-            except Exception as e:
-                print(f"[ImageSender] 处理图像 {idx+1} 时出错: {str(e)}")
-                import traceback
-                traceback.print_exc()
-                continue
+        # 登记原始张量，同进程的接收端可直接取用而无需解码 PNG
+        _tensor_handoff.publish(link_id, self.type, saved_items, replace=not accumulate)
 
         # 获取实际要发送的结果
         if accumulate:
             send_results = self.accumulated_results
-        else:
-            # 创建一个包含原始文件名的列表用于发送
-            send_results = []
-            for idx in range(len(results)):
-                original_filename = f"{filename_prefix}_{link_id}_{timestamp}_{idx}.png"
-                send_results.append({
-                    "filename": original_filename,
-                    "subfolder": "",
-                    "type": self.type
-                })
         
         if send_results:
             print(f"[ImageSender] 发送 {len(send_results)} 张图像")
@@ -218,79 +681,57 @@ class LG_ImageSenderPlus:
         accumulate = accumulate[0] if isinstance(accumulate, list) else accumulate
         preview_rgba = preview_rgba[0] if isinstance(preview_rgba, list) else preview_rgba
         
-        for idx, image_batch in enumerate(images):
-            try:
-                image = image_batch.squeeze()
-                rgb_image = Image.fromarray(np.clip(255. * image.cpu().numpy(), 0, 255).astype(np.uint8))
-
-                if masks is not None and idx < len(masks):
-                    mask = masks[idx].squeeze()
-                    mask_array = np.clip(255. * (1 - mask.cpu().numpy()), 0, 255).astype(np.uint8)
-                    mask_img = Image.fromarray(mask_array, mode='L')
-                    
-                    # 确保 mask 尺寸与 rgb_image 匹配
-                    if mask_img.size != rgb_image.size:
-                        mask_img = mask_img.resize(rgb_image.size, Image.Resampling.LANCZOS)
-                else:
-                    mask_img = Image.new('L', rgb_image.size, 255)
-
-                # 确保 mask_img 是 'L' 模式
-                if mask_img.mode != 'L':
-                    mask_img = mask_img.convert('L')
-
-                r, g, b = rgb_image.convert('RGB').split()
-                rgba_image = Image.merge('RGBA', (r, g, b, mask_img))
-
-                # 保存RGBA格式到 input 目录，这是实际要发送的文件
-                filename = f"{filename_prefix}_{link_id}_{timestamp}_{idx}.png"
-                file_path = os.path.join(self.output_dir, filename)
-                rgba_image.save(file_path, compress_level=self.compress_level)
-                
-                # 准备要发送的数据项
-                original_result = {
-                    "filename": filename,
+        # 整批转换为 RGBA 帧，再交给线程池并行编码
+        frames = _images_to_rgba_frames(images, masks, "[ImageSenderPlus]", with_tensors=True)
+        
+        jobs = []
+        handoff_items = []
+        for idx, (rgba, image_tensor, mask_tensor) in enumerate(frames):
+            # 保存RGBA格式到 input 目录，这是实际要发送的文件
+            filename = f"{filename_prefix}_{link_id}_{timestamp}_{idx}.png"
+            file_path = os.path.join(self.output_dir, filename)
+            # 如果是要显示RGB预览
+            preview_filename = None if preview_rgba else f"{filename_prefix}_{link_id}_{timestamp}_{idx}_preview.jpg"
+            preview_path = os.path.join(self.output_dir, preview_filename) if preview_filename else None
+            jobs.append((rgba, file_path, preview_path))
+            handoff_items.append((filename, file_path, image_tensor, mask_tensor))
+        
+        send_results = []
+        saved_items = []
+        for (rgba, file_path, preview_path), item, saved in zip(jobs, handoff_items, _encode_image_frames(jobs, self.compress_level, "[ImageSenderPlus]")):
+            if not saved:
+                continue
+            saved_items.append(item)
+            
+            # 准备要发送的数据项
+            original_result = {
+                "filename": os.path.basename(file_path),
+                "subfolder": "",
+                "type": self.type
+            }
+            send_results.append(original_result)
+            
+            if preview_path:
+                # 将预览图添加到UI显示结果中
+                results.append({
+                    "filename": os.path.basename(preview_path),
                     "subfolder": "",
                     "type": self.type
-                }
-                
-                # 如果是要显示RGB预览
-                if not preview_rgba:
-                    preview_filename = f"{filename_prefix}_{link_id}_{timestamp}_{idx}_preview.jpg"
-                    preview_path = os.path.join(self.output_dir, preview_filename)
-                    rgb_image.save(preview_path, format="JPEG", quality=95)
-                    # 将预览图添加到UI显示结果中
-                    results.append({
-                        "filename": preview_filename,
-                        "subfolder": "",
-                        "type": self.type
-                    })
-                else:
-                    # 显示RGBA
-                    results.append(original_result)
+                })
+            else:
+                # 显示RGBA
+                results.append(original_result)
 
-                # 累积的始终是原始图像结果
-                if accumulate:
-                    self.accumulated_results.append(original_result)
+            # 累积的始终是原始图像结果
+            if accumulate:
+                self.accumulated_results.append(original_result)
 
-            except Exception as e:
-                print(f"[ImageSenderPlus] 处理图像 {idx+1} 时出错: {str(e)}")
-                import traceback
-                traceback.print_exc()
-                continue
+        # 登记原始张量，同进程的接收端可直接取用而无需解码 PNG
+        _tensor_handoff.publish(link_id, self.type, saved_items, replace=not accumulate)
 
         # 获取实际要发送的结果
         if accumulate:
             send_results = self.accumulated_results
-        else:
-            # 创建一个包含原始文件名的列表用于发送
-            send_results = []
-            for idx in range(len(results)):
-                original_filename = f"{filename_prefix}_{link_id}_{timestamp}_{idx}.png"
-                send_results.append({
-                    "filename": original_filename,
-                    "subfolder": "",
-                    "type": self.type
-                })
         
         if send_results:
             print(f"[ImageSenderPlus] 发送 {len(send_results)} 张图像到 input 目录")
@@ -312,6 +753,9 @@ class LG_ImageReceiver:
             "required": {
                 "image": ("STRING", {"default": "", "multiline": False, "tooltip": "多个文件名用逗号分隔"}),
                 "link_id": ("INT", {"default": 1, "min": 0, "max": sys.maxsize, "step": 1, "tooltip": "发送端连接ID"}),
+            },
+            "optional": {
+                "decode_workers": ("INT", {"default": 0, "min": 0, "max": 64, "step": 1, "tooltip": "并行解码的线程数，0 表示自动"}),
             }
         }
 
@@ -322,7 +766,7 @@ class LG_ImageReceiver:
     OUTPUT_IS_LIST = (True, True)
     FUNCTION = "load_image"
 
-    def load_image(self, image, link_id):
+    def load_image(self, image, link_id, decode_workers=0):
         image_files = [x.strip() for x in image.split(',') if x.strip()]
         print(f"[ImageReceiver] 加载图像: {image_files}")
         
@@ -337,13 +781,18 @@ class LG_ImageReceiver:
         try:
             temp_dir = folder_paths.get_temp_directory()
             
-            for img_file in image_files:
+            def decode_file(img_file):
                 try:
                     img_path = os.path.join(temp_dir, img_file)
                     
                     if not os.path.exists(img_path):
                         print(f"[ImageReceiver] 文件不存在: {img_path}")
-                        continue
+                        return None
+                    
+                    # 同进程发送端登记过原始张量时直接取用，跳过 PNG 解码
+                    handoff = _tensor_handoff.get("temp", img_file, link_id)
+                    if handoff is not None:
+                        return handoff
                     
                     img = Image.open(img_path)
                     
@@ -360,14 +809,19 @@ class LG_ImageReceiver:
                         image = torch.from_numpy(image)[None,]
                         mask = torch.zeros((1, image.shape[1], image.shape[2]), dtype=torch.float32, device="cpu")
                     
-                    output_images.append(image)
-                    output_masks.append(mask)
+                    return image, mask
                     
                 except Exception as e:
                     print(f"[ImageReceiver] 处理文件 {img_file} 时出错: {str(e)}")
                     import traceback
                     traceback.print_exc()
-                    continue
+                    return None
+            
+            # 多个文件并行解码，结果保持原始顺序
+            for result in _decode_files_parallel(decode_file, image_files, decode_workers):
+                if result is not None:
+                    output_images.append(result[0])
+                    output_masks.append(result[1])
             
             return (output_images, output_masks)
 
@@ -389,6 +843,9 @@ class LG_ImageReceiverPlus:
             },
             "optional": {
                 "mask_file": ("STRING", {"default": "", "multiline": False, "tooltip": "可选的遮罩文件名，用于加载已编辑的遮罩"}),
+                "frame_start": ("INT", {"default": 0, "min": 0, "max": 100000, "step": 1, "tooltip": "多帧图像（GIF/APNG等）从第几帧开始读取"}),
+                "frame_count": ("INT", {"default": 0, "min": 0, "max": 100000, "step": 1, "tooltip": "最多读取的帧数，0 表示全部"}),
+                "frame_stride": ("INT", {"default": 1, "min": 1, "max": 1000, "step": 1, "tooltip": "帧步长，跳过的帧不会被解码"}),
                 "signal": (any_typ, {"tooltip": "信号输入，将在处理完成后原样输出"}),
             },
             "hidden": {"unique_id": "UNIQUE_ID"},
@@ -401,7 +858,7 @@ class LG_ImageReceiverPlus:
     FUNCTION = "load_image"
     INPUT_IS_LIST = False
 
-    def load_image(self, image, link_id, mask_file="", signal=None, unique_id=None):
+    def load_image(self, image, link_id, mask_file="", frame_start=0, frame_count=0, frame_stride=1, signal=None, unique_id=None):
         output_images = []
         output_masks = []
         
@@ -422,6 +879,18 @@ class LG_ImageReceiverPlus:
                 # 没有标识符，返回原路径
                 return file_str, None
         
+        def resolve_path(file_str):
+            """按 [input]/[temp] 标识符确定加载路径，未指定时先尝试 temp，再尝试 input"""
+            file_path, file_type = parse_file_path(file_str)
+            if file_type == 'input':
+                return file_path, file_type, os.path.normpath(os.path.join(input_dir, file_path))
+            if file_type == 'temp':
+                return file_path, file_type, os.path.normpath(os.path.join(temp_dir, file_path))
+            resolved = os.path.normpath(os.path.join(temp_dir, file_path))
+            if not os.path.exists(resolved):
+                resolved = os.path.normpath(os.path.join(input_dir, file_path))
+            return file_path, file_type, resolved
+        
         # 解析图像文件名（支持逗号分隔的多个文件）
         if isinstance(image, str):
             image_files = [x.strip() for x in image.split(',') if x.strip()]
@@ -448,149 +917,53 @@ class LG_ImageReceiverPlus:
         try:
             for idx, img_file in enumerate(image_files):
                 try:
-                    # 解析文件路径和类型
-                    file_path, file_type = parse_file_path(img_file)
-                    
-                    # 根据文件类型或默认行为确定加载路径
-                    if file_type == 'input':
-                        # 明确指定从 input 目录加载
-                        img_path = os.path.join(input_dir, file_path)
-                        img_path = os.path.normpath(img_path)
-                    elif file_type == 'temp':
-                        # 明确指定从 temp 目录加载
-                        img_path = os.path.join(temp_dir, file_path)
-                        img_path = os.path.normpath(img_path)
-                    else:
-                        # 默认行为：先尝试 temp，再尝试 input
-                        img_path = os.path.join(temp_dir, file_path)
-                        img_path = os.path.normpath(img_path)
-                        if not os.path.exists(img_path):
-                            img_path = os.path.join(input_dir, file_path)
-                            img_path = os.path.normpath(img_path)
+                    # 解析文件路径和类型，确定加载路径
+                    file_path, file_type, img_path = resolve_path(img_file)
                     
                     if not os.path.exists(img_path):
                         print(f"[ImageReceiverPlus] 文件不存在: {img_path}")
                         continue
                     
-                    img = node_helpers.pillow(Image.open, img_path)
+                    # 同进程发送端登记过原始张量（单帧）、没有指定遮罩文件且从首帧读取时直接取用，跳过 PNG 解码
+                    if not (mask_files and idx < len(mask_files)) and frame_start == 0:
+                        loaded_type = file_type or ('temp' if img_path == os.path.normpath(os.path.join(temp_dir, file_path)) else 'input')
+                        handoff = _tensor_handoff.get(loaded_type, file_path, link_id)
+                        if handoff is not None:
+                            output_images.append(handoff[0])
+                            output_masks.append(handoff[1])
+                            continue
                     
-                    w, h = None, None
-                    frame_images = []
-                    frame_masks = []
+                    mask_file_path = None
+                    if mask_files and idx < len(mask_files):
+                        mask_file_path = resolve_path(mask_files[idx])[2]
                     
-                    # 处理图像序列（如 GIF、多帧 PNG 等）
-                    for i in ImageSequence.Iterator(img):
-                        i = node_helpers.pillow(ImageOps.exif_transpose, i)
-                        
-                        if i.mode == 'I':
-                            i = i.point(lambda i: i * (1 / 255))
-                        rgb_image = i.convert("RGB")
-                        
-                        if len(frame_images) == 0:
-                            w = rgb_image.size[0]
-                            h = rgb_image.size[1]
-                        
-                        if rgb_image.size[0] != w or rgb_image.size[1] != h:
+                    # 文件与遮罩均未变化时直接复用已解码的张量
+                    cache_key = _decoded_cache_key(img_path, mask_file_path)
+                    if cache_key is not None:
+                        cache_key += (frame_start, frame_count, frame_stride)
+                        cached = _decoded_image_cache.get(cache_key)
+                        if cached is not None:
+                            output_images.append(cached[0])
+                            output_masks.append(cached[1])
                             continue
-                        
-                        image_tensor = np.array(rgb_image).astype(np.float32) / 255.0
-                        image_tensor = torch.from_numpy(image_tensor)[None,]
-                        
-                        # 处理遮罩
-                        if 'A' in i.getbands():
-                            mask = np.array(i.getchannel('A')).astype(np.float32) / 255.0
-                            mask = 1. - torch.from_numpy(mask)
-                        elif i.mode == 'P' and 'transparency' in i.info:
-                            mask = np.array(i.convert('RGBA').getchannel('A')).astype(np.float32) / 255.0
-                            mask = 1. - torch.from_numpy(mask)
-                        else:
-                            mask = torch.zeros((rgb_image.size[1], rgb_image.size[0]), dtype=torch.float32, device="cpu")
-                        
-                        frame_images.append(image_tensor)
-                        frame_masks.append(mask.unsqueeze(0))
-                        
-                        if img.format == "MPO":
-                            break  # ignore all frames except the first one for MPO format
                     
-                    # 如果提供了遮罩文件，尝试加载它（覆盖alpha通道）
-                    if mask_files and idx < len(mask_files) and w is not None and h is not None:
-                        # 解析遮罩文件路径和类型
-                        mask_file_path_str, mask_file_type = parse_file_path(mask_files[idx])
-                        
-                        # 根据文件类型或默认行为确定加载路径
-                        if mask_file_type == 'input':
-                            # 明确指定从 input 目录加载
-                            mask_file_path = os.path.join(input_dir, mask_file_path_str)
-                            mask_file_path = os.path.normpath(mask_file_path)
-                        elif mask_file_type == 'temp':
-                            # 明确指定从 temp 目录加载
-                            mask_file_path = os.path.join(temp_dir, mask_file_path_str)
-                            mask_file_path = os.path.normpath(mask_file_path)
-                        else:
-                            # 默认行为：先尝试 temp，再尝试 input
-                            mask_file_path = os.path.join(temp_dir, mask_file_path_str)
-                            mask_file_path = os.path.normpath(mask_file_path)
-                            if not os.path.exists(mask_file_path):
-                                mask_file_path = os.path.join(input_dir, mask_file_path_str)
-                                mask_file_path = os.path.normpath(mask_file_path)
+                    decoded = _decode_image_frames(img_path, frame_start, frame_count, frame_stride)
+                    
+                    if decoded is not None:
+                        output_image, output_mask, frame_indices = decoded
                         
-                        if os.path.exists(mask_file_path):
+                        # 如果提供了遮罩文件，尝试加载它（覆盖alpha通道）
+                        if mask_file_path is not None and os.path.exists(mask_file_path):
                             try:
-                                mask_img = node_helpers.pillow(Image.open, mask_file_path)
-                                
-                                # 处理遮罩文件（可能是单帧或多帧）
-                                mask_frames = []
-                                for mask_frame in ImageSequence.Iterator(mask_img):
-                                    mask_frame = node_helpers.pillow(ImageOps.exif_transpose, mask_frame)
-                                    
-                                    # 提取遮罩通道
-                                    if mask_frame.mode == 'RGBA':
-                                        mask_array = np.array(mask_frame.getchannel('A')).astype(np.float32) / 255.0
-                                    elif mask_frame.mode == 'L':
-                                        mask_array = np.array(mask_frame).astype(np.float32) / 255.0
-                                    elif mask_frame.mode == 'P' and 'transparency' in mask_frame.info:
-                                        mask_array = np.array(mask_frame.convert('RGBA').getchannel('A')).astype(np.float32) / 255.0
-                                    else:
-                                        mask_array = np.array(mask_frame.convert('L')).astype(np.float32) / 255.0
-                                    
-                                    # 调整遮罩大小以匹配图像
-                                    if mask_array.shape[0] != h or mask_array.shape[1] != w:
-                                        mask_pil = Image.fromarray((mask_array * 255).astype(np.uint8))
-                                        mask_pil = mask_pil.resize((w, h), Image.LANCZOS)
-                                        mask_array = np.array(mask_pil).astype(np.float32) / 255.0
-                                    
-                                    mask_tensor = torch.from_numpy(mask_array)
-                                    mask_tensor = 1.0 - mask_tensor  # 反转遮罩（ComfyUI中白色=透明区域）
-                                    mask_frames.append(mask_tensor.unsqueeze(0))
-                                    
-                                    if mask_img.format == "MPO":
-                                        break
-                                
-                                # 如果遮罩文件有多个帧，使用第一个；否则使用第一个遮罩
-                                if mask_frames:
-                                    # 更新所有帧的遮罩（如果遮罩文件只有一帧，则应用到所有图像帧）
-                                    if len(mask_frames) == 1:
-                                        # 单个遮罩应用到所有帧
-                                        for frame_idx in range(len(frame_masks)):
-                                            frame_masks[frame_idx] = mask_frames[0]
-                                    else:
-                                        # 多帧遮罩，按帧对应
-                                        for frame_idx in range(min(len(frame_masks), len(mask_frames))):
-                                            frame_masks[frame_idx] = mask_frames[frame_idx]
-                                
+                                _apply_mask_override(output_mask, mask_file_path, frame_indices)
                                 print(f"[ImageReceiverPlus] 已加载遮罩文件: {mask_files[idx]}")
                             except Exception as e:
                                 print(f"[ImageReceiverPlus] 加载遮罩文件失败: {str(e)}")
                                 import traceback
                                 traceback.print_exc()
-                    
-                    # 合并多帧图像
-                    if len(frame_images) > 1:
-                        output_image = torch.cat(frame_images, dim=0)
-                        output_mask = torch.cat(frame_masks, dim=0)
-                    elif len(frame_images) == 1:
-                        output_image = frame_images[0]
-                        output_mask = frame_masks[0]
+                        
+                        if cache_key is not None:
+                            _decoded_image_cache.put(cache_key, output_image, output_mask)
                     else:
                         # 如果没有有效帧，创建空图像和遮罩
                         output_image = torch.zeros((1, 64, 64, 3), dtype=torch.float32)
@@ -619,9 +992,9 @@ class LG_ImageReceiverPlus:
             return ([], [], signal)
     
     @classmethod
-    def IS_CHANGED(s, image, link_id, mask_file="", unique_id=None):
+    def IS_CHANGED(s, image, link_id, mask_file="", frame_start=0, frame_count=0, frame_stride=1, unique_id=None):
         # 计算hash以检测变化
-        hash_value = hash(str(image) + str(mask_file))
+        hash_value = hash(str(image) + str(mask_file) + str((frame_start, frame_count, frame_stride)))
         return hash_value
 
 class LG_TextSender:
@@ -1262,6 +1635,493 @@ def _get_safe_filename(name):
     safe_name = safe_name.replace(' ', '_')  # 将空格替换为下划线
     return safe_name
 
+try:
+    from .lgutils import _status_change_feed, _remote_result_fetcher, _file_checksum, REMOTE_RESULT_EXTENSIONS, REMOTE_MANIFEST_SUFFIX, REMOTE_PENDING_SUFFIX, REMOTE_PENDING_TIMEOUT
+    from .lgutils import _get_result_subdir, _get_result_manifest_path, _read_result_manifest, _status_store, _group_result_manager
+except Exception as e:
+    print(f"[RemoteResultIndex] 未接入状态变更通知和远程结果下载，读取时按需扫描本地目录: {e}")
+    _status_change_feed = None
+    _remote_result_fetcher = None
+    _group_result_manager = None
+    
+    def _file_checksum(file_path):
+        """计算文件的 sha256，文件不存在时返回 None"""
+        try:
+            digest = hashlib.sha256()
+            with open(file_path, 'rb') as f:
+                for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                    digest.update(chunk)
+            return digest.hexdigest()
+        except OSError:
+            return None
+    
+    def _get_result_subdir(results_dir, safe_group_name, link_id=None):
+        if link_id is None:
+            return os.path.join(results_dir, safe_group_name)
+        return os.path.join(results_dir, safe_group_name, str(link_id))
+    
+    def _get_result_manifest_path(results_dir, safe_group_name, link_id):
+        return os.path.join(results_dir, f"{safe_group_name}_{link_id}{REMOTE_MANIFEST_SUFFIX}")
+    
+    class _FallbackStatusStore:
+        """lgutils 不可用时的最小实现：原子写入紧凑 JSON"""
+        def write(self, path, data, wait=True):
+            temp_file = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(temp_file, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
+            os.replace(temp_file, path)
+        
+        def read(self, path):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+            except (OSError, ValueError):
+                return None
+    
+    _status_store = _FallbackStatusStore()
+    
+    def _read_result_manifest(manifest_path):
+        manifest = _status_store.read(manifest_path)
+        return manifest if isinstance(manifest, dict) else None
+    
+    REMOTE_RESULT_EXTENSIONS = ('.png', '.webp', '.npy')
+    REMOTE_MANIFEST_SUFFIX = '.manifest.json'
+    REMOTE_PENDING_SUFFIX = '.pending'
+    REMOTE_PENDING_TIMEOUT = 300.0
+
+class RemoteResultIndex:
+    """remote_results 目录的结果索引
+    
+    按 (安全组名, link_id) 记录结果清单 {group_name}_{link_id}.manifest.json，由 StatusChangeFeed 的事件维护，
+    读取结果时只读一个清单、打开其中列出的文件，无需列出目录；version 在清单变化时递增，用于 IS_CHANGED。
+    同时记录异步编码的 .pending 标记（读取前可等待编码写完），以及旧版平铺布局中尚未迁移的文件。
+    """
+    
+    def __init__(self, results_dir):
+        self.results_dir = results_dir
+        self.lock = threading.Lock()
+        self.condition = threading.Condition(self.lock)
+        self._entries = {}
+        self._manifests = {}
+        self._manifest_data = {}  # key -> ((mtime_ns, size), 清单内容)
+        self._pending = {}
+        self._versions = {}
+        self.rescan()
+    
+    @staticmethod
+    def _parse_filename(filename, extensions=REMOTE_RESULT_EXTENSIONS):
+        """解析 {group_name}_{link_id}_{index}{ext}，返回 ((安全组名, link_id), index)"""
+        if not filename.endswith(extensions):
+            return None
+        parts = os.path.splitext(filename)[0].rsplit('_', 2)
+        if len(parts) != 3:
+            return None
+        try:
+            return (parts[0], parts[1]), int(parts[2])
+        except ValueError:
+            return None
+    
+    @staticmethod
+    def _parse_manifest(filename):
+        """解析 {group_name}_{link_id}.manifest.json，返回 (安全组名, link_id)"""
+        if not filename.endswith(REMOTE_MANIFEST_SUFFIX):
+            return None
+        parts = filename[:-len(REMOTE_MANIFEST_SUFFIX)].rsplit('_', 1)
+        return (parts[0], parts[1]) if len(parts) == 2 else None
+    
+    def _add(self, filename):
+        manifest_key = self._parse_manifest(filename)
+        if manifest_key is not None:
+            self._manifests[manifest_key] = filename
+            self._versions[manifest_key] = self._versions.get(manifest_key, 0) + 1
+            return
+        parsed = self._parse_filename(filename)
+        if parsed is None:
+            marker = self._parse_filename(filename, REMOTE_PENDING_SUFFIX)
+            if marker is not None:
+                self._pending.setdefault(marker[0], set()).add(filename)
+            return
+        key, index = parsed
+        self._entries.setdefault(key, {})[index] = filename
+        self._versions[key] = self._versions.get(key, 0) + 1
+    
+    def _remove(self, filename):
+        manifest_key = self._parse_manifest(filename)
+        if manifest_key is not None:
+            if self._manifests.pop(manifest_key, None) is not None:
+                self._versions[manifest_key] = self._versions.get(manifest_key, 0) + 1
+            return
+        parsed = self._parse_filename(filename)
+        if parsed is None:
+            marker = self._parse_filename(filename, REMOTE_PENDING_SUFFIX)
+            if marker is not None and marker[0] in self._pending:
+                self._pending[marker[0]].discard(filename)
+                if not self._pending[marker[0]]:
+                    del self._pending[marker[0]]
+                self.condition.notify_all()
+            return
+        key, index = parsed
+        files = self._entries.get(key)
+        if files and files.get(index) == filename:
+            del files[index]
+            if not files:
+                del self._entries[key]
+            self._versions[key] = self._versions.get(key, 0) + 1
+    
+    def rescan(self, key=None):
+        """重新扫描目录（key 为 None 时重建全部索引，否则只刷新该组/link）"""
+        try:
+            filenames = os.listdir(self.results_dir) if os.path.exists(self.results_dir) else []
+        except Exception as e:
+            print(f"[RemoteResultIndex] 扫描结果目录失败: {e}")
+            return
+        with self.lock:
+            if key is None:
+                old_keys = set(self._entries) | set(self._manifests)
+                self._entries = {}
+                self._manifests = {}
+                self._pending = {}
+                for filename in filenames:
+                    self._add(filename)
+                for stale_key in old_keys - set(self._entries) - set(self._manifests):
+                    self._versions[stale_key] = self._versions.get(stale_key, 0) + 1
+            else:
+                prefix = f"{key[0]}_{key[1]}_"
+                manifest_name = f"{key[0]}_{key[1]}{REMOTE_MANIFEST_SUFFIX}"
+                if (manifest_name in filenames) != (key in self._manifests):
+                    if manifest_name in filenames:
+                        self._manifests[key] = manifest_name
+                    else:
+                        del self._manifests[key]
+                    self._versions[key] = self._versions.get(key, 0) + 1
+                files = {}
+                markers = set()
+                for filename in filenames:
+                    if filename.startswith(prefix):
+                        parsed = self._parse_filename(filename)
+                        if parsed is not None and parsed[0] == key:
+                            files[parsed[1]] = filename
+                        elif filename.endswith(REMOTE_PENDING_SUFFIX):
+                            markers.add(filename)
+                if files != self._entries.get(key, {}):
+                    if files:
+                        self._entries[key] = files
+                    else:
+                        self._entries.pop(key, None)
+                    self._versions[key] = self._versions.get(key, 0) + 1
+                if markers:
+                    self._pending[key] = markers
+                else:
+                    self._pending.pop(key, None)
+            self.condition.notify_all()
+    
+    def on_event(self, event):
+        """处理 StatusChangeFeed 事件"""
+        event_type = event["type"]
+        if event_type == "rescan":
+            self.rescan()
+            return
+        if event.get("path") is None or os.path.dirname(event["path"]) != self.results_dir:
+            return
+        with self.lock:
+            if event_type in ("result_image", "result_pending"):
+                self._add(event["filename"])
+            elif event_type == "removed":
+                self._remove(event["filename"])
+    
+    def wait_flushed(self, group_name, link_id=None, timeout=REMOTE_PENDING_TIMEOUT):
+        """等待该组/link 的异步编码写完（link_id 为 None 时等待该组所有 link）
+        
+        标记按文件名解析出的 (安全组名, link_id) 精确匹配，不会等待名称以该组名开头的其他组。
+        
+        Returns:
+            bool: 没有进行中的编码返回 True，超时返回 False
+        """
+        safe_group_name = _get_safe_filename(group_name)
+        if link_id is None:
+            pending_keys = lambda: [key for key in self._pending if key[0] == safe_group_name]
+        else:
+            key = (safe_group_name, str(link_id))
+            pending_keys = lambda: [key] if key in self._pending else []
+        deadline = time.time() + timeout
+        while True:
+            with self.condition:
+                keys = pending_keys()
+                if not keys:
+                    return True
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    return False
+                notified = self.condition.wait(min(0.5, remaining))
+            if not notified:
+                # 没有收到通知（标记可能由其他进程删除），重新检查该组/link
+                for key in keys:
+                    self.rescan(key)
+    
+    def read_manifest(self, group_name, link_id):
+        """读取该组/link 的结果清单（按 mtime/size 缓存解析结果），没有时返回 None"""
+        manifest_path = self.get_manifest(group_name, link_id)
+        if manifest_path is None:
+            return None
+        key = (_get_safe_filename(group_name), str(link_id))
+        try:
+            stat = os.stat(manifest_path)
+        except OSError:
+            return None
+        signature = (stat.st_mtime_ns, stat.st_size)
+        with self.lock:
+            cached = self._manifest_data.get(key)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+        manifest = _read_result_manifest(manifest_path)
+        if manifest is not None:
+            with self.lock:
+                self._manifest_data[key] = (signature, manifest)
+        return manifest
+    
+    def get_files(self, group_name, link_id, max_images=None):
+        """按索引顺序返回 [(index, 相对路径)]
+        
+        有编码格式的结果清单时直接取清单中的文件；否则使用旧版平铺布局的文件，
+        索引中没有记录时刷新一次，防止通知尚未到达。
+        """
+        manifest = self.read_manifest(group_name, link_id)
+        if manifest is not None and manifest.get("format", "raw") != "raw":
+            # 清单可能是从远端下载的，只接受 results_dir 内的合法相对路径
+            image_files = sorted((entry["index"], entry["image"]) for entry in manifest.get("entries", [])
+                                 if _resolve_result_path(self.results_dir, entry.get("image")) is not None)
+            return image_files[:max_images] if max_images else image_files
+        
+        key = (_get_safe_filename(group_name), str(link_id))
+        with self.lock:
+            files = self._entries.get(key)
+        if not files:
+            self.rescan(key)
+            with self.lock:
+                files = self._entries.get(key)
+        if not files:
+            return []
+        image_files = sorted(files.items())
+        return image_files[:max_images] if max_images else image_files
+    
+    def get_manifest(self, group_name, link_id):
+        """返回结果清单的文件路径，没有时返回 None"""
+        key = (_get_safe_filename(group_name), str(link_id))
+        with self.lock:
+            filename = self._manifests.get(key)
+        if filename is None:
+            # 通知可能尚未到达，直接检查一次
+            filename = f"{key[0]}_{key[1]}{REMOTE_MANIFEST_SUFFIX}"
+            if not os.path.exists(os.path.join(self.results_dir, filename)):
+                return None
+        return os.path.join(self.results_dir, filename)
+    
+    def get_version(self, group_name, link_id):
+        key = (_get_safe_filename(group_name), str(link_id))
+        with self.lock:
+            return self._versions.get(key, 0)
+
+def _write_result_manifest(results_dir, safe_group_name, link_id, group_name, result_format, entries):
+    """原子写入结果清单，接收端只会读到完整的清单
+    
+    entries: [{"index": 序号, "image": 相对路径, "mask": 相对路径或 None, ...}]，路径相对 results_dir、以 / 分隔
+    """
+    manifest_path = _get_result_manifest_path(results_dir, safe_group_name, link_id)
+    _status_store.write(manifest_path, {
+        "version": 2,
+        "group_name": group_name,
+        "link_id": link_id,
+        "format": result_format,
+        "created_at": time.time(),
+        "entries": entries
+    })
+    return manifest_path
+
+def _prune_result_subdir(results_dir, safe_group_name, link_id, entries):
+    """删除分组目录中不在清单里的旧结果文件"""
+    result_dir = _get_result_subdir(results_dir, safe_group_name, link_id)
+    keep = {os.path.basename(entry[key]) for entry in entries for key in ("image", "mask") if entry.get(key)}
+    try:
+        filenames = os.listdir(result_dir)
+    except FileNotFoundError:
+        return
+    for filename in filenames:
+        if filename not in keep and not filename.endswith((".tmp", ".part")):
+            try:
+                os.remove(os.path.join(result_dir, filename))
+            except OSError as e:
+                print(f"[RemoteImageSenderPlus] 删除旧结果文件失败: {filename}, 错误: {e}")
+
+def _migrate_flat_results(results_dir):
+    """把旧版平铺布局（{group_name}_{link_id}_{index}.png 等）迁移到分组目录并写出清单
+    
+    已有清单的组/link（原始张量格式写在旧文件之后）保持不变，其平铺文件由索引继续兼容读取。
+    """
+    try:
+        filenames = os.listdir(results_dir)
+    except FileNotFoundError:
+        return
+    legacy = {}
+    for filename in filenames:
+        parsed = RemoteResultIndex._parse_filename(filename)
+        if parsed is not None:
+            key, index = parsed
+            legacy.setdefault(key, {})[index] = filename
+    
+    formats = {ext: name for name, ext in IMAGE_FORMAT_EXTENSIONS.items()}
+    migrated = 0
+    for (safe_group_name, link_id), files in legacy.items():
+        if os.path.exists(_get_result_manifest_path(results_dir, safe_group_name, link_id)):
+            continue
+        try:
+            result_dir = _get_result_subdir(results_dir, safe_group_name, link_id)
+            os.makedirs(result_dir, exist_ok=True)
+            entries = []
+            for index, filename in sorted(files.items()):
+                extension = os.path.splitext(filename)[1]
+                new_name = f"{index}{extension}"
+                os.replace(os.path.join(results_dir, filename), os.path.join(result_dir, new_name))
+                entries.append({"index": index, "image": f"{safe_group_name}/{link_id}/{new_name}", "mask": None})
+            result_format = formats.get(os.path.splitext(entries[0]["image"])[1], "png")
+            _write_result_manifest(results_dir, safe_group_name, link_id, safe_group_name, result_format, entries)
+            migrated += len(entries)
+        except Exception as e:
+            print(f"[RemoteResultIndex] 迁移旧版结果文件失败 ({safe_group_name}_{link_id}): {e}")
+    if migrated:
+        print(f"[RemoteResultIndex] 已把 {migrated} 个旧版平铺结果文件迁移到分组目录")
+
+try:
+    _migrate_flat_results(REMOTE_RESULTS_DIR)
+except Exception as e:
+    print(f"[RemoteResultIndex] 迁移旧版结果文件失败: {e}")
+
+_remote_result_index = RemoteResultIndex(REMOTE_RESULTS_DIR)
+if _status_change_feed is not None:
+    _status_change_feed.subscribe(_remote_result_index.on_event)
+
+# 远程结果的已解码缓存：按文件内容摘要命中，重复传输的相同内容也无需再次解码
+_remote_decoded_cache = DecodedImageCache()
+
+@PromptServer.instance.routes.get("/group_executor/image_cache/stats")
+async def get_image_cache_stats(request):
+    """获取已解码图像缓存的命中/未命中统计"""
+    return web.json_response({
+        "status": "success",
+        "local": _decoded_image_cache.stats(),
+        "remote": _remote_decoded_cache.stats(),
+    })
+
+@PromptServer.instance.routes.post("/group_executor/image_cache/config")
+async def set_image_cache_config(request):
+    """调整已解码图像缓存的内存上限（budget_mb），clear 为 true 时清空缓存"""
+    try:
+        data = await request.json()
+        if "budget_mb" in data:
+            budget = int(float(data["budget_mb"]) * 1024 * 1024)
+            _decoded_image_cache.set_budget(budget)
+            _remote_decoded_cache.set_budget(budget)
+        if data.get("clear"):
+            _decoded_image_cache.clear()
+            _remote_decoded_cache.clear()
+        return web.json_response({
+            "status": "success",
+            "local": _decoded_image_cache.stats(),
+            "remote": _remote_decoded_cache.stats(),
+        })
+    except (ValueError, TypeError):
+        return web.json_response({"status": "error", "message": "参数无效"}, status=400)
+    except Exception as e:
+        print(f"[DecodedImageCache] 更新缓存配置失败: {e}")
+        return web.json_response({"status": "error", "message": str(e)}, status=500)
+
+def _save_npy_atomic(file_path, array):
+    """写入临时文件后原子替换：接收端内存映射的旧文件（inode）保持有效，不会被截断改写"""
+    temp_file = f"{file_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(temp_file, 'wb') as f:
+            np.save(f, array)
+        os.replace(temp_file, file_path)
+    finally:
+        if os.path.exists(temp_file):
+            try:
+                os.remove(temp_file)
+            except OSError:
+                pass
+
+def _write_raw_results(results_dir, safe_group_name, link_id, images, masks=None, start_index=0):
+    """以原始张量格式写出结果：每个批次一个 float .npy（可内存映射），清单由调用方在写完后原子写入
+    
+    文件：{group_name}/{link_id}/{index}_image.npy / _mask.npy，清单：{group_name}_{link_id}.manifest.json
+    
+    Args:
+        start_index: 第一个批次的序号（累积模式下接在之前的批次之后）
+    
+    Returns:
+        list: 清单条目，每个批次一项
+    """
+    result_dir = _get_result_subdir(results_dir, safe_group_name, link_id)
+    os.makedirs(result_dir, exist_ok=True)
+    relative_dir = f"{safe_group_name}/{link_id}"
+    entries = []
+    for batch_idx, image_batch in enumerate(images):
+        idx = start_index + batch_idx
+        image = image_batch if image_batch.dim() == 4 else image_batch.unsqueeze(0)
+        image_array = image.detach().cpu().numpy()
+        image_filename = f"{idx}_image.npy"
+        _save_npy_atomic(os.path.join(result_dir, image_filename), image_array)
+        
+        entry = {
+            "index": idx,
+            "image": f"{relative_dir}/{image_filename}",
+            "shape": list(image_array.shape),
+            "dtype": str(image_array.dtype),
+            "mask": None
+        }
+        mask = masks[batch_idx] if masks is not None and batch_idx < len(masks) else None
+        if mask is not None:
+            mask = mask.reshape(-1, mask.shape[-2], mask.shape[-1])
+            if tuple(mask.shape[-2:]) != tuple(image_array.shape[1:3]):
+                # 确保 mask 尺寸与图像匹配
+                mask = torch.nn.functional.interpolate(mask.unsqueeze(1).float(), size=tuple(image_array.shape[1:3]), mode="bilinear", align_corners=False).squeeze(1)
+            mask_array = mask.detach().cpu().numpy()
+            mask_filename = f"{idx}_mask.npy"
+            _save_npy_atomic(os.path.join(result_dir, mask_filename), mask_array)
+            entry["mask"] = f"{relative_dir}/{mask_filename}"
+        entries.append(entry)
+    return entries
+
+def _load_raw_results(manifest, max_images=None, results_dir=REMOTE_RESULTS_DIR):
+    """读取原始张量结果：np.load 内存映射（写时复制）后直接包装为张量，不做解码
+    
+    清单中的路径相对 results_dir（旧版清单为平铺文件名，同样适用）；清单可能是从远端下载的，
+    越界或非法的路径会被跳过。
+    
+    Returns:
+        tuple: (图像列表 [B,H,W,C], 遮罩列表 [B,H,W])
+    """
+    entries = sorted(manifest.get("entries", []), key=lambda e: e["index"])
+    if max_images:
+        entries = entries[:max_images]
+    
+    images = []
+    masks = []
+    for entry in entries:
+        image_path = _resolve_result_path(results_dir, entry.get("image"))
+        mask_path = _resolve_result_path(results_dir, entry["mask"]) if entry.get("mask") else None
+        if image_path is None or (entry.get("mask") and mask_path is None):
+            print(f"[RemoteImageReceiverPlus] 清单中的路径无效，已跳过: {entry.get('image')}, {entry.get('mask')}")
+            continue
+        image = torch.from_numpy(np.load(image_path, mmap_mode='c'))
+        if mask_path:
+            mask = torch.from_numpy(np.load(mask_path, mmap_mode='c'))
+            if mask.shape[0] != image.shape[0]:
+                mask = mask[:1].expand(image.shape[0], -1, -1)
+        else:
+            mask = torch.zeros(image.shape[:3], dtype=torch.float32)
+        images.append(image)
+        masks.append(mask)
+    return images, masks
+
 class LG_RemoteTextSender:
     """远程文本发送器：将文本保存到配置文件中（用于远端服务器异步执行）"""
     def __init__(self):
@@ -1331,15 +2191,10 @@ class LG_RemoteTextSender:
             
             # 如果配置文件已存在，保留created_at字段
             created_at = time.time()
-            if os.path.exists(config_file_path):
-                try:
-                    with open(config_file_path, 'r', encoding='utf-8') as f:
-                        existing_data = json.load(f)
-                    # 保留原有的created_at时间
-                    if "created_at" in existing_data:
-                        created_at = existing_data["created_at"]
-                except:
-                    pass
+            existing_data = _status_store.read(config_file_path)
+            # 保留原有的created_at时间
+            if isinstance(existing_data, dict) and "created_at" in existing_data:
+                created_at = existing_data["created_at"]
             
             # 构建配置文件数据（OUTPUT_NODE执行时任务已完成）
             config_data = {
@@ -1351,37 +2206,36 @@ class LG_RemoteTextSender:
                 "created_at": created_at
             }
             
-            # 写入配置文件
-            temp_file = config_file_path + ".tmp"
-            with open(temp_file, 'w', encoding='utf-8') as f:
-                json.dump(config_data, f, ensure_ascii=False, indent=2)
-            # 原子性替换
-            if os.path.exists(config_file_path):
-                os.remove(config_file_path)
-            os.rename(temp_file, config_file_path)
+            # 原子写入配置文件
+            _status_store.write(config_file_path, config_data)
             
             print(f"[RemoteTextSender] 保存文本到配置文件 (group_name={group_name}, link_id={link_id}): {config_file_path}, {len(save_text)} 字符")
         except Exception as e:
             print(f"[RemoteTextSender] 保存配置文件失败: {str(e)}")
             import traceback
             traceback.print_exc()
-            # 清理临时文件
-            temp_file = config_file_path + ".tmp"
-            if os.path.exists(temp_file):
-                try:
-                    os.remove(temp_file)
-                except:
-                    pass
         
         # OUTPUT_IS_LIST=(True,) 要求返回列表
         return (signal_output,)
 
+def _remove_pending_marker(marker_path):
+    """删除异步写入标记文件"""
+    try:
+        os.remove(marker_path)
+    except OSError as e:
+        print(f"[RemoteImageSenderPlus] 删除编码标记文件失败: {e}")
+
 class LG_RemoteImageSenderPlus:
     """远程图像发送器：将图像保存到文件中（用于远端服务器异步执行）"""
     def __init__(self):
         self.results_dir = REMOTE_RESULTS_DIR
         self.compress_level = 1
         self.accumulated_results = []
+        # 累积状态由节点线程（预留序号）和编码线程（追加结果、写清单）共同修改，都在该锁下进行
+        self._results_lock = threading.Condition()
+        self._next_index = 0  # 累积模式下一次运行的起始序号（已预留，文件可能仍在编码）
+        self._pending_saves = 0  # 已预留序号但尚未写完清单的运行数
+        self._accumulated_format = None  # 累积结果的格式，累积过程中改变格式时重新开始累积
         
     @classmethod
     def INPUT_TYPES(s):
@@ -1390,11 +2244,14 @@ class LG_RemoteImageSenderPlus:
                 "images": ("IMAGE", {"tooltip": "要发送的图像"}),
                 "link_id": ("INT", {"default": 1, "min": 0, "max": sys.maxsize, "step": 1, "tooltip": "发送端连接ID"}),
                 "accumulate": ("BOOLEAN", {"default": False, "tooltip": "开启后将累积所有图像一起发送"}), 
-                "preview_rgba": ("BOOLEAN", {"default": True, "tooltip": "开启后预览显示RGBA格式，关闭则预览显示RGB格式"}),
+                "preview_rgba": ("BOOLEAN", {"default": True, "tooltip": "保留用于兼容旧工作流（远程发送器不显示预览，不再生成 JPEG 预览文件）"}),
             },
             "optional": {
                 "masks": ("MASK", {"tooltip": "要发送的遮罩"}),
-                "signal_opt": (any_typ, {"tooltip": "信号输入，将在处理完成后原样输出"})
+                "signal_opt": (any_typ, {"tooltip": "信号输入，将在处理完成后原样输出"}),
+                "image_format": (list(IMAGE_FORMAT_EXTENSIONS.keys()) + ["raw"], {"default": "png", "tooltip": "结果文件格式：png、无损 webp（更小，编码更慢）、未压缩 npy（最快，体积最大），或 raw（原始浮点张量 + 清单，无损保留数值范围）"}),
+                "compress_level": ("INT", {"default": 1, "min": 0, "max": 9, "step": 1, "tooltip": "压缩级别（0-9），npy 格式忽略"}),
+                "async_encode": ("BOOLEAN", {"default": False, "tooltip": "开启后编码提交到后台即返回，组完成状态会等待文件全部写完后再标记"}),
             },
             "hidden": {"prompt": "PROMPT", "extra_pnginfo": "EXTRA_PNGINFO", "unique_id": "UNIQUE_ID"},
         }
@@ -1408,7 +2265,7 @@ class LG_RemoteImageSenderPlus:
     OUTPUT_NODE = True
 
     @classmethod
-    def IS_CHANGED(s, images, link_id, accumulate, preview_rgba, masks=None, prompt=None, extra_pnginfo=None, unique_id=None):
+    def IS_CHANGED(s, images, link_id, accumulate, preview_rgba, masks=None, signal_opt=None, image_format=None, compress_level=None, async_encode=None, prompt=None, extra_pnginfo=None, unique_id=None):
         if isinstance(accumulate, list):
             accumulate = accumulate[0]
         
@@ -1418,15 +2275,18 @@ class LG_RemoteImageSenderPlus:
         # 获取组名用于hash计算
         group_name = _get_group_name_from_prompt(prompt, extra_pnginfo, unique_id)
         # 非积累模式下计算hash
-        hash_value = hash(str(images) + str(masks) + str(group_name))
+        hash_value = hash(str(images) + str(masks) + str(group_name) + str(image_format) + str(compress_level))
         return hash_value
 
-    def save_images(self, images, link_id, accumulate, preview_rgba, masks=None, signal_opt=None, prompt=None, extra_pnginfo=None, unique_id=None):
-        results = list()
-
+    def save_images(self, images, link_id, accumulate, preview_rgba, masks=None, signal_opt=None, image_format=None, compress_level=None, async_encode=None, prompt=None, extra_pnginfo=None, unique_id=None):
         link_id = link_id[0] if isinstance(link_id, list) else link_id
         accumulate = accumulate[0] if isinstance(accumulate, list) else accumulate
-        preview_rgba = preview_rgba[0] if isinstance(preview_rgba, list) else preview_rgba
+        image_format = image_format[0] if isinstance(image_format, list) else image_format
+        compress_level = compress_level[0] if isinstance(compress_level, list) else compress_level
+        async_encode = async_encode[0] if isinstance(async_encode, list) else async_encode
+        
+        image_format = image_format if image_format in IMAGE_FORMAT_EXTENSIONS or image_format == "raw" else "png"
+        compress_level = self.compress_level if compress_level is None else compress_level
         
         # 从节点属性中获取组名
         group_name = _get_group_name_from_prompt(prompt, extra_pnginfo, unique_id)
@@ -1446,106 +2306,173 @@ class LG_RemoteImageSenderPlus:
         else:
             signal_output = [None]
         
-        for idx, image_batch in enumerate(images):
+        if image_format == "raw":
+            return self._save_raw(images, masks, safe_group_name, group_name, link_id, accumulate, async_encode, signal_output)
+        
+        # 整批转换为 RGBA 帧，文件保存在分组目录：{group_name}/{link_id}/{index}.{ext}
+        result_dir = _get_result_subdir(self.results_dir, safe_group_name, link_id)
+        os.makedirs(result_dir, exist_ok=True)
+        extension = IMAGE_FORMAT_EXTENSIONS[image_format]
+        frames = _images_to_rgba_frames(images, masks, "[RemoteImageSenderPlus]")
+        
+        # 在提交编码前预留序号：累积模式下接在之前所有运行（包括仍在后台编码的）预留的序号之后
+        start_index = self._reserve_indexes(len(frames), accumulate, image_format)
+        handed_off = [False]  # 预留是否已交给 on_saved 结束（之后的异常不能再结束一次）
+        try:
+            self._encode_reserved(frames, start_index, result_dir, extension, safe_group_name, group_name, link_id,
+                                  accumulate, image_format, compress_level, async_encode, handed_off)
+        except Exception:
+            if not handed_off[0]:
+                self._release_reservation(accumulate, safe_group_name, link_id, group_name, image_format)
+            raise
+        
+        return (signal_output,)
+    
+    def _encode_reserved(self, frames, start_index, result_dir, extension, safe_group_name, group_name, link_id,
+                         accumulate, image_format, compress_level, async_encode, handed_off):
+        """把已预留序号的帧交给编码：同步模式下写完并写入清单，异步模式下提交到编码线程池后返回"""
+        jobs = []
+        save_results = []
+        for idx, rgba in enumerate(frames):
+            index = start_index + idx
+            file_path = os.path.join(result_dir, f"{index}{extension}")
+            jobs.append((rgba, file_path, None))
+            save_results.append({
+                "filename": f"{safe_group_name}/{link_id}/{index}{extension}",
+                "file_path": file_path,
+                "group_name": group_name,
+                "link_id": link_id,
+                "index": index
+            })
+        
+        def on_saved(saved):
+            handed_off[0] = True
+            # 累积的始终是原始图像结果；文件全部写完后原子写入清单，接收端按清单读取
+            entries = [{"index": result["index"], "image": result["filename"], "mask": None}
+                       for result, ok in zip(save_results, saved) if ok]
+            count = self._commit_results(entries, accumulate, safe_group_name, link_id, group_name, image_format)
+            if count:
+                print(f"[RemoteImageSenderPlus] 保存 {count} 张图像到文件 (group_name={group_name}, link_id={link_id}, format={image_format})")
+        
+        if async_encode and jobs:
+            # 写入标记文件，编码全部写完后删除；组完成状态和接收端都会等待标记消失
+            marker_path = self._create_pending_marker(safe_group_name, link_id, len(jobs))
+            
+            def on_async_saved(saved):
+                try:
+                    on_saved(saved)
+                finally:
+                    _remove_pending_marker(marker_path)
+            
             try:
-                image = image_batch.squeeze()
-                rgb_image = Image.fromarray(np.clip(255. * image.cpu().numpy(), 0, 255).astype(np.uint8))
-
-                if masks is not None and idx < len(masks):
-                    mask = masks[idx].squeeze()
-                    mask_array = np.clip(255. * (1 - mask.cpu().numpy()), 0, 255).astype(np.uint8)
-                    mask_img = Image.fromarray(mask_array, mode='L')
-                    
-                    # 确保 mask 尺寸与 rgb_image 匹配
-                    if mask_img.size != rgb_image.size:
-                        mask_img = mask_img.resize(rgb_image.size, Image.Resampling.LANCZOS)
-                else:
-                    mask_img = Image.new('L', rgb_image.size, 255)
-
-                # 确保 mask_img 是 'L' 模式
-                if mask_img.mode != 'L':
-                    mask_img = mask_img.convert('L')
-
-                r, g, b = rgb_image.convert('RGB').split()
-                rgba_image = Image.merge('RGBA', (r, g, b, mask_img))
-
-                # 保存RGBA格式到文件，文件名格式：{group_name}_{link_id}_{index}.png
-                filename = f"{safe_group_name}_{link_id}_{idx}.png"
-                file_path = os.path.join(self.results_dir, filename)
-                
+                _encode_image_frames(jobs, compress_level, "[RemoteImageSenderPlus]", image_format, callback=on_async_saved)
+            except Exception:
+                # 提交失败时回调不会被调用，由调用方结束预留
+                _remove_pending_marker(marker_path)
+                raise
+            handed_off[0] = True
+            print(f"[RemoteImageSenderPlus] 已提交 {len(jobs)} 张图像到后台编码 (group_name={group_name}, link_id={link_id})")
+        else:
+            on_saved(_encode_image_frames(jobs, compress_level, "[RemoteImageSenderPlus]", image_format))
+    
+    def _reserve_indexes(self, count, accumulate, result_format):
+        """为本次运行预留 count 个结果序号，返回起始序号
+        
+        非累积模式（或累积过程中改变了格式）从 0 开始并清空累积结果；之前运行的后台编码尚未写完时先等待，
+        避免写入相同序号的文件。
+        """
+        with self._results_lock:
+            if accumulate and self._accumulated_format in (None, result_format):
+                start_index = self._next_index
+                self._next_index += count
+            else:
+                if not self._results_lock.wait_for(lambda: self._pending_saves == 0, REMOTE_PENDING_TIMEOUT):
+                    print(f"[RemoteImageSenderPlus] 等待之前的后台编码写完超时，继续保存")
+                self.accumulated_results = []
+                self._next_index = count if accumulate else 0
+                start_index = 0
+            self._accumulated_format = result_format if accumulate else None
+            self._pending_saves += 1
+            return start_index
+    
+    def _commit_results(self, entries, accumulate, safe_group_name, link_id, group_name, result_format):
+        """文件写完后合并累积结果并原子写入清单（在节点线程或编码线程中调用）
+        
+        各次运行的编码可能乱序完成，累积结果按序号排序；还有运行在编码时不清理文件（可能是其预留的序号）。
+        entries 为 None 表示写入失败，只结束本次预留，不更新清单。
+        
+        Returns:
+            int: 清单中的条目数
+        """
+        with self._results_lock:
+            self._pending_saves -= 1
+            try:
+                if entries is None:
+                    return 0
+                if accumulate:
+                    self.accumulated_results.extend(entries)
+                    self.accumulated_results.sort(key=lambda entry: entry["index"])
+                    entries = list(self.accumulated_results)
                 try:
-                    # 确保目录存在
-                    os.makedirs(self.results_dir, exist_ok=True)
-                    
-                    # 保存图像
-                    rgba_image.save(file_path, compress_level=self.compress_level)
-                    
-                    # 准备结果数据
-                    original_result = {
-                        "filename": filename,
-                        "file_path": file_path,
-                        "group_name": group_name,
-                        "link_id": link_id,
-                        "index": idx
-                    }
-                    
-                    # 如果是要显示RGB预览
-                    if not preview_rgba:
-                        preview_filename = f"{safe_group_name}_{link_id}_{idx}_preview.jpg"
-                        preview_path = os.path.join(self.results_dir, preview_filename)
-                        rgb_image.save(preview_path, format="JPEG", quality=95)
-                        # 将预览图添加到UI显示结果中
-                        results.append({
-                            "filename": preview_filename,
-                            "file_path": preview_path,
-                            "group_name": group_name,
-                            "link_id": link_id,
-                            "index": idx
-                        })
-                    else:
-                        # 显示RGBA
-                        results.append(original_result)
-
-                    # 累积的始终是原始图像结果
-                    if accumulate:
-                        self.accumulated_results.append(original_result)
-                    
-                    print(f"[RemoteImageSenderPlus] 保存图像到文件 (group_name={group_name}, link_id={link_id}, index={idx}): {file_path}")
-
+                    _write_result_manifest(self.results_dir, safe_group_name, link_id, group_name, result_format, entries)
+                    if self._pending_saves == 0:
+                        _prune_result_subdir(self.results_dir, safe_group_name, link_id, entries)
                 except Exception as e:
-                    print(f"[RemoteImageSenderPlus] 保存图像文件失败: {str(e)}")
-                    import traceback
-                    traceback.print_exc()
-                    continue
-
+                    print(f"[RemoteImageSenderPlus] 写入结果清单失败: {str(e)}")
+                return len(entries)
+            finally:
+                self._results_lock.notify_all()
+    
+    def _release_reservation(self, accumulate, safe_group_name, link_id, group_name, result_format):
+        """保存没能交给写入线程时结束本次预留，否则之后的非累积运行会一直等待到超时"""
+        print(f"[RemoteImageSenderPlus] 保存失败，已释放预留的序号 (group_name={group_name}, link_id={link_id})")
+        self._commit_results(None, accumulate, safe_group_name, link_id, group_name, result_format)
+    
+    def _create_pending_marker(self, safe_group_name, link_id, count):
+        """创建异步写入标记文件，返回其路径"""
+        os.makedirs(self.results_dir, exist_ok=True)
+        marker_path = os.path.join(self.results_dir, f"{safe_group_name}_{link_id}_{int(time.time() * 1000)}{REMOTE_PENDING_SUFFIX}")
+        with open(marker_path, 'w', encoding='utf-8') as f:
+            f.write(str(count))
+        return marker_path
+    
+    def _save_raw(self, images, masks, safe_group_name, group_name, link_id, accumulate, async_encode, signal_output):
+        """以原始张量格式保存（float .npy + 清单），不做量化和编码；累积模式下批次序号接在之前的批次之后"""
+        start_index = self._reserve_indexes(len(images), accumulate, "raw")
+        
+        def write():
+            entries = None
+            try:
+                entries = _write_raw_results(self.results_dir, safe_group_name, link_id, images, masks, start_index)
             except Exception as e:
-                print(f"[RemoteImageSenderPlus] 处理图像 {idx+1} 时出错: {str(e)}")
+                print(f"[RemoteImageSenderPlus] 保存原始张量失败: {str(e)}")
                 import traceback
                 traceback.print_exc()
-                continue
-
-        # 获取实际要保存的结果
-        if accumulate:
-            save_results = self.accumulated_results
-        else:
-            # 创建一个包含原始文件名的列表
-            save_results = []
-            for idx in range(len(results)):
-                original_filename = f"{safe_group_name}_{link_id}_{idx}.png"
-                save_results.append({
-                    "filename": original_filename,
-                    "file_path": os.path.join(self.results_dir, original_filename),
-                    "group_name": group_name,
-                    "link_id": link_id,
-                    "index": idx
-                })
+            count = self._commit_results(entries, accumulate, safe_group_name, link_id, group_name, "raw")
+            if entries is not None:
+                print(f"[RemoteImageSenderPlus] 保存 {count} 组原始张量到文件 (group_name={group_name}, link_id={link_id})")
         
-        if save_results:
-            print(f"[RemoteImageSenderPlus] 保存 {len(save_results)} 张图像到文件 (group_name={group_name}, link_id={link_id})")
-        
-        if not accumulate:
-            self.accumulated_results = []
+        if not async_encode:
+            write()
+            return (signal_output,)
         
+        marker_path = None
+        try:
+            marker_path = self._create_pending_marker(safe_group_name, link_id, len(images))
+            
+            def write_async():
+                try:
+                    write()
+                finally:
+                    _remove_pending_marker(marker_path)
+            
+            _get_encode_executor().submit(write_async)
+        except Exception:
+            if marker_path is not None:
+                _remove_pending_marker(marker_path)
+            self._release_reservation(accumulate, safe_group_name, link_id, group_name, "raw")
+            raise
+        print(f"[RemoteImageSenderPlus] 已提交 {len(images)} 组原始张量到后台写入 (group_name={group_name}, link_id={link_id})")
         return (signal_output,)
 
 class LG_RemoteTextReceiver:
@@ -1561,6 +2488,7 @@ class LG_RemoteTextReceiver:
                 "link_id": ("INT", {"default": 1, "min": 0, "max": sys.maxsize, "step": 1, "tooltip": "发送端连接ID，需与发送端link_id匹配"}),
             },
             "optional": {
+                "repeat_index": ("INT", {"default": 0, "min": 0, "max": 10000, "step": 1, "tooltip": "分发模式下读取第几次重复的结果，0 表示按组名读取"}),
                 "signal": (any_typ, {"tooltip": "信号输入，将在处理完成后原样输出"}),
             },
             "hidden": {"unique_id": "UNIQUE_ID"},
@@ -1573,11 +2501,15 @@ class LG_RemoteTextReceiver:
     FUNCTION = "load_text"
     INPUT_IS_LIST = False
 
-    def load_text(self, group_name, link_id, signal=None, unique_id=None):
+    def load_text(self, group_name, link_id, repeat_index=0, signal=None, unique_id=None):
         # 处理输入（可能来自列表）
         if isinstance(group_name, list):
             group_name = group_name[0] if group_name else ""
         group_name = group_name if group_name else ""
+        if isinstance(repeat_index, list):
+            repeat_index = repeat_index[0] if repeat_index else 0
+        if group_name:
+            group_name = _get_repeat_group_name(group_name, repeat_index)
         
         if isinstance(link_id, list):
             link_id = link_id[0] if link_id else 1
@@ -1598,10 +2530,12 @@ class LG_RemoteTextReceiver:
         print(f"[RemoteTextReceiver] 尝试读取配置文件 (group_name={group_name}, link_id={link_id}): {config_file_path}")
         
         try:
-            if os.path.exists(config_file_path):
-                with open(config_file_path, 'r', encoding='utf-8') as f:
-                    config_data = json.load(f)
-                
+            # 组在远程服务器执行时，先通过 HTTP 同步文本结果（共享存储时无需下载）
+            if _remote_result_fetcher is not None:
+                _remote_result_fetcher.fetch_text(group_name, link_id)
+            
+            config_data = _status_store.read(config_file_path)
+            if isinstance(config_data, dict):
                 # 从配置文件中读取 result_text 字段
                 text = config_data.get("result_text", "")
                 print(f"[RemoteTextReceiver] 成功读取配置文件: {len(text)} 字符")
@@ -1616,9 +2550,9 @@ class LG_RemoteTextReceiver:
             return ("", signal_output)
     
     @classmethod
-    def IS_CHANGED(s, group_name, link_id, signal=None, unique_id=None):
+    def IS_CHANGED(s, group_name, link_id, repeat_index=0, signal=None, unique_id=None):
         # 计算hash以检测变化
-        hash_value = hash(str(group_name) + str(link_id))
+        hash_value = hash(str(group_name) + str(link_id) + str(repeat_index))
         return hash_value
 
 class LG_RemoteImageReceiverPlus:
@@ -1636,6 +2570,11 @@ class LG_RemoteImageReceiverPlus:
             },
             "optional": {
                 "mask_file": ("STRING", {"default": "", "multiline": False, "tooltip": "可选的遮罩文件名，用于加载已编辑的遮罩"}),
+                "frame_start": ("INT", {"default": 0, "min": 0, "max": 100000, "step": 1, "tooltip": "多帧图像（GIF/APNG等）从第几帧开始读取"}),
+                "frame_count": ("INT", {"default": 0, "min": 0, "max": 100000, "step": 1, "tooltip": "最多读取的帧数，0 表示全部"}),
+                "frame_stride": ("INT", {"default": 1, "min": 1, "max": 1000, "step": 1, "tooltip": "帧步长，跳过的帧不会被解码"}),
+                "decode_workers": ("INT", {"default": 0, "min": 0, "max": 64, "step": 1, "tooltip": "并行解码的线程数，0 表示自动"}),
+                "repeat_index": ("INT", {"default": 0, "min": 0, "max": 10000, "step": 1, "tooltip": "分发模式下读取第几次重复的结果，0 表示按组名读取"}),
                 "signal": (any_typ, {"tooltip": "信号输入，将在处理完成后原样输出"}),
             },
             "hidden": {"unique_id": "UNIQUE_ID"},
@@ -1648,7 +2587,36 @@ class LG_RemoteImageReceiverPlus:
     FUNCTION = "load_image"
     INPUT_IS_LIST = False
 
-    def load_image(self, group_name, link_id, max_images, mask_file="", signal=None, unique_id=None):
+    def _resolve_mask_path(self, mask_file_name):
+        """依次在 results_dir、temp、input 目录中查找遮罩文件"""
+        mask_file_path = os.path.join(self.results_dir, mask_file_name)
+        if not os.path.exists(mask_file_path):
+            temp_dir = folder_paths.get_temp_directory()
+            input_dir = folder_paths.get_input_directory()
+            mask_file_path = os.path.join(temp_dir, mask_file_name)
+            if not os.path.exists(mask_file_path):
+                mask_file_path = os.path.join(input_dir, mask_file_name)
+        return mask_file_path
+    
+    @staticmethod
+    def _decoded_cache_key(img_path, mask_file_path=None):
+        """已解码结果的缓存键：结果文件内容摘要 + 遮罩文件签名，无法计算摘要时返回 None
+        
+        摘要按 (路径, size, mtime_ns) 缓存（下载时也会直接写入），文件未变化时只需一次 stat。
+        """
+        digest = _file_checksum(img_path)
+        if digest is None:
+            return None
+        mask_signature = None
+        if mask_file_path:
+            try:
+                stat = os.stat(mask_file_path)
+                mask_signature = (mask_file_path, stat.st_mtime_ns, stat.st_size)
+            except OSError:
+                mask_signature = (mask_file_path, None, None)
+        return ("remote", digest, mask_signature)
+    
+    def load_image(self, group_name, link_id, max_images, mask_file="", frame_start=0, frame_count=0, frame_stride=1, decode_workers=0, repeat_index=0, signal=None, unique_id=None):
         output_images = []
         output_masks = []
         
@@ -1656,6 +2624,10 @@ class LG_RemoteImageReceiverPlus:
         if isinstance(group_name, list):
             group_name = group_name[0] if group_name else ""
         group_name = group_name if group_name else ""
+        if isinstance(repeat_index, list):
+            repeat_index = repeat_index[0] if repeat_index else 0
+        if group_name:
+            group_name = _get_repeat_group_name(group_name, repeat_index)
         
         if isinstance(link_id, list):
             link_id = link_id[0] if link_id else 1
@@ -1669,6 +2641,11 @@ class LG_RemoteImageReceiverPlus:
             mask_file = mask_file[0] if mask_file else ""
         mask_file = mask_file if mask_file else ""
         
+        frame_start, frame_count, frame_stride, decode_workers = [
+            (v[0] if v else d) if isinstance(v, list) else v
+            for v, d in ((frame_start, 0), (frame_count, 0), (frame_stride, 1), (decode_workers, 0))
+        ]
+        
         # 处理 signal（原样输出）
         signal_output = signal
         
@@ -1685,34 +2662,32 @@ class LG_RemoteImageReceiverPlus:
         print(f"[RemoteImageReceiverPlus] 尝试读取图像文件 (group_name={group_name}, link_id={link_id}, max_images={max_images})")
         
         try:
-            # 查找所有匹配的图像文件
-            image_files = []
-            if os.path.exists(self.results_dir):
-                for filename in os.listdir(self.results_dir):
-                    # 匹配格式：{group_name}_{link_id}_{index}.png
-                    if filename.startswith(filename_prefix) and filename.endswith('.png') and not filename.endswith('_preview.jpg'):
-                        # 提取索引
-                        try:
-                            # 格式：{group_name}_{link_id}_{index}.png
-                            base_name = filename[:-4]  # 去掉 .png
-                            parts = base_name.split('_')
-                            if len(parts) >= 3:
-                                # 最后一部分应该是索引
-                                index = int(parts[-1])
-                                image_files.append((index, filename))
-                        except:
-                            continue
-                
-                # 按索引排序
-                image_files.sort(key=lambda x: x[0])
-                # 限制数量
-                image_files = image_files[:max_images]
+            # 组在远程服务器执行时，先通过 HTTP 同步结果文件（远端会等待异步编码写完）
+            if _remote_result_fetcher is not None:
+                _remote_result_fetcher.fetch_images(group_name, link_id)
+            
+            # 发送端异步编码时，等待结果文件全部写完
+            if not _remote_result_index.wait_flushed(group_name, link_id):
+                print(f"[RemoteImageReceiverPlus] 等待结果文件写入超时，读取已写完的文件 (prefix={filename_prefix})")
+            
+            # 发送端使用原始张量格式时，直接内存映射读取，无需解码
+            manifest = _remote_result_index.read_manifest(group_name, link_id)
+            if manifest is not None and manifest.get("format", "raw") == "raw":
+                if mask_file:
+                    print(f"[RemoteImageReceiverPlus] 原始张量格式不支持遮罩文件覆盖，忽略: {mask_file}")
+                output_images, output_masks = _load_raw_results(manifest, max_images, self.results_dir)
+                if output_images:
+                    print(f"[RemoteImageReceiverPlus] 从原始张量清单加载 {len(output_images)} 组图像")
+                    return (output_images, output_masks, signal_output)
+            
+            # 按结果清单取图像文件（旧版平铺布局为 {group_name}_{link_id}_{index}.png/.webp/.npy），按索引排序并限制数量
+            image_files = _remote_result_index.get_files(group_name, link_id, max_images)
             
             if not image_files:
                 print(f"[RemoteImageReceiverPlus] 未找到匹配的图像文件 (prefix={filename_prefix})")
                 empty_image = torch.zeros((1, 64, 64, 3), dtype=torch.float32)
                 empty_mask = torch.zeros((1, 64, 64), dtype=torch.float32)
-                return ([empty_image], [empty_mask])
+                return ([empty_image], [empty_mask], signal_output)
             
             print(f"[RemoteImageReceiverPlus] 找到 {len(image_files)} 个图像文件")
             
@@ -1724,138 +2699,71 @@ class LG_RemoteImageReceiverPlus:
             else:
                 mask_files = [str(mask_file).strip()] if mask_file else []
             
-            for idx, (file_index, img_filename) in enumerate(image_files):
+            def decode_file(item):
+                idx, (file_index, img_filename) = item
                 try:
                     img_path = os.path.join(self.results_dir, img_filename)
                     
                     if not os.path.exists(img_path):
                         print(f"[RemoteImageReceiverPlus] 文件不存在: {img_path}")
-                        continue
+                        return None
                     
-                    img = node_helpers.pillow(Image.open, img_path)
+                    mask_file_path = None
+                    if mask_files and idx < len(mask_files):
+                        mask_file_path = self._resolve_mask_path(mask_files[idx])
                     
-                    w, h = None, None
-                    frame_images = []
-                    frame_masks = []
+                    # 按文件内容摘要查找已解码结果，内容未变化时无需重新解码
+                    cache_key = self._decoded_cache_key(img_path, mask_file_path)
+                    if cache_key is not None:
+                        cache_key += (frame_start, frame_count, frame_stride)
+                        cached = _remote_decoded_cache.get(cache_key)
+                        if cached is not None:
+                            return cached
                     
-                    # 处理图像序列（如 GIF、多帧 PNG 等）
-                    for i in ImageSequence.Iterator(img):
-                        i = node_helpers.pillow(ImageOps.exif_transpose, i)
-                        
-                        if i.mode == 'I':
-                            i = i.point(lambda i: i * (1 / 255))
-                        rgb_image = i.convert("RGB")
-                        
-                        if len(frame_images) == 0:
-                            w = rgb_image.size[0]
-                            h = rgb_image.size[1]
-                        
-                        if rgb_image.size[0] != w or rgb_image.size[1] != h:
-                            continue
-                        
-                        image_tensor = np.array(rgb_image).astype(np.float32) / 255.0
-                        image_tensor = torch.from_numpy(image_tensor)[None,]
-                        
-                        # 处理遮罩
-                        if 'A' in i.getbands():
-                            mask = np.array(i.getchannel('A')).astype(np.float32) / 255.0
-                            mask = 1. - torch.from_numpy(mask)
-                        elif i.mode == 'P' and 'transparency' in i.info:
-                            mask = np.array(i.convert('RGBA').getchannel('A')).astype(np.float32) / 255.0
-                            mask = 1. - torch.from_numpy(mask)
-                        else:
-                            mask = torch.zeros((rgb_image.size[1], rgb_image.size[0]), dtype=torch.float32, device="cpu")
-                        
-                        frame_images.append(image_tensor)
-                        frame_masks.append(mask.unsqueeze(0))
-                        
-                        if img.format == "MPO":
-                            break  # ignore all frames except the first one for MPO format
+                    if img_filename.endswith('.npy'):
+                        # 未压缩的 uint8 RGBA 数组，直接转换无需解码
+                        rgba = np.load(img_path)
+                        decoded = (
+                            torch.from_numpy(rgba[..., :3].astype(np.float32) / 255.0)[None,],
+                            (1. - torch.from_numpy(rgba[..., 3].astype(np.float32) / 255.0)).unsqueeze(0),
+                            [0],
+                        )
+                    else:
+                        decoded = _decode_image_frames(img_path, frame_start, frame_count, frame_stride)
                     
-                    # 如果提供了遮罩文件，尝试加载它（覆盖alpha通道）
-                    if mask_files and idx < len(mask_files) and w is not None and h is not None:
-                        mask_file_path_str = mask_files[idx]
-                        
-                        # 尝试从results_dir加载遮罩文件
-                        mask_file_path = os.path.join(self.results_dir, mask_file_path_str)
-                        if not os.path.exists(mask_file_path):
-                            # 如果不在results_dir，尝试从input或temp目录
-                            temp_dir = folder_paths.get_temp_directory()
-                            input_dir = folder_paths.get_input_directory()
-                            mask_file_path = os.path.join(temp_dir, mask_file_path_str)
-                            if not os.path.exists(mask_file_path):
-                                mask_file_path = os.path.join(input_dir, mask_file_path_str)
+                    if decoded is not None:
+                        output_image, output_mask, frame_indices = decoded
                         
-                        if os.path.exists(mask_file_path):
+                        # 如果提供了遮罩文件，尝试加载它（覆盖alpha通道）
+                        if mask_file_path is not None and os.path.exists(mask_file_path):
                             try:
-                                mask_img = node_helpers.pillow(Image.open, mask_file_path)
-                                
-                                # 处理遮罩文件（可能是单帧或多帧）
-                                mask_frames = []
-                                for mask_frame in ImageSequence.Iterator(mask_img):
-                                    mask_frame = node_helpers.pillow(ImageOps.exif_transpose, mask_frame)
-                                    
-                                    # 提取遮罩通道
-                                    if mask_frame.mode == 'RGBA':
-                                        mask_array = np.array(mask_frame.getchannel('A')).astype(np.float32) / 255.0
-                                    elif mask_frame.mode == 'L':
-                                        mask_array = np.array(mask_frame).astype(np.float32) / 255.0
-                                    elif mask_frame.mode == 'P' and 'transparency' in mask_frame.info:
-                                        mask_array = np.array(mask_frame.convert('RGBA').getchannel('A')).astype(np.float32) / 255.0
-                                    else:
-                                        mask_array = np.array(mask_frame.convert('L')).astype(np.float32) / 255.0
-                                    
-                                    # 调整遮罩大小以匹配图像
-                                    if mask_array.shape[0] != h or mask_array.shape[1] != w:
-                                        mask_pil = Image.fromarray((mask_array * 255).astype(np.uint8))
-                                        mask_pil = mask_pil.resize((w, h), Image.LANCZOS)
-                                        mask_array = np.array(mask_pil).astype(np.float32) / 255.0
-                                    
-                                    mask_tensor = torch.from_numpy(mask_array)
-                                    mask_tensor = 1.0 - mask_tensor  # 反转遮罩（ComfyUI中白色=透明区域）
-                                    mask_frames.append(mask_tensor.unsqueeze(0))
-                                    
-                                    if mask_img.format == "MPO":
-                                        break
-                                
-                                # 如果遮罩文件有多个帧，使用第一个；否则使用第一个遮罩
-                                if mask_frames:
-                                    # 更新所有帧的遮罩（如果遮罩文件只有一帧，则应用到所有图像帧）
-                                    if len(mask_frames) == 1:
-                                        # 单个遮罩应用到所有帧
-                                        for frame_idx in range(len(frame_masks)):
-                                            frame_masks[frame_idx] = mask_frames[0]
-                                    else:
-                                        # 多帧遮罩，按帧对应
-                                        for frame_idx in range(min(len(frame_masks), len(mask_frames))):
-                                            frame_masks[frame_idx] = mask_frames[frame_idx]
-                                
+                                _apply_mask_override(output_mask, mask_file_path, frame_indices)
                                 print(f"[RemoteImageReceiverPlus] 已加载遮罩文件: {mask_files[idx]}")
                             except Exception as e:
                                 print(f"[RemoteImageReceiverPlus] 加载遮罩文件失败: {str(e)}")
                                 import traceback
                                 traceback.print_exc()
-                    
-                    # 合并多帧图像
-                    if len(frame_images) > 1:
-                        output_image = torch.cat(frame_images, dim=0)
-                        output_mask = torch.cat(frame_masks, dim=0)
-                    elif len(frame_images) == 1:
-                        output_image = frame_images[0]
-                        output_mask = frame_masks[0]
+                        
+                        if cache_key is not None:
+                            _remote_decoded_cache.put(cache_key, output_image, output_mask)
                     else:
                         # 如果没有有效帧，创建空图像和遮罩
                         output_image = torch.zeros((1, 64, 64, 3), dtype=torch.float32)
                         output_mask = torch.zeros((1, 64, 64), dtype=torch.float32)
                     
-                    output_images.append(output_image)
-                    output_masks.append(output_mask)
+                    return output_image, output_mask
                     
                 except Exception as e:
                     print(f"[RemoteImageReceiverPlus] 处理文件 {img_filename} 时出错: {str(e)}")
                     import traceback
                     traceback.print_exc()
-                    continue
+                    return None
+            
+            # 多个文件并行解码，结果保持原始索引顺序
+            for result in _decode_files_parallel(decode_file, list(enumerate(image_files)), decode_workers):
+                if result is not None:
+                    output_images.append(result[0])
+                    output_masks.append(result[1])
             
             if not output_images:
                 empty_image = torch.zeros((1, 64, 64, 3), dtype=torch.float32)
@@ -1874,7 +2782,46 @@ class LG_RemoteImageReceiverPlus:
             return ([empty_image], [empty_mask], signal_output)
     
     @classmethod
-    def IS_CHANGED(s, group_name, link_id, max_images, mask_file="", signal=None, unique_id=None):
-        # 计算hash以检测变化
-        hash_value = hash(str(group_name) + str(link_id) + str(max_images) + str(mask_file))
-        return hash_value
\ No newline at end of file
+    def IS_CHANGED(s, group_name, link_id, max_images, mask_file="", frame_start=0, frame_count=0, frame_stride=1, decode_workers=0, repeat_index=0, signal=None, unique_id=None):
+        # 在验证 prompt 时调用，不能阻塞：只读组状态、结果索引版本和文件签名 (size, mtime_ns)，
+        # 下载远端结果、等待异步编码和计算摘要都留给 load_image（按同一签名缓存摘要，内容未变化时不重新解码）。
+        # 不混用已缓存的摘要：load_image 填充缓存后返回值会变化，导致多执行一次
+        if isinstance(group_name, list):
+            group_name = group_name[0] if group_name else ""
+        if isinstance(repeat_index, list):
+            repeat_index = repeat_index[0] if repeat_index else 0
+        if group_name:
+            group_name = _get_repeat_group_name(group_name, repeat_index)
+        if isinstance(link_id, list):
+            link_id = link_id[0] if link_id else 1
+        if isinstance(max_images, list):
+            max_images = max_images[0] if max_images else 10
+        if isinstance(mask_file, list):
+            mask_file = ",".join(str(m) for m in mask_file if m)
+        
+        digest = hashlib.sha256(f"{group_name}|{link_id}|{max_images}|{mask_file}|{frame_start}|{frame_count}|{frame_stride}".encode("utf-8"))
+        if not group_name:
+            return digest.hexdigest()
+        
+        def file_signature(path):
+            try:
+                stat = os.stat(path)
+            except OSError:
+                return None
+            return f"{stat.st_size}:{stat.st_mtime_ns}"
+        
+        digest.update(f"version:{_remote_result_index.get_version(group_name, link_id)}".encode("utf-8"))
+        try:
+            # 组状态在每次远程执行时更新（结果可能尚未下载到本地，索引版本还没有变化）
+            if _group_result_manager is not None:
+                status = _group_result_manager.load_status_by_group(group_name) or {}
+                digest.update(f"status:{status.get('prompt_id')}|{status.get('completed')}|{status.get('completed_at')}".encode("utf-8"))
+            
+            manifest_path = _remote_result_index.get_manifest(group_name, link_id)
+            if manifest_path is not None:
+                digest.update(f"manifest:{file_signature(manifest_path)}".encode("utf-8"))
+            for file_index, filename in _remote_result_index.get_files(group_name, link_id, max_images):
+                digest.update(f"{file_index}:{file_signature(os.path.join(REMOTE_RESULTS_DIR, filename))}".encode("utf-8"))
+        except Exception as e:
+            print(f"[RemoteImageReceiverPlus] 计算结果摘要失败，按版本号判断变化: {e}")
+        return digest.hexdigest()
\ No newline at end of file
@@ -2227,6 +2227,16 @@ class GroupExecutorUI {
                 }
                 select.appendChild(option);
             });
+            // 有多个远程服务器时，可以在提交时按负载自动选择
+            if (this.servers.filter(server => server.id !== 'local').length > 1) {
+                const option = document.createElement('option');
+                option.value = 'auto';
+                option.textContent = '自动（按负载选择）';
+                if (currentValue === 'auto') {
+                    option.selected = true;
+                }
+                select.appendChild(option);
+            }
         } else {
             const option = document.createElement('option');
             option.value = '';
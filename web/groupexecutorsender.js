@@ -89,7 +89,7 @@ app.registerExtension({
             };
 
             // 后台执行：生成 API prompt 并发送给后端
-            nodeType.prototype.executeInBackend = async function(executionList) {
+            nodeType.prototype.executeInBackend = async function(executionList, options = {}) {
                 try {
                     // 1. 生成完整的 API prompt
                     const { output: fullApiPrompt } = await app.graphToPrompt();
@@ -100,8 +100,8 @@ app.registerExtension({
                     for (const exec of executionList) {
                         const groupName = exec.group_name || '';
                         
-                        // 延迟项直接添加
-                        if (groupName === "__delay__") {
+                        // 延迟项和屏障项直接添加
+                        if (groupName === "__delay__" || groupName === "__barrier__") {
                             enrichedExecutionList.push(exec);
                             continue;
                         }
@@ -134,7 +134,10 @@ app.registerExtension({
                         body: JSON.stringify({
                             node_id: this.id,
                             execution_list: enrichedExecutionList,
-                            api_prompt: fullApiPrompt
+                            api_prompt: fullApiPrompt,
+                            parallel: !!options.parallel,
+                            max_per_server: options.max_per_server || 1,
+                            lookahead: options.lookahead || 0
                         })
                     });
                     
@@ -340,8 +343,8 @@ app.registerExtension({
                     node.properties.isCancelling = false;
 
                     let totalTasks = executionList.reduce((total, item) => {
-                        if (item.group_name !== "__delay__") {
-                            return total + (parseInt(item.repeat_count) || 1);
+                        if (item.group_name !== "__delay__" && item.group_name !== "__barrier__") {
+                            return total + (parseInt(item.repeat_count) || 1) * (parseInt(item.fan_out) || 1);
                         }
                         return total;
                     }, 0);
@@ -355,7 +358,8 @@ app.registerExtension({
                             }
                             
                             const group_name = execution.group_name || '';
-                            const repeat_count = parseInt(execution.repeat_count) || 1;
+                            // 前端执行没有服务器池，分发模式（fan_out）的重复按顺序执行
+                            const repeat_count = (parseInt(execution.repeat_count) || 1) * (parseInt(execution.fan_out) || 1);
                             const delay_seconds = parseFloat(execution.delay_seconds) || 0;
 
                             if (!group_name) {
@@ -363,6 +367,11 @@ app.registerExtension({
                                 continue;
                             }
 
+                            // 前端顺序执行时屏障项没有额外作用
+                            if (group_name === "__barrier__") {
+                                continue;
+                            }
+
                             if (group_name === "__delay__") {
                                 if (delay_seconds > 0 && !node.properties.isCancelling) {
                                     node.updateStatus(
@@ -548,7 +557,11 @@ app.registerExtension({
                     node.updateStatus("正在启动后台执行...");
 
                     try {
-                        await node.executeInBackend(executionList);
+                        await node.executeInBackend(executionList, {
+                            parallel: !!detail.parallel,
+                            max_per_server: detail.max_per_server,
+                            lookahead: detail.lookahead
+                        });
                         node.updateStatus("后台执行已启动");
                         setTimeout(() => node.resetStatus(), 2000);
                     } catch (error) {